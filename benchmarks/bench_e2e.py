@@ -0,0 +1,209 @@
+"""
+Benchmark: end-to-end scrapes against the local fixture site (booking_replay.StubSite).
+
+Usage:
+    uv run python benchmarks/bench_e2e.py [--queries 10] [--workers 1 2 4] [--profile lean]
+                                          [--output bench.json] [--compare baseline.json]
+                                          [--metrics run.prom]
+
+Reports, as JSON:
+- stages     : p50 / p95 latency of every scraping stage (booking_metrics.STAGES)
+               over --queries sequential searchbox scrapes in one session
+- throughput : queries per minute for every --workers count (scrape_many)
+- memory     : peak RSS per browser session
+
+With --compare, stage p50s and throughput are checked against an earlier
+result file and the script exits with status 1 when any of them got worse
+by more than --tolerance.  --metrics also writes the per-step and
+per-selector metrics of the whole run (booking_metrics.write_metrics).
+
+Needs Chrome.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from booking_jobs import ScrapeJob  # noqa: E402
+from booking_log import configure_logging  # noqa: E402
+from booking_metrics import (  # noqa: E402
+    STAGE_TIMINGS, STAGES, driver_rss, process_tree_rss, reset_metrics, stage, write_metrics,
+)
+from booking_pool import scrape_many  # noqa: E402
+from booking_replay import DEFAULT_FIXTURE_DIR, StubSite  # noqa: E402
+from booking_scraper_v2 import create_driver, scrape_booking_price  # noqa: E402
+
+
+CITY = "Dubai"
+
+
+class RssSampler:
+    """
+    Samples the RSS of every process started by this interpreter (all
+    browser sessions) in a background thread and keeps the peak.
+    """
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, process_tree_rss(os.getpid(), include_root=False) or 0)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def _mib(value):
+    return round(value / 2**20, 1) if value else None
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+                              ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_stages(site, hotels, check_in, check_out, queries, profile, pacing):
+    """ Sequential searchbox scrapes in one session; returns (stage summary, peak RSS). """
+    STAGE_TIMINGS.reset()
+    peak = 0
+    with stage("setup"):
+        driver = create_driver(profile=profile)
+    try:
+        for i in range(queries):
+            with stage("query"):
+                scrape_booking_price(CITY, hotels[i % len(hotels)], check_in, check_out,
+                                     driver=driver, pacing=pacing, base_url=site.base_url,
+                                     room_rates=True)
+            peak = max(peak, driver_rss(driver) or 0)
+            driver.delete_all_cookies()
+    finally:
+        driver.quit()
+    summary = STAGE_TIMINGS.summary()
+    ordered = {name: summary[name] for name in STAGES + ["query"] if name in summary}
+    return ordered, peak
+
+
+def run_throughput(site, hotels, check_in, check_out, queries, workers, profile, pacing):
+    jobs = [ScrapeJob(CITY, hotels[i % len(hotels)], check_in, check_out)
+            for i in range(max(queries, workers * 3))]
+    with RssSampler() as sampler:
+        start = time.perf_counter()
+        outcomes = scrape_many(jobs, workers=workers, profile=profile, pacing=pacing,
+                               base_url=site.base_url)
+        elapsed = time.perf_counter() - start
+    errors = sum(1 for _, _, error in outcomes if error is not None)
+    return {
+        "workers": workers,
+        "jobs": len(jobs),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "qpm": round(len(jobs) / elapsed * 60, 2),
+        "peak_rss_mib": _mib(sampler.peak),
+        "peak_rss_mib_per_session": _mib(sampler.peak / workers),
+    }
+
+
+def compare(result, baseline, tolerance):
+    """ Returns a list of human-readable regressions. """
+    regressions = []
+    for name, stats in result["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if before and before["p50"] and stats["p50"] > before["p50"] * (1 + tolerance):
+            regressions.append(f"stage {name}: p50 {before['p50']:.3f}s → {stats['p50']:.3f}s")
+    before_qpm = {row["workers"]: row["qpm"] for row in baseline.get("throughput", [])}
+    for row in result["throughput"]:
+        before = before_qpm.get(row["workers"])
+        if before and row["qpm"] < before * (1 - tolerance):
+            regressions.append(f"throughput x{row['workers']}: {before} → {row['qpm']} qpm")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURE_DIR)
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--profile", default="lean")
+    parser.add_argument("--pacing", default="zero-delay")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="fixed stub-server latency per response (seconds)")
+    parser.add_argument("--output", help="also write the JSON result to this file")
+    parser.add_argument("--compare", help="earlier result file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--metrics", help="also write Prometheus / OpenMetrics (.om) metrics here")
+    parser.add_argument("--verbose", action="store_true", help="show the scraper's output")
+    args = parser.parse_args()
+    configure_logging("INFO" if args.verbose else "ERROR")
+    reset_metrics()
+
+    # a check-in one month ahead keeps calendar navigation to a single click
+    today = datetime.now(timezone.utc).date().replace(day=1)
+    check_in = (today + timedelta(days=40)).replace(day=10)
+    check_out = check_in + timedelta(days=2)
+
+    with StubSite(args.fixtures, latency=args.latency, today=today.isoformat()) as site:
+        hotels = [entry["label"] for entry in site.suggestions()[:5]]
+        stages, session_peak = run_stages(site, hotels, check_in.isoformat(), check_out.isoformat(),
+                                          args.queries, args.profile, args.pacing)
+        throughput = [
+            run_throughput(site, hotels, check_in.isoformat(), check_out.isoformat(),
+                           args.queries, workers, args.profile, args.pacing)
+            for workers in args.workers
+        ]
+
+    result = {
+        "benchmark": "e2e",
+        "revision": _git_revision(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "queries": args.queries,
+            "profile": args.profile,
+            "pacing": args.pacing,
+            "latency": args.latency,
+            "fixtures": os.path.abspath(args.fixtures),
+        },
+        "stages": stages,
+        "throughput": throughput,
+        "memory": {"peak_rss_mib_single_session": _mib(session_peak)},
+    }
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    if args.metrics:
+        write_metrics(args.metrics)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"✗ regression  {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"✓ no regressions beyond {args.tolerance:.0%} vs {args.compare}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
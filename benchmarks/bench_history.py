@@ -0,0 +1,103 @@
+"""
+Benchmark: price-history ingest, storage size and query latency on synthetic monitoring runs.
+
+Usage:
+    uv run python benchmarks/bench_history.py [--series 2000] [--runs 50] [--change-rate 0.05]
+
+Every run observes every series once; a --change-rate share of the prices
+moves.  Reports observations/s, bytes on disk per stored change and per
+observation, and the latency of latest() and history() lookups.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from booking_history import PriceHistory  # noqa: E402
+from booking_records import PriceRecord  # noqa: E402
+
+
+def make_series(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2026, 5, 1)
+    series = []
+    for i in range(count):
+        check_in = start + timedelta(days=i % 60)
+        series.append({
+            "hotel": f"Hotel {i // 60:04d}",
+            "check_in": check_in.date().isoformat(),
+            "check_out": (check_in + timedelta(days=2)).date().isoformat(),
+            "amount": float(rng.randint(200, 3000)),
+        })
+    return series
+
+
+def run_records(series, run, change_rate, rng):
+    scraped_at = (datetime(2026, 10, 1, tzinfo=timezone.utc) + timedelta(hours=run)).isoformat()
+    records = []
+    for entry in series:
+        if run and rng.random() < change_rate:
+            entry["amount"] = max(50.0, entry["amount"] + rng.choice([-1, 1]) * rng.randint(5, 200))
+        records.append(PriceRecord(entry["hotel"], "Dubai", entry["check_in"], entry["check_out"],
+                                   price_text=f"AED {entry['amount']:,.0f}", amount=entry["amount"],
+                                   currency="AED", scraped_at=scraped_at))
+    return records
+
+
+def _latency_us(fn, keys):
+    samples = []
+    for key in keys:
+        start = time.perf_counter()
+        fn(*key)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--series", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--change-rate", type=float, default=0.05)
+    parser.add_argument("--batch", type=int, default=25, help="records per observe() call (one results page)")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    series = make_series(args.series)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.sqlite")
+        history = PriceHistory(path)
+        observed = emitted = 0
+        elapsed = 0.0
+        for run in range(args.runs):
+            records = run_records(series, run, args.change_rate, rng)
+            start = time.perf_counter()
+            for i in range(0, len(records), args.batch):
+                emitted += len(history.observe(records[i:i + args.batch]))
+            elapsed += time.perf_counter() - start
+            observed += len(records)
+
+        keys = [(entry["hotel"], entry["check_in"], entry["check_out"])
+                for entry in rng.sample(series, min(500, len(series)))]
+        latest_us = _latency_us(history.latest, keys)
+        history_us = _latency_us(history.history, keys)
+        history.close()
+        size = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+
+    print(f"series / runs          : {args.series:,} x {args.runs}  (change rate {args.change_rate:.0%})")
+    print(f"observations           : {observed:,}  ({observed / elapsed:,.0f}/s)")
+    print(f"emitted (new+changed)  : {emitted:,}  ({emitted / observed:.1%} of observations)")
+    print(f"on disk                : {size / 1024:,.0f} KiB  "
+          f"({size / emitted:.1f} B per change, {size / observed:.1f} B per observation)")
+    print(f"latest()  median       : {latest_us:.1f} µs")
+    print(f"history() median       : {history_us:.1f} µs  (~{emitted / args.series:.1f} changes per series)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: fuzzy hotel-name matching against a synthetic hotel catalogue.
+
+Usage:
+    uv run python benchmarks/bench_matching.py [--catalogue 20000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from booking_matching import HotelIndex, best_match  # noqa: E402
+
+
+BRANDS = ["Howard Johnson", "Rove", "Citymax", "Premier Inn", "Ibis", "Novotel", "Ramada",
+          "Holiday Inn Express", "Four Points", "Hyatt Place", "Mercure", "Golden Sands",
+          "Arabian Courtyard", "Al Khoory", "Grand Excelsior", "Savoy Central", "Rose Park"]
+OWNERS = ["", "", "by Wyndham", "by Sheraton", "by Jumeirah", "by IHG", "by Accor"]
+AREAS = ["Bur Dubai", "Deira", "Al Barsha", "Downtown", "Business Bay", "Marina", "JLT",
+         "Al Rigga", "Silicon Oasis", "Barsha Heights", "Airport", "Jumeirah", "Karama"]
+KINDS = ["Hotel", "Hotel Apartments", "Suites", "Resort", "Inn", ""]
+
+
+def make_catalogue(size, seed=0):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < size:
+        parts = [rng.choice(BRANDS), rng.choice(OWNERS), rng.choice(AREAS), rng.choice(KINDS),
+                 str(rng.randint(1, size // 50 + 1))]
+        names.add(" ".join(p for p in parts if p))
+    return sorted(names)
+
+
+def mangle(name, rng):
+    """ Drops owner words / adds a typo, like names shown on result pages. """
+    words = [w for w in name.split() if w not in ("by", "Wyndham", "Sheraton", "Accor")]
+    if rng.random() < 0.3 and len(words[0]) > 3:
+        i = rng.randrange(1, len(words[0]) - 1)
+        words[0] = words[0][:i] + words[0][i + 1:]
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--catalogue", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    catalogue = make_catalogue(args.catalogue)
+    truth = [rng.choice(catalogue) for _ in range(args.queries)]
+    queries = [mangle(name, rng) for name in truth]
+
+    start = time.perf_counter()
+    index = HotelIndex(catalogue, threshold=0.0)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matched = [index.match(q) for q in queries]
+    lookup = time.perf_counter() - start
+    correct = sum(1 for m, t in zip(matched, truth) if m and m[0] == t)
+
+    sample = queries[:50]
+    start = time.perf_counter()
+    for q in sample:
+        best_match(q, catalogue)
+    brute = (time.perf_counter() - start) / len(sample)
+
+    print(f"catalogue          : {len(catalogue):,} names")
+    print(f"index build        : {build:.2f} s")
+    print(f"indexed lookup     : {lookup / args.queries * 1000:.2f} ms/query")
+    print(f"brute-force scan   : {brute * 1000:.2f} ms/query")
+    print(f"top-1 accuracy     : {correct / args.queries:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: price-string normalization throughput on synthetic display prices.
+
+The "parse" lines time normalization of distinct strings; the memoized
+line shows what normalize_prices() gains on repeated strings and is not a
+parsing speed.
+
+Usage:
+    uv run python benchmarks/bench_prices.py [--count 1000000] [--distinct 50000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from booking_prices import normalize_price, normalize_prices  # noqa: E402
+
+
+def _synthetic_price(rng):
+    amount = rng.randint(50, 25000)
+    cents = rng.randint(0, 99)
+    style = rng.randrange(6)
+    if style == 0:
+        return f"AED {amount:,}"
+    if style == 1:
+        return f"AED {int(amount * 1.2):,} AED {amount:,}"        # discounted pair
+    if style == 2:
+        return f"€ {amount:,}.{cents:02d}".replace(",", "X").replace(".", ",").replace("X", ".")
+    if style == 3:
+        return f"US${amount:,}"
+    if style == 4:
+        return f"{amount:,}".replace(",", " ") + f",{cents:02d} zł"
+    return f"£{amount}"
+
+
+def make_prices(count, distinct, seed=0):
+    """ *count* strings drawn from *distinct* unique synthetic prices. """
+    rng = random.Random(seed)
+    pool = make_unique_prices(distinct, seed)
+    return [pool[rng.randrange(distinct)] for _ in range(count)]
+
+
+def make_unique_prices(count, seed=0):
+    """ *count* pairwise different synthetic prices. """
+    rng = random.Random(seed)
+    seen = {}
+    while len(seen) < count:
+        seen.setdefault(_synthetic_price(rng), None)
+    return list(seen)
+
+
+def _report(label, count, elapsed):
+    print(f"{label:<34}: {elapsed:7.2f} s   {count / elapsed:>12,.0f} strings/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=50_000,
+                        help="distinct strings of the repeated input (dumps repeat prices heavily)")
+    args = parser.parse_args()
+
+    # parsing proper: every string is new, so the memo never hits
+    unique = make_unique_prices(args.count, seed=1)
+
+    start = time.perf_counter()
+    for text in unique:
+        normalize_price(text)
+    _report("parse, one-by-one", args.count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    normalize_prices(unique)
+    _report("parse, bulk", args.count, time.perf_counter() - start)
+
+    # memoized: repeated strings are parsed once, the rest are dict hits;
+    # this measures the repetition of the input, not the parser
+    texts = make_prices(args.count, args.distinct)
+    start = time.perf_counter()
+    normalize_prices(texts)
+    _report(f"memoized bulk ({args.distinct:,} distinct)", args.count, time.perf_counter() - start)
+    print(f"{'memo hit rate':<34}: {1 - len(set(texts)) / len(texts):7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: page-load time, transferred bytes and browser memory per browser profile.
+
+Usage:
+    uv run python benchmarks/bench_profiles.py [--url URL] [--repeat 5] [--profiles default lean]
+
+Needs Chrome.  Memory is the resident set size of the whole browser
+process tree (chromedriver, Chrome and its renderers), read from /proc on
+Linux or through psutil when it is installed.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from booking_metrics import driver_rss  # noqa: E402
+from booking_pacing import wait_for_dom_ready  # noqa: E402
+from booking_profiles import PROFILES, get_profile  # noqa: E402
+from booking_scraper_v2 import build_search_url, create_driver  # noqa: E402
+
+
+DEFAULT_URL = build_search_url("Dubai", "Howard Johnson Bur Dubai", "2026-05-01", "2026-05-05")
+
+_TIMING_JS = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var bytes = nav.transferSize || 0, count = 0;
+performance.getEntriesByType('resource').forEach(function (r) { bytes += r.transferSize || 0; count++; });
+return {dcl: nav.domContentLoadedEventEnd || 0, load: nav.loadEventEnd || 0, bytes: bytes, requests: count};
+"""
+
+
+def measure(profile, url, repeat):
+    profile = get_profile(profile)
+    start = time.perf_counter()
+    driver = create_driver(profile=profile)
+    startup = time.perf_counter() - start
+    loads, dcl, load, transferred, requests, peak_rss = [], [], [], [], [], 0
+    try:
+        for _ in range(repeat):
+            driver.get("about:blank")
+            start = time.perf_counter()
+            driver.get(url)
+            wait_for_dom_ready(driver)
+            loads.append(time.perf_counter() - start)
+            timing = driver.execute_script(_TIMING_JS)
+            dcl.append(timing["dcl"] / 1000)
+            load.append(timing["load"] / 1000)
+            transferred.append(timing["bytes"])
+            requests.append(timing["requests"])
+            peak_rss = max(peak_rss, driver_rss(driver) or 0)
+    finally:
+        driver.quit()
+    return {
+        "profile": profile.name,
+        "startup_s": round(startup, 3),
+        "load_s_median": round(statistics.median(loads), 3),
+        "dom_content_loaded_s_median": round(statistics.median(dcl), 3),
+        "load_event_s_median": round(statistics.median(load), 3),
+        "transferred_kib_median": round(statistics.median(transferred) / 1024, 1),
+        "requests_median": statistics.median(requests),
+        "peak_rss_mib": round(peak_rss / 2**20, 1) if peak_rss else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--profiles", nargs="+", default=sorted(PROFILES))
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [measure(name, args.url, args.repeat) for name in args.profiles]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    baseline = results[0]
+    print(f"url     : {args.url}")
+    print(f"repeat  : {args.repeat}\n")
+    for result in results:
+        print(f"[{result['profile']}]")
+        for key, value in result.items():
+            if key == "profile":
+                continue
+            line = f"  {key:30s}: {value}"
+            base = baseline.get(key)
+            if result is not baseline and value and base:
+                line += f"   ({(value - base) / base:+.0%} vs {baseline['profile']})"
+            print(line)
+        print()
+
+
+if __name__ == "__main__":
+    main()
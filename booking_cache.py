@@ -0,0 +1,276 @@
+"""
+Persistent on-disk cache of scrape results.
+
+Results are stored in SQLite keyed by the normalized query
+(hotel, city, check-in, check-out, occupancy, max_results, base_url,
+match_threshold), expire after
+a configurable TTL and are evicted least-recently-used once the cache
+holds *max_entries*.  Room rates are not cached: a room_rates=True call
+always scrapes (and stores its PriceRecords).
+
+CachedScraper wraps scrape_booking_price() with the same call signature:
+
+    cache = ResultCache("booking_cache.sqlite", ttl=900)
+    scrape = CachedScraper(cache, stale_while_revalidate=True)
+    records = scrape("Dubai", "Howard Johnson Bur Dubai", "2026-05-01", "2026-05-05")
+
+With stale_while_revalidate=True an expired entry is returned immediately
+and a refresh is queued in the background.
+"""
+
+import copy
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from booking_log import get_logger
+from booking_matching import DEFAULT_THRESHOLD
+from booking_pacing import get_pacing
+from booking_records import PriceRecord
+
+
+log = get_logger("cache")
+
+
+def _norm(text):
+    return " ".join((text or "").lower().split())
+
+
+# scrape_booking_price() options that change the result, with their defaults:
+# base_url keeps a replay stub's results apart from the live site's, and
+# match_threshold decides each record's target flag
+KEY_OPTIONS = {"adults": 2, "rooms": 1, "children": 0, "max_results": None,
+               "base_url": None, "match_threshold": DEFAULT_THRESHOLD}
+
+
+def cache_key(city, hotel_name, check_in_date, check_out_date, **options):
+    """
+    Normalized query key: case and whitespace insensitive.  *options* are
+    the KEY_OPTIONS of the call (others are ignored).
+    """
+    values = [options.get(name, default) for name, default in KEY_OPTIONS.items()]
+    return "|".join([_norm(hotel_name), _norm(city), check_in_date, check_out_date]
+                    + ["" if value is None else str(value) for value in values])
+
+
+class ResultCache:
+    """
+    SQLite-backed result cache.
+
+    Parameters:
+    - path        : database file (":memory:" for a throw-away cache)
+    - ttl         : seconds an entry stays fresh
+    - max_entries : LRU size bound
+    """
+
+    def __init__(self, path="booking_cache.sqlite", ttl=900, max_entries=10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " records TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)")
+        self._db.commit()
+
+    def get(self, key, allow_stale=False):
+        """
+        Returns (records, is_fresh) for *key*, or None on a miss.  Expired
+        entries count as a miss unless *allow_stale* is True.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT records, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            fresh = now - row[1] < self.ttl
+            if not fresh and not allow_stale:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        return [PriceRecord(**r) for r in json.loads(row[0])], fresh
+
+    def put(self, key, records):
+        now = time.time()
+        payload = json.dumps([r.to_dict() for r in records], ensure_ascii=False)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, records, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._evict_locked()
+            self._db.commit()
+
+    def _evict_locked(self):
+        (count,) = self._db.execute("SELECT COUNT(*) FROM results").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM results WHERE key IN ("
+                " SELECT key FROM results ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def invalidate(self, key):
+        with self._lock:
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self):
+        """ Hit / miss counters since the cache was opened. """
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CachedScraper:
+    """
+    Drop-in replacement for scrape_booking_price() that consults a
+    ResultCache first.  Can be passed as *scrape* to scrape_many().
+
+    Parameters:
+    - cache                  : ResultCache
+    - scrape                 : the underlying scrape function
+    - stale_while_revalidate : return expired entries at once and refresh
+                               them in the background
+    - refresh_workers        : background refresh concurrency
+    - profile                : browser profile of background refreshes for
+                               calls that do not pass one (run_job passes
+                               the job's profile)
+    """
+
+    def __init__(self, cache, scrape=None, stale_while_revalidate=False, refresh_workers=1, profile=None):
+        if scrape is None:
+            from booking_scraper_v2 import scrape_booking_price as scrape
+        self.cache = cache
+        self.scrape = scrape
+        self.stale_while_revalidate = stale_while_revalidate
+        self.profile = profile
+        self._refresh_workers = refresh_workers
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, city, hotel_name, check_in_date, check_out_date, **kwargs):
+        records = self.lookup(city, hotel_name, check_in_date, check_out_date, **kwargs)
+        if records is None:
+            records = self.fetch(city, hotel_name, check_in_date, check_out_date, **kwargs)
+        return records
+
+    def lookup(self, city, hotel_name, check_in_date, check_out_date, **kwargs):
+        """
+        The cached records of a query (written to *sink* as well), or None
+        on a miss.  Needs no browser, so run_job() calls it before taking a
+        pooled session; a stale entry queues its background refresh.
+        """
+        if kwargs.get("room_rates"):
+            # the room rates only reach room_sink when the property page is scraped
+            return None
+        key = cache_key(city, hotel_name, check_in_date, check_out_date, **kwargs)
+        cached = self.cache.get(key, allow_stale=self.stale_while_revalidate)
+        if cached is None:
+            return None
+        records, fresh = cached
+        if not fresh:
+            log.info("   ↻ Serving stale cached price  →  refresh queued")
+            self._queue_refresh(key, (city, hotel_name, check_in_date, check_out_date), kwargs)
+        else:
+            log.info("   ✓ Cache hit  →  %s %s → %s", hotel_name, check_in_date, check_out_date)
+        sink = kwargs.get("sink")
+        if sink is not None:
+            sink.write_many(records)
+        return records
+
+    def fetch(self, city, hotel_name, check_in_date, check_out_date, **kwargs):
+        """ Scrapes the query (without looking at the cache) and caches the result. """
+        key = cache_key(city, hotel_name, check_in_date, check_out_date, **kwargs)
+        return self._scrape_and_store(key, (city, hotel_name, check_in_date, check_out_date), kwargs)
+
+    def _scrape_and_store(self, key, args, kwargs):
+        records = self.scrape(*args, **kwargs)
+        if records:                                  # never cache failed / empty scrapes
+            self.cache.put(key, records)
+        return records
+
+    def _queue_refresh(self, key, args, kwargs):
+        # a pooled driver is handed back before the refresh runs, so the
+        # refresh starts its own browser session: with the job's profile and
+        # without the inspection pauses of the "human" pacing
+        kwargs = {k: v for k, v in kwargs.items() if k not in ("driver", "sink", "room_sink", "room_rates")}
+        kwargs["profile"] = kwargs.get("profile") or self.profile
+        pacing = get_pacing(kwargs.get("pacing"))
+        if pacing.inspect_pauses:
+            pacing = copy.copy(pacing)
+            pacing.inspect_pauses = False
+        kwargs["pacing"] = pacing
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._refresh_workers)
+        self._executor.submit(self._refresh, key, args, kwargs)
+
+    def _refresh(self, key, args, kwargs):
+        try:
+            self._scrape_and_store(key, args, kwargs)
+        except Exception as e:
+            log.error("   ✗ Background refresh failed for %s: %s", args[1], e)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def close(self, wait=True):
+        """ Waits for queued refreshes (when *wait*) and stops the refresher. """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,286 @@
+"""
+Command-line entry point (the scrape-booking script).
+
+    scrape-booking "Howard Johnson Bur Dubai" --city Dubai --check-in 2026-05-01 --check-out 2026-05-05
+    scrape-booking --jobs jobs.jsonl -o prices.csv --workers 3 --rate 1 --profile lean --pacing balanced
+    scrape-booking --jobs jobs.csv --processes 8 --checkpoint jobs.done -o prices.jsonl
+    scrape-booking --jobs jobs.jsonl --dry-run                 # validate the jobs only
+    scrape-booking --jobs jobs.jsonl --cache-only              # answer from booking_cache.sqlite
+
+Within one process the jobs run on booking_scheduler: at most --rate job
+starts per second, --retries retries of transient failures, and the
+"priority" / "deadline" columns of a job file are honoured.
+
+Records go to --output (.jsonl / .csv / .parquet), or as JSON lines to
+stdout by default; status lines go to stderr.  Exit status: 0 when every
+job produced a result, 1 when a job failed (or was not cached with
+--cache-only), 2 for invalid arguments or jobs.
+
+Only Selenium-free modules are imported at startup; the scraper, Selenium
+and webdriver_manager are imported once a browser is actually needed, so
+--help, --dry-run and --cache-only return at once.  The chromedriver path
+is cached by booking_driver, so later runs start without network access.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+
+from booking_jobs import ScrapeJob, as_job, job_id, load_jobs, parse_deadline
+from booking_log import configure_logging, get_logger
+from booking_records import RoomRateRecord
+from booking_sinks import SINKS, RecordSink, open_sink
+
+
+log = get_logger("cli")
+
+RULE = "=" * 80
+
+
+class StdoutSink(RecordSink):
+    """ JSON lines on stdout, written as soon as they arrive. """
+
+    def __init__(self, stream=None):
+        super().__init__("-", buffer_size=1)
+        self._stream = stream or sys.stdout
+
+    def _write_batch(self, rows):
+        for row in rows:
+            self._stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._stream.flush()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="scrape-booking",
+        description="Scrape Booking.com hotel prices for hotel names or a job file.",
+    )
+    query = parser.add_argument_group("queries")
+    query.add_argument("hotels", nargs="*", metavar="HOTEL", help="hotel names (need --city and the dates)")
+    query.add_argument("--city")
+    query.add_argument("--check-in", metavar="YYYY-MM-DD")
+    query.add_argument("--check-out", metavar="YYYY-MM-DD")
+    query.add_argument("--jobs", metavar="FILE", help="CSV or JSONL job file (see booking_jobs.load_jobs)")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("-o", "--output", default="-",
+                        help="record file (.jsonl / .csv / .parquet); '-' = JSON lines on stdout")
+    output.add_argument("--format", choices=sorted(SINKS), help="output format (default: from the extension)")
+    output.add_argument("--room-output", metavar="FILE",
+                        help="also scrape per-room rates and write them to this file")
+
+    run = parser.add_argument_group("scraping")
+    run.add_argument("-w", "--workers", type=int, default=1, help="browser sessions in one process")
+    run.add_argument("--rate", type=float, default=0.5, help="job starts per second without --processes (default 0.5)")
+    run.add_argument("--retries", type=int, default=3,
+                     help="retries of a timed-out or intercepted job (default 3)")
+    run.add_argument("-p", "--processes", type=int,
+                     help="shard the jobs over this many worker processes (booking_shards)")
+    run.add_argument("--checkpoint", metavar="FILE", help="skip / record finished jobs (with --processes)")
+    run.add_argument("--job-timeout", type=float,
+                     help="kill a worker whose job runs longer (seconds, default 300; with --processes)")
+    run.add_argument("--profile", help="browser profile for jobs that do not name one (default, lean)")
+    run.add_argument("--pacing", help="pacing preset (human, balanced, zero-delay)")
+    run.add_argument("--fast-path", action="store_true", help="load the results URL directly")
+    run.add_argument("--max-results", type=int, help="read up to this many result cards")
+    run.add_argument("--selectors", default="booking_selectors.sqlite", metavar="FILE",
+                     help="selector hit-rate file")
+    run.add_argument("--refresh-driver", action="store_true",
+                     help="resolve chromedriver again instead of using the cached path")
+
+    cache = parser.add_argument_group("cache")
+    cache.add_argument("--cache", metavar="FILE", help="result cache (booking_cache.ResultCache)")
+    cache.add_argument("--ttl", type=float, default=900, help="seconds a cached result stays fresh")
+    cache.add_argument("--cache-only", action="store_true",
+                       help="only look results up in the cache (default file booking_cache.sqlite)")
+
+    misc = parser.add_argument_group("other")
+    misc.add_argument("--dry-run", action="store_true", help="validate the jobs and print them")
+    misc.add_argument("--metrics", metavar="FILE", help="write Prometheus / OpenMetrics (.om) metrics here")
+    misc.add_argument("--log-level", help="DEBUG, INFO (default), WARNING ...")
+    misc.add_argument("--log-format", choices=["text", "json"])
+    return parser
+
+
+def build_jobs(args, parser):
+    """
+    The jobs named on the command line (ScrapeJobs) and the rows of --jobs
+    (dicts, which keep their priority / deadline columns), in that order.
+    """
+    jobs = []
+    if args.hotels:
+        missing = [flag for flag, value in (("--city", args.city), ("--check-in", args.check_in),
+                                            ("--check-out", args.check_out)) if not value]
+        if missing:
+            parser.error(f"hotel names need {', '.join(missing)}")
+        jobs.extend(ScrapeJob(args.city, hotel, args.check_in, args.check_out) for hotel in args.hotels)
+    if args.jobs:
+        try:
+            jobs.extend(load_jobs(args.jobs))
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    if not jobs:
+        parser.error("give hotel names or --jobs FILE")
+    return jobs
+
+
+def _check_schedule(row):
+    """ The priority / deadline columns booking_scheduler reads from a job row. """
+    if not isinstance(row, dict):
+        return
+    try:
+        int(row.get("priority") or 0)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid priority {row['priority']!r}") from None
+    parse_deadline(row.get("deadline"))
+
+
+def validate(rows, args):
+    """ Error messages for malformed jobs and unknown profile / pacing names. """
+    from booking_pacing import get_pacing
+    from booking_profiles import get_profile
+
+    errors = []
+    for i, row in enumerate(rows, 1):
+        job = as_job(row)
+        for check in (job.validate, lambda: get_profile(job.profile or args.profile),
+                      lambda: _check_schedule(row)):
+            try:
+                check()
+            except ValueError as e:
+                errors.append(f"job {i} ({job.hotel_name}): {e}")
+    try:
+        get_pacing(args.pacing)
+    except ValueError as e:
+        errors.append(str(e))
+    return errors
+
+
+def check_options(args, parser):
+    if args.workers < 1 or (args.processes is not None and args.processes < 1):
+        parser.error("--workers / --processes must be at least 1")
+    if args.rate <= 0 or args.retries < 0:
+        parser.error("--rate must be positive and --retries at least 0")
+    if args.processes is None and (args.checkpoint or args.job_timeout is not None):
+        parser.error("--checkpoint and --job-timeout need --processes")
+    if args.processes is not None and (args.cache or args.metrics):
+        parser.error("--cache and --metrics work within one process; drop --processes")
+    if args.cache_only and args.room_output:
+        parser.error("room rates are not cached; drop --room-output with --cache-only")
+    if args.output == "-" and args.format not in (None, "jsonl"):
+        parser.error("stdout output is JSON lines; use --output FILE for other formats")
+
+
+def open_output(args):
+    sink = StdoutSink() if args.output == "-" else open_sink(args.output, args.format)
+    room_sink = None
+    if args.room_output:
+        room_sink = open_sink(args.room_output, record_type=RoomRateRecord)
+    return sink, room_sink
+
+
+def lookup_cached(jobs, args, sink):
+    """ --cache-only: writes the cached records of every job; returns the number of misses. """
+    from booking_cache import ResultCache, cache_key
+
+    misses = 0
+    with ResultCache(args.cache or "booking_cache.sqlite", ttl=args.ttl) as cache:
+        for job in jobs:
+            cached = cache.get(cache_key(*job.as_args(), max_results=args.max_results), allow_stale=True)
+            if cached is None:
+                log.warning("✗ Not cached: %s  %s → %s", job.hotel_name, job.check_in_date, job.check_out_date)
+                misses += 1
+                continue
+            records, fresh = cached
+            if not fresh:
+                log.info("   ↻ Stale cache entry: %s  %s → %s", job.hotel_name, job.check_in_date,
+                         job.check_out_date)
+            sink.write_many(records)
+    return misses
+
+
+def scrape(jobs, args, sink, room_sink):
+    """
+    Runs the jobs (ScrapeJobs or job-file rows) on booking_shards with
+    --processes, else on booking_scheduler; returns [(job, result, error)].
+    """
+    from booking_driver import resolve_driver_path
+    from booking_selectors import SELECTORS
+
+    SELECTORS.open(args.selectors)
+    if args.refresh_driver:
+        resolve_driver_path(refresh=True)
+    scrape_kwargs = {"pacing": args.pacing, "fast_path": args.fast_path, "max_results": args.max_results}
+    log.info("\n%s\nBOOKING.COM HOTEL PRICE SCRAPER\n%s\n", RULE, RULE)
+
+    if args.processes is not None:
+        from booking_shards import run_sharded
+
+        return run_sharded(jobs, processes=args.processes, checkpoint=args.checkpoint,
+                           job_timeout=args.job_timeout or 300, profile=args.profile, sink=sink,
+                           room_sink=room_sink, selectors_path=args.selectors, **scrape_kwargs)
+
+    from booking_scheduler import run_jobs
+
+    if room_sink is not None:
+        scrape_kwargs.update(room_rates=True, room_sink=room_sink)
+    cached = None
+    if args.cache:
+        from booking_cache import CachedScraper, ResultCache
+
+        cached = CachedScraper(ResultCache(args.cache, ttl=args.ttl), profile=args.profile)
+        scrape_kwargs["scrape"] = cached
+    try:
+        outcomes = run_jobs(jobs, workers=args.workers, rate=args.rate, max_retries=args.retries,
+                            profile=args.profile, sink=sink, **scrape_kwargs)
+    finally:
+        if cached is not None:
+            cached.close()
+            cached.cache.close()
+        if args.metrics:
+            from booking_metrics import write_metrics
+
+            write_metrics(args.metrics)
+    for job, _, error in outcomes:
+        if error is not None:
+            log.error("✗ %s: %s", job.hotel_name, error)
+    return outcomes
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    check_options(args, parser)
+    configure_logging(args.log_level, args.log_format)
+    rows = build_jobs(args, parser)
+    jobs = [as_job(row) for row in rows]
+
+    errors = validate(rows, args)
+    for error in errors:
+        log.error("✗ %s", error)
+    if errors:
+        return 2
+    if args.dry_run:
+        for job in jobs:
+            print(json.dumps({"id": job_id(job), **asdict(job)}, ensure_ascii=False))
+        log.info("✓ %d job(s) valid", len(jobs))
+        return 0
+
+    sink, room_sink = open_output(args)
+    try:
+        if args.cache_only:
+            return 1 if lookup_cached(jobs, args, sink) else 0
+        outcomes = scrape(rows, args, sink, room_sink)
+    finally:
+        sink.close()
+        if room_sink is not None:
+            room_sink.close()
+
+    failed = sum(1 for _, _, error in outcomes if error is not None)
+    log.info("✓ %d of %d job(s) scraped", len(outcomes) - failed, len(outcomes))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
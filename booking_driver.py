@@ -0,0 +1,102 @@
+"""
+Chromedriver resolution with a local path cache.
+
+ChromeDriverManager().install() asks the network for the driver matching
+the installed Chrome on every call.  resolve_driver_path() remembers the
+path it got in a small JSON file and reuses it while the binary is still
+there, so only the first run goes online:
+
+    path = resolve_driver_path()                 # cached after the first run
+    path = resolve_driver_path(refresh=True)     # e.g. after a Chrome update
+
+create_driver() refreshes the cached path by itself when Chrome refuses
+the cached driver (SessionNotCreatedException after a browser update).
+
+The cache file is $BOOKING_DRIVER_CACHE, or chromedriver.json under
+$XDG_CACHE_HOME/booking-scraper (~/.cache/booking-scraper).
+$BOOKING_CHROMEDRIVER names a driver binary to use as is.
+webdriver_manager is only imported when the network has to be asked.
+"""
+
+import json
+import os
+import threading
+
+from booking_log import get_logger
+from booking_records import utc_now
+
+
+log = get_logger("driver")
+
+_lock = threading.Lock()
+_resolved = None                  # path resolved by this process
+
+
+def driver_cache_file():
+    """ Location of the driver path cache. """
+    path = os.environ.get("BOOKING_DRIVER_CACHE")
+    if path:
+        return path
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "booking-scraper", "chromedriver.json")
+
+
+def _usable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def cached_driver_path():
+    """ The cached chromedriver path, or None when there is no usable one. """
+    try:
+        with open(driver_cache_file(), encoding="utf-8") as f:
+            path = json.load(f).get("path")
+    except (OSError, ValueError, AttributeError):
+        return None
+    return path if _usable(path) else None
+
+
+def _store(path):
+    cache_file = driver_cache_file()
+    try:
+        os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+        tmp = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"path": path, "resolved_at": utc_now()}, f)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        log.warning("   ⚠ Could not cache the chromedriver path in %s: %s", cache_file, e)
+
+
+def resolve_driver_path(refresh=False):
+    """
+    Path of the chromedriver binary: $BOOKING_CHROMEDRIVER, else the cached
+    path, else whatever ChromeDriverManager installs (which is then cached).
+    *refresh* skips the cache.
+    """
+    global _resolved
+    override = os.environ.get("BOOKING_CHROMEDRIVER")
+    if override:
+        return override
+    with _lock:
+        if not refresh:
+            path = _resolved if _usable(_resolved) else cached_driver_path()
+            if path is not None:
+                _resolved = path
+                return path
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        log.info("↻ Resolving chromedriver ...")
+        _resolved = ChromeDriverManager().install()
+        _store(_resolved)
+        return _resolved
+
+
+def forget_driver_path():
+    """ Drops the cached path (in this process and on disk). """
+    global _resolved
+    with _lock:
+        _resolved = None
+        try:
+            os.remove(driver_cache_file())
+        except FileNotFoundError:
+            pass
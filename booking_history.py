@@ -0,0 +1,336 @@
+"""
+Price history with change detection.
+
+Monitoring runs see mostly the same prices again.  PriceHistory keeps one
+series per (hotel, check-in, check-out, room) and compares every new
+observation with the last stored value; only changes are appended and
+only changed records are handed on:
+
+    history = PriceHistory("booking_history.sqlite")
+    with open_sink("changes.jsonl") as out:
+        scrape_many(jobs, sink=ChangeSink(history, out))     # out gets changes only
+
+    history.latest("Howard Johnson Bur Dubai", "2026-05-01", "2026-05-05")
+    history.history("Howard Johnson Bur Dubai", "2026-05-01", "2026-05-05")
+
+Storage (SQLite):
+- series  : one row per key with the latest amount / currency and when
+            it was last seen, so latest() is a single primary-key lookup
+- changes : append-only, clustered by (series, time).  Each row stores
+            the price as a delta in minor units against the previous
+            price (a small integer), and the currency only when it
+            changed.  history() reads one series' rows in order and never
+            touches the others.
+
+PriceRecords (results cards) are stored under room "" and RoomRateRecords
+under "<room type> | <board> | <cancellation> | <occupancy>", since one
+room type is sold at several rates.  A price that disappears (sold out)
+is a change to None.
+
+Several processes may share one file: every observe() batch runs in its
+own write transaction and compares against the rows on disk.
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from booking_log import get_logger
+from booking_records import utc_now
+
+
+log = get_logger("history")
+
+
+@dataclass
+class PricePoint:
+    """
+    - observed_at : UTC timestamp, ISO-8601 (first seen at this price)
+    - amount      : price (None while unavailable)
+    - currency    : currency code / symbol
+    """
+    observed_at: str
+    amount: float = None
+    currency: str = None
+
+
+def _norm(text):
+    return " ".join((text or "").lower().split())
+
+
+def _field(record, name):
+    return record.get(name) if isinstance(record, dict) else getattr(record, name, None)
+
+
+def room_key(record):
+    """ The "room" part of a record's series key ("" for a results card). """
+    room_type = _field(record, "room_type")
+    if room_type is None:
+        return ""
+    parts = [room_type, _field(record, "board"), _field(record, "cancellation"),
+             _field(record, "occupancy")]
+    return " | ".join("" if part is None else str(part) for part in parts)
+
+
+def series_key(record):
+    """ (hotel, check_in, check_out, room) of a PriceRecord / RoomRateRecord or its dict. """
+    return (_norm(_field(record, "hotel")), _field(record, "check_in"),
+            _field(record, "check_out"), _norm(room_key(record)))
+
+
+def _epoch(timestamp):
+    if not timestamp:
+        timestamp = utc_now()
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec="seconds")
+
+
+def _cents(amount):
+    return None if amount is None else int(round(amount * 100))
+
+
+class PriceHistory:
+    """
+    SQLite-backed price history keyed by (hotel, check-in, check-out, room).
+
+    Parameters:
+    - path : database file (":memory:" for a throw-away history)
+    """
+
+    def __init__(self, path="booking_history.sqlite"):
+        self.path = path
+        self.observed = 0
+        self.changed = 0
+        self._lock = threading.Lock()
+        # transactions are explicit (BEGIN IMMEDIATE in observe)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS series ("
+            " id INTEGER PRIMARY KEY,"
+            " hotel TEXT NOT NULL,"
+            " check_in TEXT NOT NULL,"
+            " check_out TEXT NOT NULL,"
+            " room TEXT NOT NULL,"
+            " city TEXT,"
+            " amount INTEGER,"                 # latest, minor units
+            " currency TEXT,"
+            " base INTEGER,"                   # latest non-null amount, minor units
+            " changed_at INTEGER NOT NULL,"
+            " seen_at INTEGER NOT NULL,"
+            " UNIQUE (hotel, check_in, check_out, room))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS changes ("
+            " series INTEGER NOT NULL,"
+            " t INTEGER NOT NULL,"             # epoch seconds
+            " delta INTEGER,"                  # minor units vs the previous non-null amount; NULL = unavailable
+            " currency TEXT,"                  # only when it changed
+            " PRIMARY KEY (series, t)) WITHOUT ROWID"
+        )
+
+    # ── writing ───────────────────────────────────────────────────────
+
+    def _load_locked(self, key):
+        # [series id, cents, currency, last change epoch, last non-null cents] or None
+        return self._db.execute(
+            "SELECT id, amount, currency, changed_at, base FROM series"
+            " WHERE hotel = ? AND check_in = ? AND check_out = ? AND room = ?", key,
+        ).fetchone()
+
+    def observe(self, records):
+        """
+        Compares *records* with the stored history, appends the changes and
+        returns the records that are new or changed (in input order).
+        """
+        changed = []
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                changed = self._observe_locked(records)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            self.observed += len(records)
+            self.changed += len(changed)
+        if changed:
+            log.info("   Δ %d of %d price(s) changed", len(changed), len(records))
+        return changed
+
+    def _observe_locked(self, records):
+        changed = []
+        for record in records:
+            key = series_key(record)
+            cents = _cents(_field(record, "amount"))
+            currency = _field(record, "currency")
+            t = _epoch(_field(record, "scraped_at"))
+            state = self._load_locked(key)
+
+            if state is None:
+                cursor = self._db.execute(
+                    "INSERT INTO series (hotel, check_in, check_out, room, city, amount,"
+                    " currency, base, changed_at, seen_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    key + (_field(record, "city"), cents, currency, cents, t, t),
+                )
+                self._db.execute(
+                    "INSERT INTO changes (series, t, delta, currency) VALUES (?, ?, ?, ?)",
+                    (cursor.lastrowid, t, cents, currency),
+                )
+                changed.append(record)
+                continue
+
+            series_id, last_cents, last_currency, last_t, base = state
+            if cents == last_cents and (cents is None or currency == last_currency):
+                self._db.execute("UPDATE series SET seen_at = MAX(seen_at, ?) WHERE id = ?",
+                                 (t, series_id))
+                continue
+
+            # keep the series strictly ordered even for late / same-second observations
+            t = max(t, last_t + 1)
+            delta = None if cents is None else cents - (base or 0)
+            new_currency = currency if cents is not None and currency != last_currency else None
+            self._db.execute(
+                "INSERT INTO changes (series, t, delta, currency) VALUES (?, ?, ?, ?)",
+                (series_id, t, delta, new_currency),
+            )
+            if cents is not None:
+                base = cents
+                last_currency = currency
+            self._db.execute(
+                "UPDATE series SET amount = ?, currency = ?, base = ?, changed_at = ?,"
+                " seen_at = ? WHERE id = ?",
+                (cents, last_currency, base, t, t, series_id),
+            )
+            changed.append(record)
+        return changed
+
+    # ── queries ───────────────────────────────────────────────────────
+
+    def _series_id_locked(self, hotel, check_in, check_out, room):
+        state = self._load_locked((_norm(hotel), check_in, check_out, _norm(room)))
+        return None if state is None else state[0]
+
+    def latest(self, hotel, check_in, check_out, room=""):
+        """ Current PricePoint of a series (None when never observed). """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT amount, currency, changed_at FROM series"
+                " WHERE hotel = ? AND check_in = ? AND check_out = ? AND room = ?",
+                (_norm(hotel), check_in, check_out, _norm(room)),
+            ).fetchone()
+        if row is None:
+            return None
+        amount, currency, changed_at = row
+        return PricePoint(_iso(changed_at), None if amount is None else amount / 100, currency)
+
+    def history(self, hotel, check_in, check_out, room="", since=None, until=None):
+        """
+        Every price change of a series, oldest first; *since* / *until*
+        (ISO timestamps) limit the result to changes in that window.
+        """
+        since = None if since is None else _epoch(since)
+        until = None if until is None else _epoch(until)
+        with self._lock:
+            series_id = self._series_id_locked(hotel, check_in, check_out, room)
+            if series_id is None:
+                return []
+            # deltas are relative, so the series is always decoded from its start
+            query = "SELECT t, delta, currency FROM changes WHERE series = ?"
+            params = [series_id]
+            if until is not None:
+                query += " AND t <= ?"
+                params.append(until)
+            rows = self._db.execute(query + " ORDER BY t", params).fetchall()
+        points = []
+        base, currency = 0, None
+        for t, delta, changed_currency in rows:
+            if changed_currency is not None:
+                currency = changed_currency
+            if delta is None:
+                amount = None
+            else:
+                base += delta
+                amount = base / 100
+            if since is None or t >= since:
+                points.append(PricePoint(_iso(t), amount, currency))
+        return points
+
+    def series(self, hotel=None):
+        """ Keys (hotel, check_in, check_out, room) of every series, optionally of one hotel. """
+        query = "SELECT hotel, check_in, check_out, room FROM series"
+        params = ()
+        if hotel is not None:
+            query += " WHERE hotel = ?"
+            params = (_norm(hotel),)
+        with self._lock:
+            return [tuple(row) for row in self._db.execute(query + " ORDER BY hotel, check_in, check_out, room", params)]
+
+    def stats(self):
+        """ Observations / changes since the history was opened. """
+        with self._lock:
+            return {
+                "observed": self.observed,
+                "changed": self.changed,
+                "change_rate": self.changed / self.observed if self.observed else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ChangeSink:
+    """
+    Sink wrapper that records every batch in a PriceHistory and passes
+    only the new or changed records on to *sink* (when given).  Accepted
+    wherever a RecordSink is (sink= / room_sink= of scrape_booking_price,
+    scrape_many ...).
+
+    Parameters:
+    - history : PriceHistory
+    - sink    : downstream RecordSink, or None to only keep the history
+    """
+
+    def __init__(self, history, sink=None):
+        self.history = history
+        self.sink = sink
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        self.write_many([record])
+
+    def write_many(self, records):
+        changed = self.history.observe(records)
+        with self._lock:
+            self.count += len(changed)
+        if changed and self.sink is not None:
+            self.sink.write_many(changed)
+
+    def flush(self):
+        if self.sink is not None:
+            self.sink.flush()
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
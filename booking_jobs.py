@@ -0,0 +1,131 @@
+"""
+Scrape job definitions shared by the batch, scheduling and CLI entry points.
+Kept free of Selenium imports so jobs can be built and validated cheaply.
+"""
+
+import csv
+import hashlib
+import json
+from dataclasses import dataclass, astuple, fields
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class ScrapeJob:
+    """
+    One (hotel, dates) query.
+
+    Parameters:
+    - city           : str (e.g., "Dubai")
+    - hotel_name     : str (e.g., "Howard Johnson Bur Dubai")
+    - check_in_date  : str (format: "YYYY-MM-DD")
+    - check_out_date : str (format: "YYYY-MM-DD")
+    - profile        : optional browser profile name ("default", "lean")
+    """
+    city: str
+    hotel_name: str
+    check_in_date: str
+    check_out_date: str
+    profile: str = None
+
+    def validate(self):
+        """
+        Raises ValueError when the dates are malformed or out of order.
+        """
+        checkin = datetime.strptime(self.check_in_date, "%Y-%m-%d")
+        checkout = datetime.strptime(self.check_out_date, "%Y-%m-%d")
+        if checkout <= checkin:
+            raise ValueError(
+                f"check-out {self.check_out_date} must be after check-in {self.check_in_date}"
+            )
+        return self
+
+    def as_args(self):
+        """ Positional arguments for scrape_booking_price() """
+        return astuple(self)[:len(JOB_FIELDS)]
+
+
+# required fields, in scrape_booking_price() argument order
+JOB_FIELDS = [f.name for f in fields(ScrapeJob) if f.name != "profile"]
+
+
+def as_job(job):
+    """
+    Accepts a ScrapeJob, a (city, hotel_name, check_in, check_out[, profile])
+    tuple or a dict with those keys and returns a ScrapeJob.
+    """
+    if isinstance(job, ScrapeJob):
+        return job
+    if isinstance(job, dict):
+        return ScrapeJob(
+            city=job["city"],
+            hotel_name=job["hotel_name"],
+            check_in_date=job["check_in_date"],
+            check_out_date=job["check_out_date"],
+            profile=job.get("profile") or None,
+        )
+    return ScrapeJob(*job)
+
+
+def job_id(job):
+    """
+    Stable id of a job's query (city, hotel and dates; the profile only
+    changes how it is scraped), e.g. for checkpoint files.
+    """
+    job = as_job(job)
+    key = "\x1f".join(" ".join(str(value).lower().split()) for value in job.as_args())
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def load_jobs(path):
+    """
+    Reads job rows from a JSONL or CSV file.  Every row needs city,
+    hotel_name, check_in_date and check_out_date; optional columns
+    (profile, priority, deadline ...) are kept for the caller.  Returns a list of dicts.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = [dict(row) for row in csv.DictReader(f)]
+    else:
+        rows = []
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_no}: invalid JSON ({e})") from None
+    for i, row in enumerate(rows, 1):
+        missing = [k for k in JOB_FIELDS if not row.get(k)]
+        if missing:
+            raise ValueError(f"{path}: job {i} is missing {', '.join(missing)}")
+    return rows
+
+
+def parse_deadline(value):
+    """
+    Deadline as a POSIX timestamp: accepts None, a number (timestamp) or
+    an ISO-8601 string (a trailing "Z" means UTC, also before Python 3.11).
+    Raises ValueError for anything else.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if not isinstance(value, str):
+        raise ValueError(f"invalid deadline {value!r} (timestamp or ISO-8601)")
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    text = value.strip()
+    if text[-1:] in ("Z", "z"):
+        text = text[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        raise ValueError(f"invalid deadline {value!r} (timestamp or ISO-8601)") from None
@@ -0,0 +1,84 @@
+"""
+Logging for the scraper modules.
+
+Every module logs through a child of the "booking" logger instead of
+printing, so status lines cost nothing when their level is disabled:
+
+    configure_logging("INFO")                 # the original console output
+    configure_logging("WARNING")              # problems only
+    configure_logging("DEBUG", fmt="json")    # every step, one JSON object per line
+
+Without configure_logging() only warnings and errors reach stderr (through
+Python's last-resort handler).  BOOKING_LOG_LEVEL and BOOKING_LOG_FORMAT
+set the defaults of configure_logging().
+"""
+
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+
+
+LOGGER_NAME = "booking"
+
+# LogRecord attributes that are not user-supplied "extra" fields
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def get_logger(name):
+    """ Logger for one module, e.g. get_logger("scraper") → "booking.scraper". """
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record: ts, level, logger, msg and every field
+    passed through ``extra=``.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage().strip(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level=None, fmt=None, stream=None):
+    """
+    Sends the scraper's log records to *stream* (stderr by default).
+
+    Parameters:
+    - level  : level name or number; defaults to $BOOKING_LOG_LEVEL or "INFO"
+    - fmt    : "text" (the bare status lines) or "json"; defaults to
+               $BOOKING_LOG_FORMAT or "text"
+    - stream : file object to write to
+
+    Calling it again replaces the handler installed by the previous call.
+    Returns the "booking" logger.
+    """
+    level = level or os.environ.get("BOOKING_LOG_LEVEL", "INFO")
+    fmt = fmt or os.environ.get("BOOKING_LOG_FORMAT", "text")
+    if fmt not in ("text", "json"):
+        raise ValueError(f"Unknown log format {fmt!r}; choose one of ['json', 'text']")
+
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        if getattr(handler, "_booking_handler", False):
+            logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter("%(message)s"))
+    handler._booking_handler = True
+    logger.addHandler(handler)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+    return logger
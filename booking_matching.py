@@ -0,0 +1,255 @@
+"""
+Fuzzy hotel-name matching.
+
+Names are normalized into tokens (case, accents, punctuation, "&" and
+filler words such as "hotel" / "by" are ignored).  A match needs a
+high token-set ratio, high coverage of the query's tokens and few letters
+beyond the query's (the brand after "by" is free), so "Howard Johnson Bur
+Dubai" matches "Howard Johnson by Wyndham Bur Dubai" but neither "Howard
+Johnson Plaza by Wyndham Dubai Deira" nor a sister property such as "Ibis
+Al Barsha" → "Ibis Styles Dubai Al Barsha".
+
+HotelIndex precomputes a trigram index over a hotel catalogue so a name
+can be matched against thousands of catalogue entries without scoring
+every one of them.  It is a library helper (e.g. for mapping scraped
+names onto a catalogue offline); the scrapers check each result card
+against their single target with is_same_hotel() and do not use it.
+
+Selenium is only needed for read_texts(), which fetches the visible text
+of many elements in a single script call.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+
+DEFAULT_THRESHOLD = 0.9
+
+# words that carry no identity in hotel names
+STOPWORDS = {"hotel", "hotels", "the", "by", "and", "a", "an", "at", "of", "in"}
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def normalize_name(text):
+    """ Lowercase, accent-free, punctuation-free name with "&" → "and". """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.lower().replace("&", " and ")
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def token_list(text):
+    """ Identity-bearing tokens of a hotel name, in order. """
+    words = normalize_name(text).split()
+    return [w for w in words if w not in STOPWORDS] or words
+
+
+def name_tokens(text):
+    """ Identity-bearing tokens of a hotel name, as a set. """
+    return set(token_list(text))
+
+
+def _ratio(a, b, floor=0.0):
+    """
+    SequenceMatcher ratio of *a* and *b*.  When the cheap upper bounds
+    already rule out beating *floor* that bound is returned instead.
+    """
+    if a == b:
+        return 1.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    bound = matcher.real_quick_ratio()
+    if bound <= floor:
+        return bound
+    bound = matcher.quick_ratio()
+    if bound <= floor:
+        return bound
+    return matcher.ratio()
+
+
+def token_set_ratio(a_tokens, b_tokens):
+    """
+    Similarity in [0, 1] of two token sets; 1.0 when one set contains the
+    other, so extra brand words on either side do not hurt.
+    """
+    common = " ".join(sorted(a_tokens & b_tokens))
+    only_a = " ".join(sorted(a_tokens - b_tokens))
+    only_b = " ".join(sorted(b_tokens - a_tokens))
+    with_a = f"{common} {only_a}".strip()
+    with_b = f"{common} {only_b}".strip()
+    best = _ratio(common, with_a)
+    best = max(best, _ratio(common, with_b, best))
+    return max(best, _ratio(with_a, with_b, best))
+
+
+def token_coverage(query_tokens, candidate_tokens):
+    """
+    How well every query token is represented in the candidate: each query
+    token scores its best similarity to a candidate token (or to two
+    adjacent candidate tokens joined, so "skygarden" ~ "sky garden").
+    """
+    if not query_tokens:
+        return 0.0
+    pool = set(candidate_tokens)
+    pool.update(a + b for a, b in zip(candidate_tokens, candidate_tokens[1:]))
+    total = 0.0
+    for token in query_tokens:
+        if token in pool:
+            total += 1.0
+            continue
+        best = 0.0
+        for other in pool:
+            best = max(best, _ratio(token, other, best))
+        total += best
+    return total / len(query_tokens)
+
+
+def identity(text):
+    """
+    (tokens, letters) of a hotel name: its token_list() and the number of
+    letters in those tokens, not counting the brand word after "by"
+    ("Howard Johnson by Wyndham Bur Dubai" has the letters of "Howard
+    Johnson Bur Dubai").
+    """
+    words = normalize_name(text).split()
+    brands = {words[i + 1] for i, word in enumerate(words[:-1]) if word == "by"}
+    tokens = token_list(text)
+    return tokens, sum(len(t) for t in tokens if t not in brands) or sum(map(len, tokens))
+
+
+def length_ratio(query_letters, candidate_letters):
+    """
+    1.0 unless the candidate is longer than the query; the letters only
+    the candidate has ("Ibis Styles Dubai Al Barsha" for "Ibis Al Barsha")
+    cost half their share of the candidate's length.
+    """
+    if candidate_letters <= query_letters:
+        return 1.0
+    return 1.0 - 0.5 * (candidate_letters - query_letters) / candidate_letters
+
+
+def _score(query, candidate, floor=0.0):
+    """
+    min(length ratio, similarity, coverage) of two identity() pairs;
+    returns early with a value <= *floor* when the candidate cannot beat it.
+    """
+    (query_list, query_letters), (candidate_list, candidate_letters) = query, candidate
+    # a candidate containing every query token scores 1.0 on both of the
+    # others, so the extra words of a sister property are charged here
+    bound = length_ratio(query_letters, candidate_letters)
+    if bound <= floor:
+        return bound
+    similarity = token_set_ratio(set(query_list), set(candidate_list))
+    # the joined ratio rescues names that only differ in spacing
+    similarity = max(similarity, _ratio("".join(query_list), "".join(candidate_list), similarity))
+    bound = min(bound, similarity)
+    if bound <= floor:
+        return bound
+    return min(bound, token_coverage(query_list, candidate_list))
+
+
+def match_score(query, candidate):
+    """ Similarity in [0, 1] of two hotel names. """
+    return _score(identity(query), identity(candidate))
+
+
+def is_same_hotel(query, candidate, threshold=DEFAULT_THRESHOLD):
+    return match_score(query, candidate) >= threshold
+
+
+def best_match(query, candidates, threshold=0.0):
+    """
+    Returns (index, score) of the candidate text that best matches *query*,
+    or None when no candidate reaches *threshold*.  Of equally scored
+    candidates the one closest to the query as written wins.
+    """
+    query_identity = identity(query)
+    query_text = normalize_name(query)
+    best = None
+    closeness = 0.0
+    for i, text in enumerate(candidates):
+        # just below the best score, so a tie is scored in full
+        floor = best[1] - 1e-9 if best is not None else 0.0
+        score = _score(query_identity, identity(text), floor)
+        if score < threshold or (best is not None and score < best[1]):
+            continue
+        if best is None or score > best[1]:
+            best, closeness = (i, score), None
+        else:
+            if closeness is None:
+                closeness = _ratio(query_text, normalize_name(candidates[best[0]]))
+            tied = _ratio(query_text, normalize_name(text))
+            if tied > closeness:
+                best, closeness = (i, score), tied
+    return best
+
+
+def trigrams(text):
+    padded = f"  {normalize_name(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class HotelIndex:
+    """
+    Trigram index over a hotel catalogue.
+
+    Parameters:
+    - names      : catalogue of canonical hotel names
+    - threshold  : minimum match_score() for a match
+    - candidates : how many trigram-preselected names are fully scored
+    """
+
+    def __init__(self, names, threshold=DEFAULT_THRESHOLD, candidates=20):
+        self.names = list(names)
+        self.threshold = threshold
+        self.candidates = candidates
+        self._identities = [identity(n) for n in self.names]
+        self._postings = defaultdict(list)
+        for i, name in enumerate(self.names):
+            for gram in trigrams(name):
+                self._postings[gram].append(i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, text, limit=5):
+        """
+        Returns up to *limit* (name, score) pairs above the threshold,
+        best first.
+        """
+        overlap = defaultdict(int)
+        for gram in trigrams(text):
+            for i in self._postings.get(gram, ()):
+                overlap[i] += 1
+        shortlist = sorted(overlap, key=overlap.__getitem__, reverse=True)[:self.candidates]
+
+        query = identity(text)
+        scored = []
+        for i in shortlist:
+            score = _score(query, self._identities[i])
+            if score >= self.threshold:
+                scored.append((self.names[i], score))
+        scored.sort(key=lambda pair: pair[1], reverse=True)
+        return scored[:limit]
+
+    def match(self, text):
+        """ Best (name, score) for *text*, or None. """
+        found = self.lookup(text, limit=1)
+        return found[0] if found else None
+
+
+_TEXTS_JS = (
+    "return Array.prototype.map.call(arguments[0], function (el) {"
+    " return (el.innerText || el.textContent || '').trim(); });"
+)
+
+
+def read_texts(driver, elements):
+    """
+    Visible text of every element in *elements* with one round-trip.
+    """
+    if not elements:
+        return []
+    return driver.execute_script(_TEXTS_JS, list(elements))
@@ -0,0 +1,443 @@
+"""
+Timing metrics for the scraping path.
+
+Every stage of a scrape (setup, homepage, popups, typing, autocomplete,
+calendar, search, results_wait, extraction, property) is wrapped in a
+span and its duration recorded in STAGE_TIMINGS.  Pop-up sweeps also run
+inside other stages, so the "popups" time is contained in theirs.
+
+    STAGE_TIMINGS.reset()
+    scrape_booking_price(...)
+    print(STAGE_TIMINGS.summary())          # {"typing": {"count": 4, "p50": ...}, ...}
+
+Below the stages, every individual wait, click and find is a step():
+its duration goes to STEP_TIMINGS under "<kind>:<name>" and its outcome
+(ok / timeout / error) to STEP_OUTCOMES.  Each fallback selector list
+records which selector matched (hit) and which were tried in vain (miss)
+in SELECTOR_STATS.  write_metrics() exports all of it, plus the pop-up
+sweep count of booking_popups.POPUP_STATS, in the Prometheus text format
+or as an OpenMetrics file:
+
+    reset_metrics()
+    scrape_booking_price(...)
+    write_metrics("run.prom")
+"""
+
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from booking_log import get_logger
+
+
+log = get_logger("metrics")
+
+
+# scraping stages in flow order
+STAGES = [
+    "setup", "homepage", "popups", "typing", "autocomplete", "calendar",
+    "search", "results_wait", "extraction", "property",
+]
+
+
+def percentile(values, q):
+    """ *q*-th percentile (0-100) of *values*, linearly interpolated. """
+    return _sorted_percentile(sorted(values), q)
+
+
+def _sorted_percentile(ordered, q):
+    if not ordered:
+        return None
+    pos = (len(ordered) - 1) * q / 100.0
+    low, high = math.floor(pos), math.ceil(pos)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+class _Series:
+    """ Count, sum and max of every duration plus a bounded sample of them. """
+
+    __slots__ = ("count", "total", "max", "sample")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.sample = []
+
+
+class Timings:
+    """
+    Thread-safe collection of durations (seconds) per name.
+
+    Count, total and max are exact; the percentiles come from a uniform
+    reservoir sample of at most *reservoir_size* durations per name, so a
+    long run holds (and exports) a bounded amount per name.
+    """
+
+    def __init__(self, reservoir_size=1024):
+        self.reservoir_size = reservoir_size
+        self._series = defaultdict(_Series)
+        self._lock = threading.Lock()
+        self._random = random.Random()
+
+    def record(self, name, seconds):
+        with self._lock:
+            series = self._series[name]
+            series.count += 1
+            series.total += seconds
+            series.max = max(series.max, seconds)
+            if len(series.sample) < self.reservoir_size:
+                series.sample.append(seconds)
+            else:
+                i = self._random.randrange(series.count)
+                if i < self.reservoir_size:
+                    series.sample[i] = seconds
+
+    @contextmanager
+    def span(self, name):
+        """ Records the wall time of the with-block under *name*. """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def names(self):
+        with self._lock:
+            return sorted(self._series)
+
+    def values(self, name):
+        """ The sampled durations of *name* (all of them below reservoir_size). """
+        with self._lock:
+            series = self._series.get(name)
+            return list(series.sample) if series is not None else []
+
+    def stats(self, name):
+        """ (count, total, max, sample) of *name*; the sample is a copy. """
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                return 0, 0.0, 0.0, []
+            return series.count, series.total, series.max, list(series.sample)
+
+    def summary(self):
+        """ {name: {count, total, mean, p50, p95, max}} in seconds. """
+        result = {}
+        for name in self.names():
+            count, total, longest, sample = self.stats(name)
+            sample.sort()
+            result[name] = {
+                "count": count,
+                "total": round(total, 6),
+                "mean": round(total / count, 6),
+                "p50": round(_sorted_percentile(sample, 50), 6),
+                "p95": round(_sorted_percentile(sample, 95), 6),
+                "max": round(longest, 6),
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+STAGE_TIMINGS = Timings()
+
+
+def stage(name):
+    """ Span for one scraping stage, recorded in STAGE_TIMINGS. """
+    return STAGE_TIMINGS.span(name)
+
+
+# ── STEPS AND SELECTORS ──────────────────────────────────────────────────
+
+class Counters:
+    """
+    Thread-safe counts per key (any hashable, usually a tuple of labels).
+    """
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, key, n=1):
+        with self._lock:
+            self._counts[key] += n
+
+    def items(self):
+        with self._lock:
+            return sorted(self._counts.items())
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+STEP_TIMINGS = Timings()
+STEP_OUTCOMES = Counters()
+
+
+class _Step:
+    __slots__ = ("outcome",)
+
+    def __init__(self):
+        self.outcome = "ok"
+
+
+@contextmanager
+def step(kind, name):
+    """
+    Span for one wait, click or find.
+
+    The duration is recorded in STEP_TIMINGS under "<kind>:<name>" and the
+    outcome counted in STEP_OUTCOMES: "timeout" when a TimeoutException
+    leaves the block, "error" for any other exception, "ok" otherwise.
+    Code that swallows its own timeout sets the outcome on the yielded
+    object instead ("missing" for a find that matched nothing):
+
+        with step("wait", "dom_ready") as s:
+            if not ready:
+                s.outcome = "timeout"
+    """
+    current = _Step()
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        # matched by name so this module does not depend on selenium
+        current.outcome = "timeout" if type(e).__name__ == "TimeoutException" else "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        STEP_TIMINGS.record(f"{kind}:{name}", seconds)
+        STEP_OUTCOMES.add((kind, name, current.outcome))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("      %s %s  →  %s in %.3fs", kind, name, current.outcome, seconds,
+                      extra={"kind": kind, "step": name, "outcome": current.outcome,
+                             "seconds": round(seconds, 6)})
+
+
+class SelectorStats:
+    """
+    Thread-safe hit / miss counts per (group, selector) since the last
+    reset, fed by booking_selectors.SelectorRegistry.record().  A fallback
+    list scores a hit for the selector that matched and a miss for every
+    selector tried before it (all of them when none matched).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def hit(self, group, selector):
+        with self._lock:
+            self.hits[group, selector] += 1
+
+    def miss(self, group, selector):
+        with self._lock:
+            self.misses[group, selector] += 1
+
+    def add(self, hits, misses):
+        """ Adds Counters of (group, selector) → hits / misses in one go. """
+        with self._lock:
+            self.hits.update(hits)
+            self.misses.update(misses)
+
+    def hit_rate(self, group, selector):
+        """ Share of attempts at *selector* that matched (None when never tried). """
+        with self._lock:
+            hits, misses = self.hits[group, selector], self.misses[group, selector]
+        return hits / (hits + misses) if hits + misses else None
+
+    def summary(self):
+        """ {group: {selector: {"hits": n, "misses": n}}} """
+        with self._lock:
+            keys = set(self.hits) | set(self.misses)
+            result = {}
+            for group, selector in sorted(keys):
+                result.setdefault(group, {})[selector] = {
+                    "hits": self.hits[group, selector],
+                    "misses": self.misses[group, selector],
+                }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+
+
+SELECTOR_STATS = SelectorStats()
+
+
+def reset_metrics():
+    """ Clears the stage, step, selector and pop-up metrics (e.g. before a run). """
+    from booking_popups import POPUP_STATS
+
+    for metric in (STAGE_TIMINGS, STEP_TIMINGS, STEP_OUTCOMES, SELECTOR_STATS, POPUP_STATS):
+        metric.reset()
+
+
+# ── EXPORT ───────────────────────────────────────────────────────────────
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample(name, labels, value):
+    if not labels:
+        return f"{name} {value}"
+    body = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+    return f"{name}{{{body}}} {value}"
+
+
+def _summary_family(lines, name, help_text, timings, label_names, split):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} summary")
+    lines.append(f"# UNIT {name} seconds")
+    for key in timings.names():
+        labels = list(zip(label_names, split(key) if split else (key,)))
+        count, total, _, sample = timings.stats(key)
+        sample.sort()
+        for q in (0.5, 0.95):
+            lines.append(_sample(name, labels + [("quantile", q)], _sorted_percentile(sample, q * 100)))
+        lines.append(_sample(f"{name}_sum", labels, total))
+        lines.append(_sample(f"{name}_count", labels, count))
+
+
+def _counter_family(lines, name, help_text, samples, openmetrics):
+    lines.append(f"# HELP {name if openmetrics else name + '_total'} {help_text}")
+    lines.append(f"# TYPE {name if openmetrics else name + '_total'} counter")
+    for labels, value in samples:
+        lines.append(_sample(f"{name}_total", labels, value))
+
+
+def to_prometheus(openmetrics=False):
+    """
+    Renders every metric in the Prometheus text exposition format, or in
+    the OpenMetrics format (with the closing "# EOF") when *openmetrics*.
+
+    Families:
+    - booking_stage_seconds{stage}                   : summary per scraping stage
+    - booking_step_seconds{kind,step}                : summary per wait / click / find
+    - booking_steps_total{kind,step,outcome}         : step outcomes
+    - booking_selector_total{group,selector,outcome} : selector hits / misses
+    - booking_popup_sweeps_total                     : pop-up sweeps
+    """
+    from booking_popups import POPUP_STATS
+
+    lines = []
+    _summary_family(lines, "booking_stage_seconds", "Duration of one scraping stage.",
+                    STAGE_TIMINGS, ["stage"], None)
+    _summary_family(lines, "booking_step_seconds", "Duration of one wait, click or find.",
+                    STEP_TIMINGS, ["kind", "step"], lambda key: key.split(":", 1))
+    _counter_family(lines, "booking_steps", "Waits, clicks and finds by outcome.", [
+        ([("kind", kind), ("step", name), ("outcome", outcome)], count)
+        for (kind, name, outcome), count in STEP_OUTCOMES.items()
+    ], openmetrics)
+
+    selectors = []
+    for group, by_selector in SELECTOR_STATS.summary().items():
+        for selector, counts in by_selector.items():
+            selectors.append(([("group", group), ("selector", selector), ("outcome", "hit")], counts["hits"]))
+            selectors.append(([("group", group), ("selector", selector), ("outcome", "miss")], counts["misses"]))
+    _counter_family(lines, "booking_selector", "Fallback selector attempts by outcome.",
+                    selectors, openmetrics)
+    _counter_family(lines, "booking_popup_sweeps", "Pop-up sweeps run.",
+                    [([], POPUP_STATS.summary()["sweeps"])], openmetrics)
+
+    if openmetrics:
+        lines.append("# EOF")
+    else:
+        lines = [line for line in lines if not line.startswith("# UNIT")]
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path, openmetrics=None):
+    """
+    Writes to_prometheus() to *path* (atomically).  *openmetrics* defaults
+    to True for ".om" / ".openmetrics" files and False otherwise; a ".prom"
+    file suits the node_exporter textfile collector.
+    """
+    if openmetrics is None:
+        openmetrics = path.endswith((".om", ".openmetrics"))
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(to_prometheus(openmetrics))
+    os.replace(tmp, path)
+    log.info("✓ Metrics written to %s", path)
+    return path
+
+
+# ── MEMORY ───────────────────────────────────────────────────────────────
+
+def _proc_children(pid):
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # the command name may contain spaces; fields resume after ")"
+        if int(stat.rsplit(")", 1)[1].split()[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def _proc_rss(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss(pid, include_root=True):
+    """
+    Resident bytes of *pid* and all of its descendants, e.g. chromedriver
+    plus Chrome and its renderers (only the descendants when *include_root*
+    is False).  Uses psutil when installed, /proc on Linux otherwise; None
+    when neither is available.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            procs = ([root] if include_root else []) + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs if p.is_running())
+        except psutil.Error:
+            return None
+    if not os.path.isdir("/proc"):
+        return None
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        if include_root or current != pid:
+            total += _proc_rss(current)
+        stack.extend(_proc_children(current))
+    return total
+
+
+def driver_rss(driver):
+    """ process_tree_rss() of a local WebDriver session (None when unknown). """
+    try:
+        return process_tree_rss(driver.service.process.pid)
+    except AttributeError:
+        return None
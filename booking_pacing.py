@@ -0,0 +1,259 @@
+"""
+Pacing policies and condition-based waits for the Booking.com scraper.
+
+A PacingPolicy decides how long the scraper deliberately pauses between
+steps (typing, clicks, pop-ups ...).  The condition-based waits below make
+the scraper wait only as long as the page actually needs, so a policy can
+drop every deliberate pause when throttling is not a concern.  Selenium is
+imported by the waits themselves, so the presets can be resolved (e.g. by
+a CLI validating its arguments) without loading it.
+
+Presets:
+- "human"      : the original human-like delays (default)
+- "balanced"   : short jittered pauses, no "thinking" pauses
+- "zero-delay" : no deliberate pauses at all; words are typed in one burst
+"""
+
+import time
+import random
+
+from booking_metrics import step
+
+
+# (min, max) seconds for every deliberate pause the scraper makes
+HUMAN_PAUSES = {
+    "after_focus":        (0.3, 0.7),     # after clicking into a field
+    "keystroke":          (0.05, 0.35),   # between two typed characters
+    "think":              (0.4, 0.9),     # occasional longer pause while typing
+    "after_clear":        (0.3, 0.6),
+    "between_words":      (0.15, 0.4),
+    "after_first_word":   (0.8, 1.5),
+    "suggestions_render": (0.6, 1.2),
+    "after_full_name":    (1.0, 2.0),
+    "after_select":       (1.0, 1.0),     # after picking an autocomplete suggestion
+    "after_enter":        (2.0, 2.0),
+    "after_popup":        (0.5, 0.5),
+    "calendar_open":      (1.5, 1.5),
+    "calendar_click":     (0.8, 0.8),
+    "between_dates":      (0.5, 0.5),
+    "after_dates":        (1.0, 1.0),
+    "after_apply":        (1.0, 1.0),
+    "before_search":      (0.5, 0.5),
+    "after_search":       (5.0, 5.0),
+    "results_popups":     (1.0, 2.0),
+    "results_timeout":    (5.0, 5.0),     # after the results wait timed out
+    "after_load":         (3.0, 3.0),     # after driver.get()
+}
+
+
+class PacingPolicy:
+    """
+    Decides the deliberate pauses the scraper makes.
+
+    Parameters:
+    - name           : preset name, used in log lines
+    - pauses         : dict  kind → (min, max) seconds
+    - scale          : multiplier applied to every pause (0 disables them)
+    - think_chance   : probability of a "think" pause after each keystroke
+    - burst_typing   : type whole strings with one send_keys() call
+    - inspect_pauses : keep the long "inspect the browser" pauses of a
+                       standalone run
+    """
+
+    def __init__(self, name, pauses=None, scale=1.0, think_chance=0.15,
+                 burst_typing=False, inspect_pauses=False):
+        self.name = name
+        self.pauses = dict(HUMAN_PAUSES if pauses is None else pauses)
+        self.scale = scale
+        self.think_chance = think_chance
+        self.burst_typing = burst_typing
+        self.inspect_pauses = inspect_pauses
+
+    def delay(self, kind):
+        """ Seconds to pause for *kind* (0 for unknown kinds). """
+        low, high = self.pauses.get(kind, (0.0, 0.0))
+        return random.uniform(low, high) * self.scale
+
+    def pause(self, kind):
+        seconds = self.delay(kind)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def maybe_think(self):
+        """ Occasionally adds a slightly longer pause, like a human thinking. """
+        if self.think_chance and random.random() < self.think_chance:
+            self.pause("think")
+
+    def __repr__(self):
+        return f"PacingPolicy({self.name!r}, scale={self.scale})"
+
+
+HUMAN = PacingPolicy("human", inspect_pauses=True)
+BALANCED = PacingPolicy("balanced", scale=0.25, think_chance=0.0)
+ZERO_DELAY = PacingPolicy("zero-delay", scale=0.0, think_chance=0.0, burst_typing=True)
+
+PRESETS = {policy.name: policy for policy in (HUMAN, BALANCED, ZERO_DELAY)}
+
+
+def get_pacing(pacing):
+    """
+    Returns a PacingPolicy for a preset name, a policy or None (→ HUMAN).
+    """
+    if pacing is None:
+        return HUMAN
+    if isinstance(pacing, PacingPolicy):
+        return pacing
+    try:
+        return PRESETS[pacing]
+    except KeyError:
+        raise ValueError(
+            f"Unknown pacing preset {pacing!r}; choose one of {sorted(PRESETS)}"
+        ) from None
+
+
+# ── CONDITION-BASED WAITS ────────────────────────────────────────────────
+
+# First selector (in list order) with a matching element, and its elements;
+# with "usable" only visible, enabled elements count
+_FIRST_MATCH_JS = """
+var sels = arguments[0], usableOnly = arguments[1];
+function usable(el) {
+    var r = el.getBoundingClientRect();
+    if (r.width <= 0 || r.height <= 0 || el.disabled) return false;
+    var st = window.getComputedStyle(el);
+    return st.visibility !== 'hidden' && st.display !== 'none';
+}
+for (var i = 0; i < sels.length; i++) {
+    var nodes, found = [];
+    try { nodes = document.querySelectorAll(sels[i]); } catch (e) { continue; }
+    for (var j = 0; j < nodes.length; j++) {
+        if (!usableOnly || usable(nodes[j])) found.push(nodes[j]);
+    }
+    if (found.length) return [sels[i], found];
+}
+return null;
+"""
+
+
+def wait_for_dom_ready(driver, timeout=10):
+    """
+    Waits until document.readyState is "complete" ("interactive" is enough
+    for sessions using the eager page-load strategy).  Returns False on
+    timeout.
+    """
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    capabilities = getattr(driver, "capabilities", None) or {}
+    ready = ("interactive", "complete") if capabilities.get("pageLoadStrategy") == "eager" else ("complete",)
+    with step("wait", "dom_ready") as s:
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState") in ready
+            )
+            return True
+        except TimeoutException:
+            s.outcome = "timeout"
+        except WebDriverException:
+            s.outcome = "error"
+        return False
+
+
+def wait_for_any(driver, selectors, timeout=10, clickable=False, name="any", poll=0.25):
+    """
+    Races a fallback list: waits until any of *selectors* matches and
+    returns (selector, elements) for the first one, in list order, that
+    does.  All selectors are checked in one script call per poll, so a
+    selector that no longer exists costs nothing.  With *clickable* only
+    visible, enabled elements count.  Returns (None, []) on timeout.
+
+    The wait is recorded as step("wait", *name*).
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    with step("wait", name) as s:
+        try:
+            found = WebDriverWait(driver, timeout, poll_frequency=poll).until(
+                lambda d: d.execute_script(_FIRST_MATCH_JS, list(selectors), clickable)
+            )
+        except TimeoutException:
+            s.outcome = "timeout"
+            return None, []
+        return found[0], found[1]
+
+
+def wait_for_staleness(driver, element, timeout=5):
+    """
+    Waits until *element* is detached from the DOM (e.g. a closed pop-up or
+    a re-rendered calendar month).  Returns False on timeout.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    with step("wait", "staleness") as s:
+        try:
+            WebDriverWait(driver, timeout).until(EC.staleness_of(element))
+            return True
+        except TimeoutException:
+            s.outcome = "timeout"
+            return False
+
+
+def wait_for_invisibility(driver, element, timeout=1):
+    """
+    Waits until *element* is hidden or detached (e.g. a dismissed pop-up).
+    Returns False on timeout.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    with step("wait", "invisibility") as s:
+        try:
+            WebDriverWait(driver, timeout).until(EC.invisibility_of_element(element))
+            return True
+        except TimeoutException:
+            s.outcome = "timeout"
+            return False
+
+
+def wait_for_network_idle(driver, idle_time=0.5, timeout=10, poll=0.1):
+    """
+    Waits until no new resource requests have started for *idle_time*
+    seconds, based on the Resource Timing entries of the page.
+    Returns False on timeout.
+    """
+    with step("wait", "network_idle") as s:
+        idle = _network_idle(driver, idle_time, timeout, poll)
+        if not idle:
+            s.outcome = "error" if idle is None else "timeout"
+        return bool(idle)
+
+
+def _network_idle(driver, idle_time, timeout, poll):
+    # True when idle, False on timeout, None when the page cannot be queried
+    from selenium.common.exceptions import WebDriverException
+
+    script = "return window.performance.getEntriesByType('resource').length"
+    deadline = time.monotonic() + timeout
+    try:
+        last_count = driver.execute_script(script)
+    except WebDriverException:
+        return None
+    quiet_since = time.monotonic()
+
+    while time.monotonic() < deadline:
+        time.sleep(poll)
+        try:
+            count = driver.execute_script(script)
+        except WebDriverException:
+            return None
+        now = time.monotonic()
+        if count != last_count:
+            last_count = count
+            quiet_since = now
+        elif now - quiet_since >= idle_time:
+            return True
+    return False
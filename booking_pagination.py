@@ -0,0 +1,218 @@
+"""
+Lazy iteration over the complete search-result set.
+
+Booking.com shows 25 property cards at a time and either appends more
+cards ("Load more results" / infinite scroll) or links to the next page.
+iter_result_cards() follows whichever the page offers and yields cards
+one at a time, so a caller that stops early (target found, enough cards)
+never triggers another page load:
+
+    for card in iter_result_cards(driver, limit=200,
+                                  until=lambda c: is_same_hotel(name, c.name)):
+        ...
+
+Every step reads only the cards that were not read before (one script
+call) and parses them offline, so the Python side holds a single batch at
+a time however large the result set is.
+"""
+
+import logging
+
+from selenium.common.exceptions import (
+    TimeoutException, WebDriverException, ElementClickInterceptedException,
+    ElementNotInteractableException, StaleElementReferenceException,
+)
+from selenium.webdriver.support.ui import WebDriverWait
+
+from booking_log import get_logger
+from booking_metrics import step
+from booking_pacing import get_pacing, wait_for_dom_ready, wait_for_network_idle, wait_for_staleness
+from booking_parser import CARD_SELECTOR, fetch_results_html, iter_property_cards
+from booking_popups import dismiss_popups
+from booking_selectors import SELECTORS
+
+
+log = get_logger("pagination")
+
+
+LOAD_MORE_SELECTORS = SELECTORS.register("load_more", [
+    "button[data-testid='load-more-results']",
+    "div[data-results-container] + div button",
+])
+LOAD_MORE_TEXTS = ["load more results", "show more results"]
+
+NEXT_PAGE_SELECTORS = SELECTORS.register("next_page", [
+    "button[aria-label='Next page']",
+    "a[aria-label='Next page']",
+    "li.bui-pagination__next-arrow a",
+    "a.paging-next",
+])
+
+_COUNT_CARDS_JS = "return document.querySelectorAll(arguments[0]).length;"
+
+# [selector, element] for the first selector with a visible element, else
+# [null, button] for a visible button whose text matches; the load-more
+# button only carries hashed class names.
+_FIND_CONTROL_JS = """
+function visible(el) {
+    var r = el.getBoundingClientRect();
+    return r.width > 0 && r.height > 0 && !el.disabled && el.getAttribute('aria-disabled') !== 'true';
+}
+var sels = arguments[0], texts = arguments[1];
+for (var i = 0; i < sels.length; i++) {
+    var els = document.querySelectorAll(sels[i]);
+    for (var j = 0; j < els.length; j++) if (visible(els[j])) return [sels[i], els[j]];
+}
+if (texts.length) {
+    var buttons = document.querySelectorAll('button');
+    for (var k = 0; k < buttons.length; k++) {
+        var t = (buttons[k].innerText || '').trim().toLowerCase();
+        for (var m = 0; m < texts.length; m++) {
+            if (t.indexOf(texts[m]) !== -1 && visible(buttons[k])) return [null, buttons[k]];
+        }
+    }
+}
+return null;
+"""
+
+
+def count_cards(driver):
+    try:
+        return driver.execute_script(_COUNT_CARDS_JS, CARD_SELECTOR) or 0
+    except WebDriverException:
+        return 0
+
+
+def _find_control(driver, selectors, texts=(), name="control", group=None):
+    # with a *group*, selectors come in registry order and the outcome is recorded
+    if group is not None:
+        selectors = SELECTORS.order(group)
+    with step("find", name) as s:
+        try:
+            found = driver.execute_script(_FIND_CONTROL_JS, selectors, list(texts))
+        except WebDriverException:
+            s.outcome = "error"
+            return None
+        if found is None:
+            s.outcome = "missing"
+    if group is not None:
+        SELECTORS.record_first(group, selectors, found[0] if found else None)
+    return found[1] if found else None
+
+
+def _click(driver, element, name="control"):
+    with step("click", name) as s:
+        try:
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+            element.click()
+            return True
+        except (ElementClickInterceptedException, ElementNotInteractableException):
+            try:
+                driver.execute_script("arguments[0].click();", element)
+                return True
+            except WebDriverException:
+                s.outcome = "error"
+                return False
+        except (StaleElementReferenceException, WebDriverException):
+            s.outcome = "error"
+            return False
+
+
+def _wait_for_more_cards(driver, seen, timeout):
+    with step("wait", "more_cards") as s:
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.25).until(lambda d: count_cards(d) > seen)
+            return True
+        except TimeoutException:
+            s.outcome = "timeout"
+            return False
+
+
+def load_more_results(driver, seen, pacing=None, timeout=10):
+    """
+    Brings more results onto the page.  Returns "more" when cards were
+    appended to the current page (infinite scroll or "Load more results"),
+    "page" when the next results page was opened, or None at the end of
+    the result set.
+
+    Parameters:
+    - driver  : WebDriver on a search-results page
+    - seen    : number of cards already read from the current page
+    - pacing  : PacingPolicy or preset name
+    - timeout : seconds to wait for new cards after each attempt
+    """
+    pacing = get_pacing(pacing)
+
+    # infinite scroll: reaching the bottom of the list may be enough
+    try:
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    except WebDriverException:
+        return None
+    if _wait_for_more_cards(driver, seen, min(timeout, 2)):
+        wait_for_network_idle(driver, timeout=5)
+        return "more"
+
+    dismiss_popups(driver, pacing)
+    button = _find_control(driver, LOAD_MORE_SELECTORS, LOAD_MORE_TEXTS, "load_more", "load_more")
+    if button is not None and _click(driver, button, "load_more"):
+        if _wait_for_more_cards(driver, seen, timeout):
+            wait_for_network_idle(driver, timeout=5)
+            if log.isEnabledFor(logging.INFO):
+                log.info("   ↻ Loaded more results (%d cards on page)", count_cards(driver))
+            return "more"
+
+    link = _find_control(driver, NEXT_PAGE_SELECTORS, name="next_page", group="next_page")
+    if link is not None:
+        first_card = _find_control(driver, [CARD_SELECTOR], name="first_card")
+        if _click(driver, link, "next_page"):
+            if first_card is not None:
+                wait_for_staleness(driver, first_card, timeout=timeout)
+            wait_for_dom_ready(driver)
+            if _wait_for_more_cards(driver, 0, timeout):
+                wait_for_network_idle(driver, timeout=5)
+                log.info("   ↻ Opened next results page")
+                return "page"
+
+    return None
+
+
+def iter_result_cards(driver, limit=None, until=None, max_pages=40, pacing=None, timeout=10):
+    """
+    Generator yielding a PropertyCard for every result, following
+    "load more" and pagination lazily.
+
+    Parameters:
+    - driver    : WebDriver on a search-results page
+    - limit     : stop after this many cards
+    - until     : predicate; iteration stops right after the first card
+                  for which it returns True (e.g. the target hotel)
+    - max_pages : safety cap on the number of load-more / next-page steps
+    - pacing    : PacingPolicy or preset name, used between page loads
+    - timeout   : seconds to wait for new cards after each step
+
+    Ranks are continuous across pages.
+    """
+    pacing = get_pacing(pacing)
+    rank = 1
+    seen = 0            # cards already read from the current page
+    steps = 0
+    while True:
+        new = 0
+        for card in iter_property_cards(fetch_results_html(driver, start=seen), start_rank=rank):
+            new += 1
+            rank += 1
+            yield card
+            if (limit is not None and rank > limit) or (until is not None and until(card)):
+                return
+        seen += new
+
+        if steps >= max_pages:
+            log.warning("   ⚠ Stopped after %d additional page(s) (max_pages)", steps)
+            return
+        steps += 1
+        pacing.pause("after_load")
+        loaded = load_more_results(driver, seen, pacing, timeout)
+        if loaded is None:
+            return
+        if loaded == "page":
+            seen = 0
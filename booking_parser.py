@@ -0,0 +1,442 @@
+"""
+Offline parser for Booking.com search-results and property-page HTML.
+
+The results page is fetched once (fetch_results_html: one JS call, or
+driver.page_source) and every property card is parsed here without any
+further WebDriver round-trips.  The same goes for the availability table
+of a property page (fetch_room_table_html / parse_room_rates).  Only the
+standard library is used, so the parser can be unit-tested and
+benchmarked against saved HTML fixtures.
+
+Only the small CSS subset the scraper needs is supported:
+tag names, #id, .class, [attr], [attr='value'] and the descendant combinator.
+"""
+
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+
+from booking_selectors import SELECTORS
+
+
+CARD_SELECTOR = "[data-testid='property-card']"
+
+# Fallback selectors per field, tried in order (same as the live scraper).
+# The multi-selector lists are registered in booking_selectors for their
+# hit counts but keep their order: earlier selectors take precedence.
+TITLE_SELECTORS = ["[data-testid='title']"]
+PRICE_SELECTORS = SELECTORS.register("price", [
+    "[data-testid='price-and-discounted-price']",
+    ".prco-valign-middle-helper",
+    "span[data-testid='price-and-discounted-price']",
+], adaptive=False)
+RATING_SELECTORS = ["[data-testid='review-score'] div"]
+ADDRESS_SELECTORS = ["[data-testid='address']"]
+LINK_SELECTORS = SELECTORS.register("link", [
+    "a[data-testid='title-link']",
+    "a[data-testid='property-card-desktop-single-image']",
+], adaptive=False)
+
+# Property page availability table ("hprt" = hotel page room table)
+ROOM_TABLE_SELECTORS = ["table#hprt-table", "table.hprt-table"]
+ROOM_NAME_SELECTORS = SELECTORS.register("room_name", [
+    ".hprt-roomtype-icon-link",
+    "[data-room-name]",
+    ".hprt-roomtype-link",
+], adaptive=False)
+OCCUPANCY_SELECTORS = [".hprt-occupancy-occupancy-info"]
+OCCUPANCY_ICON_SELECTOR = ".bicon-occupancy"
+ROOM_PRICE_SELECTORS = SELECTORS.register("room_price", [
+    ".bui-price-display__value",
+    ".prco-valign-middle-helper",
+    "[data-testid='price-and-discounted-price']",
+], adaptive=False)
+CONDITION_SELECTORS = [".hprt-table-cell-conditions li", ".hprt-table-cell-conditions"]
+
+BOARD_KEYWORDS = [
+    ("all-inclusive", "All inclusive"),
+    ("all inclusive", "All inclusive"),
+    ("full board", "Full board"),
+    ("half board", "Half board"),
+    ("breakfast included", "Breakfast included"),
+    ("breakfast", "Breakfast included"),
+    ("room only", "Room only"),
+]
+
+# Elements that never contain visible text or never have children
+_SKIP_TEXT_TAGS = {"script", "style", "template", "noscript"}
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class PropertyCard:
+    """
+    One search-result card.  Missing fields are None.
+    """
+    rank: int
+    name: str
+    price: str = None
+    rating: str = None
+    address: str = None
+    url: str = None
+
+
+@dataclass
+class RoomRate:
+    """
+    One row of the property page availability table.  Missing fields are None.
+    """
+    room_type: str
+    board: str = None
+    cancellation: str = None
+    occupancy: int = None
+    price: str = None
+
+
+# ── MINIMAL DOM ──────────────────────────────────────────────────────────
+
+class Node:
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+        self.parent = parent
+
+    def iter(self):
+        """ Depth-first iteration over all descendant elements. """
+        stack = [c for c in reversed(self.children) if isinstance(c, Node)]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(c for c in reversed(node.children) if isinstance(c, Node))
+
+    @property
+    def text(self):
+        """ Visible text with whitespace collapsed, like WebElement.text. """
+        parts = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+            elif item.tag not in _SKIP_TEXT_TAGS:
+                if item.tag == "br":
+                    parts.append(" ")
+                stack.extend(reversed(item.children))
+        return _WHITESPACE.sub(" ", "".join(parts)).strip()
+
+    def select(self, selector):
+        """ All descendants matching *selector*, in document order. """
+        steps = _compile(selector)
+        return [node for node in self.iter() if _matches(node, steps, self)]
+
+    def select_one(self, selector):
+        steps = _compile(selector)
+        for node in self.iter():
+            if _matches(node, steps, self):
+                return node
+        return None
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {}, None)
+        self._current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self._current)
+        self._current.children.append(node)
+        if tag not in _VOID_TAGS:
+            self._current = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self._current)
+        self._current.children.append(node)
+
+    def handle_endtag(self, tag):
+        # walk up to the matching open element; tolerate stray end tags
+        node = self._current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self._current = node.parent
+
+    def handle_data(self, data):
+        self._current.children.append(data)
+
+
+def parse_html(html):
+    """ Parses *html* into a Node tree and returns the document node. """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# ── SELECTORS ────────────────────────────────────────────────────────────
+
+_SIMPLE = re.compile(
+    r"""(?P<tag>[a-zA-Z][\w-]*|\*)
+      | \#(?P<id>[\w-]+)
+      | \.(?P<cls>[\w-]+)
+      | \[\s*(?P<attr>[\w-]+)\s*(?:=\s*(?P<q>['"]?)(?P<val>.*?)(?P=q))?\s*\]
+    """,
+    re.VERBOSE,
+)
+
+_compiled = {}
+
+
+def _compile(selector):
+    """
+    Compiles a descendant selector into a list of steps; each step is a
+    list of (kind, name, value) tests.
+    """
+    steps = _compiled.get(selector)
+    if steps is not None:
+        return steps
+    steps = []
+    for part in selector.split():
+        tests, pos = [], 0
+        while pos < len(part):
+            m = _SIMPLE.match(part, pos)
+            if not m:
+                raise ValueError(f"Unsupported selector: {selector!r}")
+            if m.group("tag") and m.group("tag") != "*":
+                tests.append(("tag", m.group("tag").lower(), None))
+            elif m.group("id"):
+                tests.append(("attr", "id", m.group("id")))
+            elif m.group("cls"):
+                tests.append(("class", m.group("cls"), None))
+            elif m.group("attr"):
+                tests.append(("attr", m.group("attr"), m.group("val")))
+            pos = m.end()
+        steps.append(tests)
+    _compiled[selector] = steps
+    return steps
+
+
+def _match_simple(node, tests):
+    for kind, name, value in tests:
+        if kind == "tag":
+            if node.tag != name:
+                return False
+        elif kind == "class":
+            if name not in node.attrs.get("class", "").split():
+                return False
+        else:
+            if name not in node.attrs:
+                return False
+            if value is not None and node.attrs[name] != value:
+                return False
+    return True
+
+
+def _matches(node, steps, scope):
+    """ Descendant-combinator match, bounded by *scope*. """
+    if not _match_simple(node, steps[-1]):
+        return False
+    ancestor = node.parent
+    for tests in reversed(steps[:-1]):
+        while ancestor is not None and ancestor is not scope and not _match_simple(ancestor, tests):
+            ancestor = ancestor.parent
+        if ancestor is None or ancestor is scope:
+            return False
+        ancestor = ancestor.parent
+    return True
+
+
+# ── EXTRACTION ───────────────────────────────────────────────────────────
+
+# With a *group*, the hit / miss of every selector tried is appended to
+# *passes*; the caller records a whole page in the selector registry at
+# once (SELECTORS.record_passes) instead of taking its lock per lookup.
+
+def _first_text(card, selectors, group=None, passes=None):
+    for i, sel in enumerate(selectors):
+        node = card.select_one(sel)
+        if node is not None:
+            text = node.text
+            if text:
+                if group is not None:
+                    passes.append((group, (sel,), selectors[:i]))
+                return text
+    if group is not None:
+        passes.append((group, (), selectors))
+    return None
+
+
+def _first_attr(node, selectors, attr, group=None, passes=None):
+    for i, sel in enumerate(selectors):
+        found = node.select_one(sel)
+        if found is not None and found.attrs.get(attr):
+            if group is not None:
+                passes.append((group, (sel,), selectors[:i]))
+            return found.attrs[attr]
+    if group is not None:
+        passes.append((group, (), selectors))
+    return None
+
+
+def iter_property_cards(html, start_rank=1):
+    """
+    Yields a PropertyCard for every property card in *html*.
+    """
+    document = parse_html(html)
+    rank = start_rank
+    passes = []
+    try:
+        for card in document.select(CARD_SELECTOR):
+            yield PropertyCard(
+                rank=rank,
+                name=_first_text(card, TITLE_SELECTORS) or "",
+                price=_first_text(card, PRICE_SELECTORS, "price", passes),
+                rating=_first_text(card, RATING_SELECTORS),
+                address=_first_text(card, ADDRESS_SELECTORS),
+                url=_first_attr(card, LINK_SELECTORS, "href", "link", passes),
+            )
+            rank += 1
+    finally:
+        # also when the caller stops early (parse_property_cards' limit)
+        SELECTORS.record_passes(passes)
+
+
+def parse_property_cards(html, limit=None):
+    """
+    Parses every property card in *html* (or the first *limit* cards).
+    """
+    cards = []
+    for card in iter_property_cards(html):
+        if limit is not None and len(cards) >= limit:
+            break
+        cards.append(card)
+    return cards
+
+
+# Cards' outerHTML (from index arguments[1] on) in one round-trip; far
+# smaller than page_source
+_CARDS_HTML_JS = (
+    "return Array.prototype.slice.call("
+    "document.querySelectorAll(arguments[0]), arguments[1] || 0"
+    ").map(function (c) { return c.outerHTML; }).join('\\n');"
+)
+
+
+def fetch_results_html(driver, start=0):
+    """
+    Returns the HTML of all property cards on the current page (or of the
+    cards from index *start* on) using a single script call.  Falls back
+    to driver.page_source for a full read.
+    """
+    try:
+        html = driver.execute_script(_CARDS_HTML_JS, CARD_SELECTOR, start)
+    except Exception:
+        html = None
+    if html or start:
+        return html or ""
+    return driver.page_source
+
+
+# ── PROPERTY PAGE ────────────────────────────────────────────────────────
+
+_DIGITS = re.compile(r"\d+")
+
+
+def _occupancy(row):
+    text = _first_text(row, OCCUPANCY_SELECTORS)
+    if text:
+        match = _DIGITS.search(text)
+        if match:
+            return int(match.group(0))
+    icons = row.select(OCCUPANCY_ICON_SELECTOR)
+    return len(icons) or None
+
+
+def _conditions(row):
+    for sel in CONDITION_SELECTORS:
+        texts = [node.text for node in row.select(sel)]
+        texts = [t for t in texts if t]
+        if texts:
+            return texts
+    return []
+
+
+def _board(conditions):
+    lowered = " | ".join(conditions).lower()
+    for keyword, board in BOARD_KEYWORDS:
+        if keyword in lowered:
+            return board
+    return None
+
+
+def _cancellation(conditions):
+    for text in conditions:
+        lowered = text.lower()
+        if "cancel" in lowered or "refundable" in lowered:
+            return text
+    return None
+
+
+def parse_room_rates(html):
+    """
+    Parses the availability table of a property page into RoomRate rows.
+    The room-type cell spans all rate rows of a room, so rows without one
+    inherit the room type of the row above.
+    """
+    document = parse_html(html)
+    table = None
+    for sel in ROOM_TABLE_SELECTORS:
+        table = document.select_one(sel)
+        if table is not None:
+            break
+    if table is None:
+        return []
+
+    rates = []
+    room_type = None
+    passes = []
+    for row in table.select("tbody tr"):
+        name = _first_text(row, ROOM_NAME_SELECTORS, "room_name", passes)
+        if name:
+            room_type = name
+        price = _first_text(row, ROOM_PRICE_SELECTORS, "room_price", passes)
+        if price is None or room_type is None:
+            continue
+        conditions = _conditions(row)
+        rates.append(RoomRate(
+            room_type=room_type,
+            board=_board(conditions),
+            cancellation=_cancellation(conditions),
+            occupancy=_occupancy(row),
+            price=price,
+        ))
+    SELECTORS.record_passes(passes)
+    return rates
+
+
+_ROOM_TABLE_JS = (
+    "var sels = arguments[0];"
+    "for (var i = 0; i < sels.length; i++) {"
+    " var t = document.querySelector(sels[i]); if (t) return t.outerHTML; }"
+    "return '';"
+)
+
+
+def fetch_room_table_html(driver):
+    """
+    Returns the HTML of the availability table with a single script call,
+    falling back to driver.page_source.
+    """
+    try:
+        html = driver.execute_script(_ROOM_TABLE_JS, ROOM_TABLE_SELECTORS)
+    except Exception:
+        html = None
+    return html if html else driver.page_source
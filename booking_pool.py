@@ -0,0 +1,246 @@
+"""
+Batch scraping on top of a bounded pool of warm Chrome sessions.
+
+Launching Chrome and resolving the chromedriver binary dominates the cost of
+a single query, so scrape_many() keeps a few long-lived drivers around,
+resets them between jobs and only recycles a session after it has served
+*max_jobs_per_session* jobs or stopped responding.  Sessions are tagged with
+their browser profile (see booking_profiles), so jobs asking for different
+profiles never share a session.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+from booking_jobs import as_job
+from booking_log import get_logger
+from booking_profiles import get_profile
+from booking_scraper_v2 import create_driver, scrape_booking_price
+
+
+log = get_logger("pool")
+
+
+class PooledSession:
+    """
+    A WebDriver owned by a DriverPool, its browser profile name and the
+    number of jobs it has served.
+    """
+
+    def __init__(self, driver, profile="default"):
+        self.driver = driver
+        self.profile = profile
+        self.jobs_done = 0
+
+    def is_healthy(self):
+        """
+        Cheap liveness probe: any command round-trip fails once the
+        browser or the chromedriver process has died.
+        """
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def reset(self):
+        """
+        Clears cookies and web storage so the next job starts from a clean
+        slate, then parks the tab on about:blank.
+        """
+        self.driver.delete_all_cookies()
+        try:
+            self.driver.execute_script(
+                "try { window.localStorage.clear(); } catch (e) {}"
+                "try { window.sessionStorage.clear(); } catch (e) {}"
+            )
+        except WebDriverException:
+            pass
+        self.driver.get("about:blank")
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except WebDriverException:
+            pass
+
+
+class DriverPool:
+    """
+    Bounded pool of reusable Chrome sessions.
+
+    Parameters:
+    - size                 : maximum number of concurrent browser sessions
+    - max_jobs_per_session : a session is recycled after serving this many jobs
+    - options_factory      : optional callable returning fresh Chrome Options;
+                             overrides the profile's options
+    - profile              : default BrowserProfile or profile name for
+                             sessions (jobs may ask for another one)
+    """
+
+    def __init__(self, size=2, max_jobs_per_session=25, options_factory=None, profile=None):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.max_jobs_per_session = max_jobs_per_session
+        self.options_factory = options_factory
+        self.profile = get_profile(profile)
+
+        self._idle = []                            # most recently used last → warmest cache
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._sessions = set()
+        self._closed = False
+
+    def _new_session(self, profile):
+        options = self.options_factory() if self.options_factory is not None else None
+        driver = create_driver(options, profile=profile)       # driver path cached by booking_driver
+        session = PooledSession(driver, profile.name)
+        with self._lock:
+            self._sessions.add(session)
+        return session
+
+    def _discard(self, session):
+        with self._lock:
+            self._sessions.discard(session)
+        session.quit()
+
+    def _take_idle(self, profile_name):
+        """
+        Pops the warmest idle session of *profile_name*.  When there is none,
+        the coldest idle session of another profile is quit so the number of
+        browsers stays within *size*.
+        """
+        with self._lock:
+            for i in range(len(self._idle) - 1, -1, -1):
+                if self._idle[i].profile == profile_name:
+                    return self._idle.pop(i)
+            other = self._idle.pop(0) if self._idle else None
+        if other is not None:
+            self._discard(other)
+        return None
+
+    def acquire(self, profile=None):
+        """
+        Returns a healthy session of *profile* (default: the pool's profile),
+        blocking while *size* sessions are busy.
+        """
+        if self._closed:
+            raise RuntimeError("DriverPool is closed")
+        profile = self.profile if profile is None else get_profile(profile)
+        self._slots.acquire()
+        try:
+            while True:
+                session = self._take_idle(profile.name)
+                if session is None:
+                    return self._new_session(profile)
+                if session.is_healthy():
+                    return session
+                log.warning("   ⚠ Pooled browser session died  →  replacing it")
+                self._discard(session)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, session, crashed=False):
+        """
+        Hands a session back to the pool.  Crashed, unhealthy or worn-out
+        sessions are quit instead of being reused.
+        """
+        try:
+            session.jobs_done += 1
+            if self._closed or crashed or session.jobs_done >= self.max_jobs_per_session:
+                self._discard(session)
+                return
+            try:
+                session.reset()
+            except WebDriverException:
+                self._discard(session)
+                return
+            with self._lock:
+                self._idle.append(session)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """ Quits every session owned by the pool. """
+        self._closed = True
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+            self._idle.clear()
+        for session in sessions:
+            session.quit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def run_job(pool, job, scrape=scrape_booking_price, **scrape_kwargs):
+    """
+    Runs one job on a pooled session.  Returns (result, error) where
+    *error* is the exception raised by the job, or None.  Extra keyword
+    arguments (e.g. fast_path=True) are passed through to *scrape*.  A
+    browser that fails to start is that job's error, too.
+
+    When *scrape* can answer from a cache (booking_cache.CachedScraper),
+    the cache is asked first and only a miss takes a pooled session.
+    """
+    job = as_job(job)
+    lookup = getattr(scrape, "lookup", None)
+    if lookup is not None:
+        profile = pool.profile if job.profile is None else job.profile
+        try:
+            records = lookup(*job.as_args(), profile=profile, **scrape_kwargs)
+        except Exception as e:
+            return None, e
+        if records is not None:
+            return records, None
+        scrape = scrape.fetch
+    try:
+        session = pool.acquire(job.profile)
+    except Exception as e:
+        return None, e
+    crashed = False
+    try:
+        return scrape(*job.as_args(), driver=session.driver, **scrape_kwargs), None
+    except WebDriverException as e:
+        crashed = not session.is_healthy()
+        return None, e
+    except Exception as e:
+        return None, e
+    finally:
+        pool.release(session, crashed=crashed)
+
+
+def scrape_many(jobs, workers=2, max_jobs_per_session=25, options_factory=None, profile=None,
+                scrape=scrape_booking_price, **scrape_kwargs):
+    """
+    Scrapes a batch of jobs in parallel on a shared pool of warm browsers.
+
+    Parameters:
+    - jobs                 : iterable of ScrapeJob / (city, hotel, check-in, check-out)
+    - workers              : number of browser sessions running in parallel
+    - max_jobs_per_session : recycle each browser after this many jobs
+    - options_factory      : callable returning Chrome Options for new sessions
+    - profile              : browser profile for jobs that do not name one
+    - scrape               : scrape function (e.g. a booking_cache.CachedScraper)
+    - scrape_kwargs        : passed to scrape_booking_price (e.g. fast_path=True)
+
+    Returns a list of (job, result, error) tuples in the order the jobs were given.
+    """
+    jobs = [as_job(job) for job in jobs]
+    if not jobs:
+        return []
+
+    workers = max(1, min(workers, len(jobs)))
+    with DriverPool(workers, max_jobs_per_session, options_factory, profile) as pool:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(lambda job: run_job(pool, job, scrape, **scrape_kwargs), jobs))
+
+    return [(job, result, error) for job, (result, error) in zip(jobs, outcomes)]
@@ -0,0 +1,227 @@
+"""
+Single-pass pop-up handling for Booking.com.
+
+Instead of giving every close-button selector its own WebDriverWait, one
+injected script looks for all candidate overlays at once and returns only
+the ones that are actually visible.  When nothing is on screen a sweep
+costs a single round-trip.  Every sweep is recorded in POPUP_STATS so
+selectors that never fire can be pruned from POPUP_SELECTORS, and in the
+selector registry (group "popup"), which checks the selectors that fire
+most often first.
+"""
+
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import (
+    WebDriverException, ElementClickInterceptedException,
+    ElementNotInteractableException, StaleElementReferenceException,
+    NoSuchElementException,
+)
+
+from booking_log import get_logger
+from booking_metrics import step
+from booking_pacing import get_pacing, wait_for_invisibility
+from booking_selectors import SELECTORS
+
+
+log = get_logger("popups")
+
+
+# List of common pop-up close button selectors
+POPUP_SELECTORS = SELECTORS.register("popup", [
+    # Cookie consent
+    "button[id='onetrust-accept-btn-handler']",
+    "button[aria-label='Dismiss sign-in info.']",
+
+    # Sign-in pop-ups
+    "button[aria-label='Dismiss sign in information.']",
+    "button[aria-label='Close']",
+    "button.fc63351294.a822bdf511.e3c025e003.fa565176a8.f7db01295e.c334e6f658.e1b7cfea84.cd7aa7c891",
+
+    # Generic close buttons
+    "button[data-testid='header-sign-in-button'] ~ button",
+    "div[role='dialog'] button[aria-label='Close']",
+    "button.a83ed08757.c21c56c305.bf0537ecb5.ab98298258.deab83296e.f4552b6561",
+
+    # X buttons
+    "button.bui-modal__close",
+    "button.modal-mask-closeBtn",
+
+    # Overlay close
+    "div.bui-overlay",
+
+    # Sign-in modal
+    "div[data-testid='header-sign-in-button']",
+
+    # Genius loyalty program
+    "button[aria-label='Close Genius info']",
+])
+
+# Clicking the backdrop closes most remaining modals
+BACKDROP_SELECTOR = "div[class*='modal-mask']"
+
+# Anything matching this is an open dialog that Escape may close
+DIALOG_SELECTOR = "div[role='dialog'], [aria-modal='true']"
+
+
+# One round-trip: returns the first visible element for every selector
+# that matches, plus whether a dialog / backdrop is currently open.
+_FIND_POPUPS_JS = """
+var selectors = arguments[0], backdropSel = arguments[1], dialogSel = arguments[2];
+function visible(el) {
+    var r = el.getBoundingClientRect();
+    if (r.width <= 0 || r.height <= 0) return false;
+    var st = window.getComputedStyle(el);
+    return st.visibility !== 'hidden' && st.display !== 'none';
+}
+function firstVisible(sel) {
+    var nodes;
+    try { nodes = document.querySelectorAll(sel); } catch (e) { return null; }
+    for (var i = 0; i < nodes.length; i++) {
+        if (visible(nodes[i])) return nodes[i];
+    }
+    return null;
+}
+var hits = [], seen = [];
+for (var i = 0; i < selectors.length; i++) {
+    var el = firstVisible(selectors[i]);
+    if (el && seen.indexOf(el) === -1) {
+        seen.push(el);
+        hits.push([selectors[i], el]);
+    }
+}
+return {hits: hits, backdrop: !!firstVisible(backdropSel), dialog: !!firstVisible(dialogSel)};
+"""
+
+
+@dataclass
+class PopupReport:
+    """
+    Outcome of one pop-up sweep.
+
+    - fired   : selectors whose element was present and clicked
+    - failed  : selectors whose element was present but could not be clicked
+    - escaped : True when Escape was sent to an open dialog
+    """
+    fired: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+    escaped: bool = False
+
+    @property
+    def closed(self):
+        return bool(self.fired) or self.escaped
+
+
+class PopupStats:
+    """
+    Thread-safe counters of how often each selector fired across sweeps.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sweeps = 0
+        self.fired = Counter()
+        self.failed = Counter()
+
+    def record(self, report):
+        with self._lock:
+            self.sweeps += 1
+            self.fired.update(report.fired)
+            self.failed.update(report.failed)
+
+    def dead_selectors(self, selectors=None):
+        """ Selectors that never matched a visible element. """
+        selectors = POPUP_SELECTORS + [BACKDROP_SELECTOR] if selectors is None else selectors
+        with self._lock:
+            return [sel for sel in selectors if not self.fired[sel] and not self.failed[sel]]
+
+    def summary(self):
+        with self._lock:
+            return {
+                "sweeps": self.sweeps,
+                "fired": dict(self.fired),
+                "failed": dict(self.failed),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.sweeps = 0
+            self.fired.clear()
+            self.failed.clear()
+
+
+POPUP_STATS = PopupStats()
+
+
+def find_popups(driver, selectors=None):
+    """
+    Returns (hits, backdrop_open, dialog_open) where *hits* is a list of
+    (selector, element) for every selector with a visible match.
+    *selectors* defaults to the registry order of POPUP_SELECTORS.
+    """
+    selectors = SELECTORS.order("popup") if selectors is None else selectors
+    with step("find", "popups") as s:
+        try:
+            found = driver.execute_script(_FIND_POPUPS_JS, selectors, BACKDROP_SELECTOR, DIALOG_SELECTOR)
+        except WebDriverException:
+            s.outcome = "error"
+            return [], False, False
+    hits = [(sel, el) for sel, el in found["hits"]]
+    return hits, bool(found["backdrop"]), bool(found["dialog"])
+
+
+def dismiss_popups(driver, pacing=None, selectors=None, stats=POPUP_STATS):
+    """
+    Closes every pop-up that is currently on screen and returns a
+    PopupReport.  Returns immediately when nothing is present.
+    """
+    pacing = get_pacing(pacing)
+    report = PopupReport()
+    adaptive = selectors is None
+    if adaptive:
+        selectors = SELECTORS.order("popup")
+    hits, backdrop_open, dialog_open = find_popups(driver, selectors)
+
+    for selector, element in hits:
+        try:
+            with step("click", "popup"):
+                element.click()
+        except (ElementClickInterceptedException, ElementNotInteractableException,
+                StaleElementReferenceException):
+            report.failed.append(selector)
+            continue
+        log.info("✓ Closed pop-up: %.50s...", selector, extra={"selector": selector})
+        report.fired.append(selector)
+        wait_for_invisibility(driver, element)
+        pacing.pause("after_popup")
+
+    # Try closing a remaining dialog by pressing Escape key
+    if dialog_open:
+        try:
+            webdriver.ActionChains(driver).send_keys(Keys.ESCAPE).perform()
+            report.escaped = True
+            pacing.pause("after_popup")
+        except WebDriverException:
+            pass
+
+    # Click outside any modal (on the backdrop)
+    if backdrop_open:
+        try:
+            driver.find_element(By.CSS_SELECTOR, BACKDROP_SELECTOR).click()
+            report.fired.append(BACKDROP_SELECTOR)
+            pacing.pause("after_popup")
+        except (NoSuchElementException, ElementClickInterceptedException,
+                ElementNotInteractableException, StaleElementReferenceException):
+            pass
+
+    if stats is not None:
+        stats.record(report)
+    if adaptive:
+        SELECTORS.record("popup", hits=[sel for sel in report.fired if sel != BACKDROP_SELECTOR],
+                         misses=[sel for sel in selectors if sel not in report.fired])
+    return report
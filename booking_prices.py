@@ -0,0 +1,147 @@
+"""
+Price-string normalization.
+
+Turns display prices such as "AED 1,234", "€ 1.234,50", "US$99" or a
+discounted pair "AED 1,500 AED 1,234" into NormalizedPrice tuples of
+(amount, currency, original_amount, discount).
+
+normalize_prices() works on whole columns: regexes are precompiled and
+every distinct string is parsed only once, which is what makes offline
+normalization of historical dumps fast (display prices repeat a lot).
+See benchmarks/bench_prices.py for throughput numbers.
+"""
+
+import re
+from collections import namedtuple
+
+
+NormalizedPrice = namedtuple("NormalizedPrice", "amount currency original_amount discount")
+
+EMPTY_PRICE = NormalizedPrice(None, None, None, None)
+
+# Symbols → ISO 4217 codes (longest symbols first in the regex below)
+CURRENCY_SYMBOLS = {
+    "US$": "USD",
+    "C$": "CAD",
+    "CA$": "CAD",
+    "A$": "AUD",
+    "AU$": "AUD",
+    "HK$": "HKD",
+    "S$": "SGD",
+    "R$": "BRL",
+    "NZ$": "NZD",
+    "$": "USD",
+    "€": "EUR",
+    "£": "GBP",
+    "¥": "JPY",
+    "₹": "INR",
+    "₩": "KRW",
+    "₺": "TRY",
+    "₽": "RUB",
+    "₪": "ILS",
+    "฿": "THB",
+    "₱": "PHP",
+    "zł": "PLN",
+    "Kč": "CZK",
+    "Ft": "HUF",
+    "د.إ": "AED",
+    "ر.س": "SAR",
+}
+
+_SYMBOLS = "|".join(re.escape(s) for s in sorted(CURRENCY_SYMBOLS, key=len, reverse=True))
+_CURRENCY_RE = re.compile(rf"(?<![A-Za-z])[A-Z]{{3}}(?![A-Za-z])|{_SYMBOLS}")
+
+# A number: digit groups joined by "." "," "'" or, before a 3-digit group, a space
+_NUMBER_RE = re.compile(r"\d+(?:(?:[.,']|[\u00a0\u202f\u2009 ](?=\d{3}(?!\d)))\d+)*")
+_GROUP_SPACES = re.compile(r"[\u00a0\u202f\u2009 ']")
+
+
+def parse_amount(number, decimal=None):
+    """
+    Converts one number token ("1,234", "1.234,50", "1 234", "12.5") to float.
+
+    Parameters:
+    - number  : the numeric token
+    - decimal : "." or "," to force the decimal separator; when None it is
+                inferred (the last of two different separators is the
+                decimal one; a single separator followed by exactly three
+                digits is a thousands separator)
+    """
+    number = _GROUP_SPACES.sub("", number)
+    if decimal is None:
+        last_dot, last_comma = number.rfind("."), number.rfind(",")
+        if last_dot >= 0 and last_comma >= 0:
+            decimal = "." if last_dot > last_comma else ","
+        elif last_dot >= 0 or last_comma >= 0:
+            sep = "." if last_dot >= 0 else ","
+            tail = number.rpartition(sep)[2]
+            if number.count(sep) > 1 or len(tail) == 3:
+                decimal = "," if sep == "." else "."      # grouping only
+            else:
+                decimal = sep
+        else:
+            decimal = "."
+    thousands = "," if decimal == "." else "."
+    number = number.replace(thousands, "").replace(decimal, ".")
+    return float(number)
+
+
+def _currency_code(token):
+    return CURRENCY_SYMBOLS.get(token, token)
+
+
+def normalize_price(text, decimal=None):
+    """
+    Parses one display price into a NormalizedPrice.
+
+    When several amounts are shown (strike-through original + discounted
+    price) the last one is the current price and the largest earlier one
+    the original price; discount = original_amount - amount.
+    """
+    if not text:
+        return EMPTY_PRICE
+    amounts = []
+    for token in _NUMBER_RE.findall(text):
+        try:
+            amounts.append(parse_amount(token, decimal))
+        except ValueError:
+            continue
+    if not amounts:
+        return EMPTY_PRICE
+
+    currency_match = _CURRENCY_RE.search(text)
+    currency = _currency_code(currency_match.group(0)) if currency_match else None
+
+    amount = amounts[-1]
+    original = max(amounts[:-1]) if len(amounts) > 1 else None
+    if original is not None and original <= amount:
+        original = None
+    discount = round(original - amount, 2) if original is not None else None
+    return NormalizedPrice(amount, currency, original, discount)
+
+
+def normalize_prices(texts, decimal=None):
+    """
+    Normalizes an iterable of price strings.  Each distinct string is
+    parsed once; returns a list of NormalizedPrice in input order.
+    """
+    memo = {}
+    out = []
+    append = out.append
+    for text in texts:
+        result = memo.get(text)
+        if result is None:
+            result = memo[text] = normalize_price(text, decimal)
+        append(result)
+    return out
+
+
+def normalize_columns(texts, decimal=None):
+    """
+    Column-oriented variant of normalize_prices(): returns a dict of four
+    equally long lists, ready for pandas.DataFrame(...) or a Parquet table.
+    """
+    rows = normalize_prices(texts, decimal)
+    if not rows:
+        return {name: [] for name in NormalizedPrice._fields}
+    return dict(zip(NormalizedPrice._fields, map(list, zip(*rows))))
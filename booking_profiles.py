@@ -0,0 +1,179 @@
+"""
+Browser profiles: the Chrome options a scraping session starts with.
+
+Profiles:
+- "default" : the original options (maximized, visible window, everything loaded)
+- "lean"    : headless, capped window, eager page loads; images, fonts,
+              media and third-party trackers / map tiles are never downloaded
+
+Content blocking uses Chrome's image content setting plus the DevTools
+Network.setBlockedURLs command, so no proxy or extension is needed.
+The page's own scripts still run; the results, calendar and autocomplete
+widgets need them.
+
+    driver = create_driver(profile="lean")
+
+benchmarks/bench_profiles.py measures load time and memory per profile.
+"""
+
+from booking_log import get_logger
+
+
+log = get_logger("profiles")
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+IMAGE_URL_PATTERNS = ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"]
+FONT_URL_PATTERNS = ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"]
+MEDIA_URL_PATTERNS = ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*"]
+
+# Analytics, ads, session recording and map tiles; none of them is needed
+# to search or to read prices
+THIRD_PARTY_URL_PATTERNS = [
+    "*googletagmanager.com*",
+    "*google-analytics.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*googleadservices.com*",
+    "*connect.facebook.net*",
+    "*facebook.com/tr*",
+    "*bat.bing.com*",
+    "*clarity.ms*",
+    "*hotjar.com*",
+    "*criteo.*",
+    "*taboola.com*",
+    "*tiktok.com*",
+    "*snapchat.com*",
+    "*pinterest.com*",
+    "*cdn.cookielaw.org*",
+    "*maps.googleapis.com*",
+    "*maps.gstatic.com*",
+    "*tile.openstreetmap.org*",
+    "*mapbox.com*",
+]
+
+
+class BrowserProfile:
+    """
+    Chrome settings for a scraping session.
+
+    Parameters:
+    - name                 : profile name, used in log lines
+    - headless             : run without a window
+    - window_size          : (width, height); None → maximized
+    - page_load_strategy   : "normal" (wait for every resource) or "eager"
+                             (return once the DOM is parsed)
+    - block_images         : never download images
+    - block_fonts          : never download web fonts
+    - block_media          : never download audio / video
+    - blocked_url_patterns : further URL patterns ("*" wildcards) to block
+    """
+
+    def __init__(self, name, headless=False, window_size=None, page_load_strategy="normal",
+                 block_images=False, block_fonts=False, block_media=False,
+                 blocked_url_patterns=()):
+        self.name = name
+        self.headless = headless
+        self.window_size = window_size
+        self.page_load_strategy = page_load_strategy
+        self.block_images = block_images
+        self.block_fonts = block_fonts
+        self.block_media = block_media
+        self.blocked_url_patterns = list(blocked_url_patterns)
+
+    def blocked_urls(self):
+        """ Every URL pattern the session should refuse to load. """
+        patterns = []
+        if self.block_images:
+            patterns += IMAGE_URL_PATTERNS
+        if self.block_fonts:
+            patterns += FONT_URL_PATTERNS
+        if self.block_media:
+            patterns += MEDIA_URL_PATTERNS
+        return patterns + self.blocked_url_patterns
+
+    def chrome_options(self):
+        """ Fresh Chrome Options for this profile. """
+        from selenium.webdriver.chrome.options import Options
+
+        chrome_options = Options()
+        if self.window_size is None:
+            chrome_options.add_argument('--start-maximized')
+        else:
+            chrome_options.add_argument('--window-size=%d,%d' % tuple(self.window_size))
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_argument('--disable-notifications')
+        chrome_options.add_argument('--disable-popup-blocking')
+
+        # Add user agent to look more like a real browser
+        chrome_options.add_argument(f'user-agent={USER_AGENT}')
+
+        if self.headless:
+            chrome_options.add_argument('--headless=new')
+            chrome_options.add_argument('--disable-gpu')
+        if self.block_images:
+            chrome_options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.page_load_strategy = self.page_load_strategy
+        return chrome_options
+
+    def apply(self, driver):
+        """
+        Installs the URL blocklist on a freshly started session.  Returns
+        False when the browser does not support it (blocking is then
+        limited to the image content setting).
+        """
+        from selenium.common.exceptions import WebDriverException
+
+        patterns = self.blocked_urls()
+        if not patterns:
+            return True
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            return True
+        except (WebDriverException, AttributeError):
+            log.warning("   ⚠ Browser profile %r: URL blocking not supported by this driver", self.name)
+            return False
+
+    def __repr__(self):
+        return f"BrowserProfile({self.name!r}, headless={self.headless})"
+
+
+DEFAULT = BrowserProfile("default")
+LEAN = BrowserProfile(
+    "lean",
+    headless=True,
+    window_size=(1366, 900),
+    page_load_strategy="eager",
+    block_images=True,
+    block_fonts=True,
+    block_media=True,
+    blocked_url_patterns=THIRD_PARTY_URL_PATTERNS,
+)
+
+PROFILES = {profile.name: profile for profile in (DEFAULT, LEAN)}
+
+
+def get_profile(profile):
+    """
+    Returns a BrowserProfile for a profile name, a profile or None (→ DEFAULT).
+    """
+    if profile is None:
+        return DEFAULT
+    if isinstance(profile, BrowserProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown browser profile {profile!r}; choose one of {sorted(PROFILES)}"
+        ) from None
@@ -0,0 +1,133 @@
+"""
+Typed result records produced by the scraper.
+"""
+
+from dataclasses import dataclass, asdict, fields
+from datetime import datetime, timezone
+
+from booking_prices import normalize_price
+
+
+@dataclass
+class PriceRecord:
+    """
+    One property card observed for one query.
+
+    - hotel       : hotel name as shown on the card
+    - city        : queried city
+    - check_in    : "YYYY-MM-DD"
+    - check_out   : "YYYY-MM-DD"
+    - price_text  : raw display price (None when not shown)
+    - amount      : parsed numeric price (None when unparseable)
+    - currency    : currency code / symbol (None when unknown)
+    - rating      : review score text
+    - address     : address / area text
+    - rank        : 1-based position in the results
+    - target      : True when the card is the hotel that was searched for
+    - scraped_at  : UTC timestamp, ISO-8601
+    - url         : property-page link of the card (None when not shown)
+    """
+    hotel: str
+    city: str
+    check_in: str
+    check_out: str
+    price_text: str = None
+    amount: float = None
+    currency: str = None
+    rating: str = None
+    address: str = None
+    rank: int = None
+    target: bool = False
+    scraped_at: str = None
+    url: str = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+FIELD_NAMES = [f.name for f in fields(PriceRecord)]
+
+
+def utc_now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def record_from_card(card, city, check_in, check_out, target=False, scraped_at=None):
+    """
+    Builds a PriceRecord from a booking_parser.PropertyCard.
+    """
+    price = normalize_price(card.price)
+    return PriceRecord(
+        hotel=card.name,
+        city=city,
+        check_in=check_in,
+        check_out=check_out,
+        price_text=card.price,
+        amount=price.amount,
+        currency=price.currency,
+        rating=card.rating,
+        address=card.address,
+        rank=card.rank,
+        target=target,
+        scraped_at=scraped_at or utc_now(),
+        url=card.url,
+    )
+
+
+@dataclass
+class RoomRateRecord:
+    """
+    One rate row of a property page availability table.
+
+    - hotel        : hotel name
+    - city         : queried city
+    - check_in     : "YYYY-MM-DD"
+    - check_out    : "YYYY-MM-DD"
+    - room_type    : room name, e.g. "Deluxe Twin Room"
+    - board        : meal plan ("Breakfast included", "Half board" ...; None when room only / unknown)
+    - cancellation : cancellation policy text (None when not shown)
+    - occupancy    : maximum number of guests
+    - price_text   : raw display price
+    - amount       : parsed numeric price (None when unparseable)
+    - currency     : currency code / symbol (None when unknown)
+    - scraped_at   : UTC timestamp, ISO-8601
+    """
+    hotel: str
+    city: str
+    check_in: str
+    check_out: str
+    room_type: str
+    board: str = None
+    cancellation: str = None
+    occupancy: int = None
+    price_text: str = None
+    amount: float = None
+    currency: str = None
+    scraped_at: str = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+ROOM_FIELD_NAMES = [f.name for f in fields(RoomRateRecord)]
+
+
+def record_from_room(rate, hotel, city, check_in, check_out, scraped_at=None):
+    """
+    Builds a RoomRateRecord from a booking_parser.RoomRate.
+    """
+    price = normalize_price(rate.price)
+    return RoomRateRecord(
+        hotel=hotel,
+        city=city,
+        check_in=check_in,
+        check_out=check_out,
+        room_type=rate.room_type,
+        board=rate.board,
+        cancellation=rate.cancellation,
+        occupancy=rate.occupancy,
+        price_text=rate.price,
+        amount=price.amount,
+        currency=price.currency,
+        scraped_at=scraped_at or utc_now(),
+    )
@@ -0,0 +1,552 @@
+"""
+Offline record / replay for the scraping path.
+
+Recording: FixtureRecorder is a snapshot hook for scrape_booking_price();
+it saves the page HTML of every stage (homepage, autocomplete, calendar,
+results, property page) plus the pop-ups that were on screen into a
+fixture directory.
+
+    record_fixtures("Dubai", "Howard Johnson Bur Dubai", "2026-05-01", "2026-05-05",
+                    "fixtures/recorded")
+
+Replay: StubSite is a local HTTP server that mimics the parts of
+Booking.com the scraper relies on (the "ss" field, the autocomplete
+listbox, the searchbox-datepicker-calendar, property-card results, a
+property page and pop-up overlays) and fills them from a fixture
+directory.  The homepage and its widgets are synthetic because the live
+page's scripts need Booking.com's backend; results and property pages
+are served from the fixtures as recorded (scripts stripped, links
+pointed at the stub).  Responses have a fixed latency, so timings are
+deterministic.
+
+    with StubSite("fixtures") as site:
+        scrape_booking_price("Dubai", "Howard Johnson Bur Dubai", "2026-05-01", "2026-05-05",
+                             base_url=site.base_url, pacing="zero-delay")
+
+Command line:
+    python booking_replay.py serve [--fixtures DIR] [--port 8765]
+    python booking_replay.py record CITY HOTEL CHECK_IN CHECK_OUT [--out DIR]
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from booking_log import configure_logging, get_logger
+from booking_matching import normalize_name, read_texts
+from booking_parser import parse_property_cards
+from booking_popups import find_popups
+from booking_scraper_v2 import BOOKING_HOME_URL, SUGGESTION_SELECTORS, scrape_booking_price
+
+
+log = get_logger("replay")
+
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# stage → file name inside a fixture directory
+FIXTURE_FILES = {
+    "homepage": "homepage.html",
+    "autocomplete": "autocomplete.json",
+    "calendar": "calendar.html",
+    "results": "results_page.html",
+    "property": "property_page.html",
+    "popups": "popups.html",
+}
+
+_SCRIPT_TAG = re.compile(r"<script\b.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+
+SUGGESTION_SELECTOR = ", ".join(SUGGESTION_SELECTORS)
+CALENDAR_SELECTOR = "div[data-testid='searchbox-datepicker-calendar']"
+
+# separates the pop-up snippets in popups.html
+POPUP_SEPARATOR = "\n<!-- popup -->\n"
+
+
+def strip_scripts(html):
+    return _SCRIPT_TAG.sub("", html)
+
+
+# ── RECORDING ────────────────────────────────────────────────────────────
+
+_OUTER_HTML_JS = "var el = document.querySelector(arguments[0]); return el ? el.outerHTML : '';"
+
+# the dialog / banner around every visible close button
+_POPUP_CONTAINERS_JS = """
+return arguments[0].map(function (el) {
+    var box = el.closest("[role='dialog'], [aria-modal='true'], #onetrust-banner-sdk") || el.parentElement;
+    return box ? box.outerHTML : el.outerHTML;
+});
+"""
+
+
+class FixtureRecorder:
+    """
+    Snapshot hook that writes one fixture per scraping stage.
+
+    Parameters:
+    - out_dir       : fixture directory (created when missing)
+    - keep_scripts  : keep <script> tags in the saved pages
+
+    Use as scrape_booking_price(..., snapshot=FixtureRecorder(out_dir)).
+    A manifest.json records the URL and time of every stage.
+    """
+
+    def __init__(self, out_dir, keep_scripts=False):
+        self.out_dir = out_dir
+        self.keep_scripts = keep_scripts
+        self.manifest = {}
+        os.makedirs(out_dir, exist_ok=True)
+
+    def __call__(self, stage, driver):
+        try:
+            handler = getattr(self, f"_record_{stage}", None)
+            if handler is not None:
+                handler(driver)
+            else:
+                self._write(f"{stage}.html", self._page(driver))
+        except WebDriverException as e:
+            log.warning("   ⚠ Could not record %r: %s", stage, e.msg)
+            return
+        self.manifest[stage] = {"url": driver.current_url, "recorded_at": datetime.now().isoformat()}
+        self._write("manifest.json", json.dumps(self.manifest, indent=2))
+
+    def _path(self, name):
+        return os.path.join(self.out_dir, name)
+
+    def _write(self, name, text):
+        with open(self._path(name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _page(self, driver):
+        html = driver.page_source
+        return html if self.keep_scripts else strip_scripts(html)
+
+    def _record_homepage(self, driver):
+        self._write(FIXTURE_FILES["homepage"], self._page(driver))
+        hits, _, _ = find_popups(driver)
+        if hits:
+            snippets = driver.execute_script(_POPUP_CONTAINERS_JS, [el for _, el in hits])
+            self._write(FIXTURE_FILES["popups"], POPUP_SEPARATOR.join(dict.fromkeys(snippets)))
+
+    def _record_autocomplete(self, driver):
+        items = driver.find_elements(By.CSS_SELECTOR, SUGGESTION_SELECTOR)
+        suggestions = []
+        for text in read_texts(driver, items):
+            label, _, sublabel = text.partition("\n")
+            suggestions.append({"label": label.strip(), "sublabel": sublabel.strip(),
+                                "dest_id": None, "dest_type": None})
+        self._write(FIXTURE_FILES["autocomplete"], json.dumps(suggestions, indent=2, ensure_ascii=False))
+
+    def _record_calendar(self, driver):
+        self._write(FIXTURE_FILES["calendar"], driver.execute_script(_OUTER_HTML_JS, CALENDAR_SELECTOR))
+
+    def _record_results(self, driver):
+        self._write(FIXTURE_FILES["results"], self._page(driver))
+
+    def _record_property(self, driver):
+        self._write(FIXTURE_FILES["property"], self._page(driver))
+
+
+def record_fixtures(city, hotel_name, check_in_date, check_out_date, out_dir, **scrape_kwargs):
+    """
+    Runs one live searchbox scrape (including the property page) and
+    records every stage into *out_dir*.  Returns the FixtureRecorder.
+    """
+    recorder = FixtureRecorder(out_dir)
+    scrape_kwargs.setdefault("room_rates", True)
+    scrape_booking_price(city, hotel_name, check_in_date, check_out_date,
+                         snapshot=recorder, **scrape_kwargs)
+    log.info("✓ Recorded %s into %s", sorted(recorder.manifest), out_dir)
+    return recorder
+
+
+# ── STUB SITE ────────────────────────────────────────────────────────────
+
+DEFAULT_POPUPS_HTML = """
+<div data-stub-popup id="onetrust-banner-sdk">
+  <p>We use cookies to improve your experience.</p>
+  <button id="onetrust-accept-btn-handler" type="button">Accept</button>
+</div>
+<div data-stub-popup role="dialog" aria-modal="true" class="stub-dialog">
+  <p>Sign in, save money</p>
+  <button type="button" aria-label="Dismiss sign-in info.">&times;</button>
+</div>
+"""
+
+RESULTS_POPUP_HTML = """
+<div data-stub-popup role="dialog" aria-modal="true" class="stub-dialog">
+  <p>You're a Genius!</p>
+  <button type="button" aria-label="Close Genius info">&times;</button>
+</div>
+"""
+
+_STUB_STYLE = """
+<style>
+  #onetrust-banner-sdk { position: fixed; bottom: 0; left: 0; right: 0; padding: 16px; background: #eee; z-index: 20; }
+  .stub-dialog { position: fixed; top: 80px; left: 50%; width: 400px; margin-left: -200px;
+                 padding: 24px; background: #fff; border: 1px solid #999; z-index: 30; }
+</style>
+"""
+
+# any button inside a pop-up closes it
+_POPUP_SCRIPT = """
+<script>
+document.addEventListener('click', function (e) {
+  var button = e.target.closest('button, [role="button"]');
+  var box = button && button.closest('[data-stub-popup]');
+  if (box) box.remove();
+});
+</script>
+"""
+
+HOMEPAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en-gb">
+<head>
+<meta charset="utf-8">
+<title>Booking.com (stub)</title>
+__STYLE__
+<style>
+  body { font-family: sans-serif; margin: 0; }
+  #searchbox { margin: 220px auto 0; width: 720px; }
+  input[name='ss'] { width: 400px; padding: 8px; }
+  ul[role='listbox'] { list-style: none; padding: 0; margin: 0; }
+  li[data-i] { padding: 6px; cursor: pointer; border-bottom: 1px solid #ddd; }
+  #stub-months { display: flex; gap: 24px; }
+  span[data-date] { display: inline-block; width: 28px; height: 22px; text-align: center; cursor: pointer; }
+  .hidden { display: none !important; }
+</style>
+</head>
+<body>
+__POPUPS__
+<form id="searchbox" action="/searchresults.html" method="get" autocomplete="off">
+  <input name="ss" type="search" placeholder="Where are you going?">
+  <input type="hidden" name="dest_id">
+  <input type="hidden" name="dest_type">
+  <input type="hidden" name="checkin">
+  <input type="hidden" name="checkout">
+  <input type="hidden" name="group_adults" value="2">
+  <input type="hidden" name="no_rooms" value="1">
+  <input type="hidden" name="group_children" value="0">
+  <div data-testid="autocomplete-results"><ul role="listbox" id="stub-suggestions"></ul></div>
+  <div data-testid="searchbox-dates-container">
+    <button type="button" data-testid="date-display-field-start">Check-in date</button>
+    <button type="button" data-testid="date-display-field-end">Check-out date</button>
+  </div>
+  <div id="stub-calendar" class="hidden">
+    <button type="button" aria-label="Previous month">&lsaquo;</button>
+    <button type="button" aria-label="Next month">&rsaquo;</button>
+    <div data-testid="searchbox-datepicker-calendar" id="stub-months"></div>
+    <div data-testid="datepicker-footer"><button type="button" id="stub-apply">Apply</button></div>
+  </div>
+  <button type="submit">Search</button>
+</form>
+__POPUP_SCRIPT__
+<script>
+(function () {
+  var MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+                "August", "September", "October", "November", "December"];
+  var form = document.getElementById('searchbox');
+  var ss = form.elements['ss'];
+  var list = document.getElementById('stub-suggestions');
+  var seq = 0;
+
+  // ── autocomplete ──
+  ss.addEventListener('input', function () {
+    var mine = ++seq;
+    form.elements['dest_id'].value = '';
+    form.elements['dest_type'].value = '';
+    if (!ss.value.trim()) { list.innerHTML = ''; return; }
+    fetch('/autocomplete?q=' + encodeURIComponent(ss.value))
+      .then(function (r) { return r.json(); })
+      .then(function (items) {
+        if (mine !== seq) return;
+        list.innerHTML = '';
+        items.forEach(function (item, i) {
+          var li = document.createElement('li');
+          li.setAttribute('data-i', i);
+          li.setAttribute('role', 'option');
+          li.innerHTML = '<div></div><div></div>';
+          li.children[0].textContent = item.label;
+          li.children[1].textContent = item.sublabel || '';
+          li.addEventListener('click', function () {
+            seq++;
+            ss.value = item.label;
+            form.elements['dest_id'].value = item.dest_id || '';
+            form.elements['dest_type'].value = item.dest_type || '';
+            list.innerHTML = '';
+          });
+          list.appendChild(li);
+        });
+      });
+  });
+
+  // ── calendar ──
+  var calendar = document.getElementById('stub-calendar');
+  var months = document.getElementById('stub-months');
+  var first = new Date(__START_YEAR__, __START_MONTH__ - 1, 1);
+  var picked = [];
+  function pad(n) { return (n < 10 ? '0' : '') + n; }
+  function render() {
+    var html = '';
+    for (var k = 0; k < 2; k++) {
+      var y = first.getFullYear(), m = first.getMonth() + k;
+      if (m > 11) { y += 1; m -= 12; }
+      var lead = (new Date(y, m, 1).getDay() + 6) % 7, days = new Date(y, m + 1, 0).getDate();
+      html += '<div><h3 aria-live="polite">' + MONTHS[m] + ' ' + y + '</h3><table><tbody><tr>';
+      for (var i = 0; i < lead; i++) html += '<td></td>';
+      for (var d = 1; d <= days; d++) {
+        if ((lead + d - 1) % 7 === 0 && d > 1) html += '</tr><tr>';
+        var iso = y + '-' + pad(m + 1) + '-' + pad(d);
+        html += '<td role="gridcell"><span data-date="' + iso + '">' + d + '</span></td>';
+      }
+      html += '</tr></tbody></table></div>';
+    }
+    months.innerHTML = html;
+  }
+  function openCalendar() { render(); calendar.classList.remove('hidden'); }
+  document.querySelector("[data-testid='date-display-field-start']").addEventListener('click', openCalendar);
+  document.querySelector("[data-testid='date-display-field-end']").addEventListener('click', openCalendar);
+  calendar.querySelector("[aria-label='Previous month']").addEventListener('click', function () {
+    first = new Date(first.getFullYear(), first.getMonth() - 1, 1); render();
+  });
+  calendar.querySelector("[aria-label='Next month']").addEventListener('click', function () {
+    first = new Date(first.getFullYear(), first.getMonth() + 1, 1); render();
+  });
+  months.addEventListener('click', function (e) {
+    var span = e.target.closest('span[data-date]');
+    if (!span) return;
+    if (picked.length !== 1) picked = [];
+    picked.push(span.getAttribute('data-date'));
+    if (picked.length === 2 && picked[1] <= picked[0]) picked = [picked[1]];
+    form.elements['checkin'].value = picked[0] || '';
+    form.elements['checkout'].value = picked[1] || '';
+  });
+  document.getElementById('stub-apply').addEventListener('click', function () {
+    calendar.classList.add('hidden');
+  });
+})();
+</script>
+</body>
+</html>
+"""
+
+
+class StubSite:
+    """
+    Local HTTP server replaying a fixture directory as a Booking.com look-alike.
+
+    Parameters:
+    - fixture_dir : directory with results_page.html, property_page.html and
+                    optionally autocomplete.json / popups.html (as written by
+                    FixtureRecorder)
+    - host, port  : bind address; port 0 picks a free port
+    - latency     : fixed delay in seconds added to every response
+    - popups      : show the cookie banner / sign-in dialog on the homepage
+                    and a Genius dialog on the results page
+    - today       : "YYYY-MM-DD" whose month the calendar opens on
+                    (defaults to the current date)
+
+    Routes: /, /autocomplete?q=, /searchresults.html, /hotel/... ;
+    request counts per route are kept in *hits*.
+    """
+
+    def __init__(self, fixture_dir=DEFAULT_FIXTURE_DIR, host="127.0.0.1", port=0, latency=0.0,
+                 popups=True, today=None):
+        self.fixture_dir = fixture_dir
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.popups = popups
+        self.today = datetime.strptime(today, "%Y-%m-%d").date() if today else date.today()
+        self.hits = Counter()
+        self._server = None
+        self._thread = None
+        self._cache = {}
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    # ── fixtures ──
+
+    def _read(self, stage):
+        if stage not in self._cache:
+            path = os.path.join(self.fixture_dir, FIXTURE_FILES[stage])
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    self._cache[stage] = f.read()
+            else:
+                self._cache[stage] = None
+        return self._cache[stage]
+
+    def _localize(self, html):
+        # links on recorded pages point at the live site
+        return strip_scripts(html).replace(BOOKING_HOME_URL, self.base_url)
+
+    def _with_popup(self, html, popup_html):
+        if not self.popups:
+            return html
+        extra = _STUB_STYLE + popup_html + _POPUP_SCRIPT
+        if "</body>" in html:
+            return html.replace("</body>", extra + "</body>", 1)
+        return html + extra
+
+    def suggestions(self):
+        """
+        Autocomplete entries: the recorded autocomplete.json, or one entry
+        per property card of the results fixture.  Entries without a
+        destination id get a stable synthetic one.
+        """
+        if "_suggestions" not in self._cache:
+            recorded = self._read("autocomplete")
+            if recorded:
+                entries = json.loads(recorded)
+            else:
+                cards = parse_property_cards(self._read("results") or "")
+                entries = [{"label": card.name, "sublabel": card.address or ""} for card in cards]
+            for i, entry in enumerate(entries):
+                if not entry.get("dest_id"):
+                    entry["dest_id"] = str(100000 + i)
+                    entry["dest_type"] = "hotel"
+            self._cache["_suggestions"] = entries
+        return self._cache["_suggestions"]
+
+    def autocomplete(self, query, limit=5):
+        """ Entries whose words start with every typed word, in fixture order. """
+        typed = normalize_name(query).split()
+        found = []
+        for entry in self.suggestions():
+            words = normalize_name(f"{entry['label']} {entry.get('sublabel', '')}").split()
+            if all(any(w.startswith(t) for w in words) for t in typed):
+                found.append(entry)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def homepage(self):
+        popups = ""
+        if self.popups:
+            recorded = self._read("popups")
+            if recorded:
+                popups = "\n".join(f"<div data-stub-popup>{snippet}</div>"
+                                   for snippet in recorded.split(POPUP_SEPARATOR) if snippet.strip())
+            else:
+                popups = DEFAULT_POPUPS_HTML
+        return (HOMEPAGE_TEMPLATE
+                .replace("__STYLE__", _STUB_STYLE)
+                .replace("__POPUPS__", popups)
+                .replace("__POPUP_SCRIPT__", _POPUP_SCRIPT)
+                .replace("__START_YEAR__", str(self.today.year))
+                .replace("__START_MONTH__", str(self.today.month)))
+
+    def route(self, path, query):
+        """ Returns (status, content type, body) for a request. """
+        if path in ("/", "/index.html"):
+            return 200, "text/html", self.homepage()
+        if path == "/autocomplete":
+            found = self.autocomplete(query.get("q", [""])[0])
+            return 200, "application/json", json.dumps(found)
+        if path == "/searchresults.html":
+            html = self._read("results")
+            if html is None:
+                return 404, "text/plain", "no results fixture"
+            return 200, "text/html", self._with_popup(self._localize(html), RESULTS_POPUP_HTML)
+        if path.startswith("/hotel/"):
+            html = self._read("property")
+            if html is None:
+                return 404, "text/plain", "no property fixture"
+            return 200, "text/html", self._localize(html)
+        return 404, "text/plain", "not found"
+
+    # ── server ──
+
+    def start(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                site.hits[parts.path] += 1
+                if site.latency:
+                    time.sleep(site.latency)
+                status, content_type, body = site.route(parts.path, parse_qs(parts.query))
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record Booking.com fixtures or serve them locally.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="serve a fixture directory")
+    serve.add_argument("--fixtures", default=DEFAULT_FIXTURE_DIR)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.0)
+    serve.add_argument("--no-popups", action="store_true")
+
+    record = commands.add_parser("record", help="record fixtures from the live site")
+    record.add_argument("city")
+    record.add_argument("hotel_name")
+    record.add_argument("check_in_date")
+    record.add_argument("check_out_date")
+    record.add_argument("--out", default=os.path.join(DEFAULT_FIXTURE_DIR, "recorded"))
+
+    args = parser.parse_args()
+    configure_logging()
+    if args.command == "record":
+        record_fixtures(args.city, args.hotel_name, args.check_in_date, args.check_out_date, args.out)
+        return
+
+    site = StubSite(args.fixtures, args.host, args.port, args.latency, popups=not args.no_popups)
+    site.start()
+    log.info("✓ Serving %s at %s  (Ctrl+C to stop)", args.fixtures, site.base_url)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Persistent autocomplete resolution cache.
+
+The first time a (hotel_name, city) pair is resolved through the searchbox
+autocomplete, the destination id Booking.com puts in the results URL
+(dest_id / dest_type) is stored together with the canonical suggestion
+and hotel names.  Later queries load the results URL for that destination
+directly, skipping the typing and autocomplete steps entirely.  An entry
+is invalidated as soon as its destination stops returning the target hotel.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlparse, parse_qs
+
+
+@dataclass
+class Resolution:
+    """
+    - dest_id        : Booking.com destination id (from the results URL)
+    - dest_type      : "hotel", "city", "district" ...
+    - canonical_name : suggestion text / hotel name as shown on Booking.com
+    """
+    dest_id: str
+    dest_type: str
+    canonical_name: str = None
+
+
+def resolution_from_url(url, canonical_name=None):
+    """
+    Extracts dest_id / dest_type from a search-results URL.  Returns None
+    when the URL does not carry a destination id.
+    """
+    query = parse_qs(urlparse(url).query)
+    dest_id = query.get("dest_id", [None])[0]
+    if not dest_id:
+        return None
+    dest_type = query.get("dest_type", ["hotel"])[0]
+    return Resolution(dest_id, dest_type, canonical_name)
+
+
+def _norm(text):
+    return " ".join((text or "").lower().split())
+
+
+class ResolverCache:
+    """
+    SQLite-backed map  (hotel_name, city) → Resolution.
+
+    Parameters:
+    - path : database file (":memory:" for a throw-away cache)
+    """
+
+    def __init__(self, path="booking_resolver.sqlite"):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS resolutions ("
+            " hotel TEXT NOT NULL,"
+            " city TEXT NOT NULL,"
+            " dest_id TEXT NOT NULL,"
+            " dest_type TEXT NOT NULL,"
+            " canonical_name TEXT,"
+            " resolved_at REAL NOT NULL,"
+            " PRIMARY KEY (hotel, city))"
+        )
+        self._db.commit()
+
+    def get(self, hotel_name, city):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT dest_id, dest_type, canonical_name FROM resolutions"
+                " WHERE hotel = ? AND city = ?",
+                (_norm(hotel_name), _norm(city)),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return Resolution(*row)
+
+    def put(self, hotel_name, city, resolution):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO resolutions"
+                " (hotel, city, dest_id, dest_type, canonical_name, resolved_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (_norm(hotel_name), _norm(city), resolution.dest_id,
+                 resolution.dest_type, resolution.canonical_name, time.time()),
+            )
+            self._db.commit()
+
+    def invalidate(self, hotel_name, city):
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM resolutions WHERE hotel = ? AND city = ?",
+                (_norm(hotel_name), _norm(city)),
+            )
+            self._db.commit()
+            if cursor.rowcount:
+                self.invalidations += 1
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM resolutions").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
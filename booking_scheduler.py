@@ -0,0 +1,271 @@
+"""
+Asyncio job scheduler for the Booking.com scraper.
+
+Jobs (from a job file via booking_jobs.load_jobs or submitted through
+Scheduler.submit) are queued by priority and dispatched to a bounded set
+of pooled browser sessions.  The blocking Selenium calls run in a thread
+executor while the event loop enforces a global and a per-host request
+rate (token buckets), drops jobs whose deadline has passed and retries
+transient failures with jittered exponential backoff.
+
+    results = run_jobs(load_jobs("jobs.jsonl"), workers=3, rate=0.5)
+"""
+
+import asyncio
+import itertools
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
+
+from booking_jobs import as_job, parse_deadline
+from booking_log import get_logger
+from booking_pool import DriverPool, run_job
+from booking_scraper_v2 import BOOKING_HOME_URL, scrape_booking_price
+
+
+log = get_logger("scheduler")
+
+
+DEFAULT_HOST = urlparse(BOOKING_HOME_URL).netloc
+# hosts of a local replay stub (booking_replay): not rate limited
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+TRANSIENT_ERRORS = (TimeoutException, ElementClickInterceptedException)
+
+
+class DeadlineExceeded(Exception):
+    """ Raised for a job whose deadline passed before it could run. """
+
+    def __str__(self):
+        return "deadline passed before the job could run"
+
+
+class TokenBucket:
+    """
+    Async token bucket: *rate* tokens per second, at most *burst* banked.
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass(order=True)
+class _QueuedJob:
+    priority: int
+    due: float                                   # deadline, or +inf → earliest deadline first
+    seq: int
+    job: object = field(compare=False)
+    deadline: float = field(compare=False, default=None)
+    host: str = field(compare=False, default=DEFAULT_HOST)
+    attempts: int = field(compare=False, default=0)
+    future: asyncio.Future = field(compare=False, default=None)
+
+
+class Scheduler:
+    """
+    Priority scheduler with rate limiting and retries.
+
+    Parameters:
+    - workers              : concurrent browser sessions
+    - rate                 : global job starts per second
+    - host_rate            : job starts per second per host (defaults to *rate*)
+    - burst                : token-bucket burst size
+    - max_retries          : retries for transient failures
+    - backoff              : base backoff in seconds (doubles per attempt, jittered)
+    - max_jobs_per_session : browser recycling threshold (see DriverPool)
+    - options_factory      : Chrome options factory for new sessions
+    - profile              : browser profile for jobs that do not name one
+    - scrape               : scrape function run for each job
+    - scrape_kwargs        : passed to *scrape* (fast_path, pacing, sink ...)
+
+    Lower priority numbers run first.  Jobs are rate limited under the host
+    of scrape_kwargs["base_url"] (Booking.com by default); jobs against a
+    local replay stub are not rate limited at all.
+    """
+
+    def __init__(self, workers=2, rate=0.5, host_rate=None, burst=1, max_retries=3, backoff=2.0,
+                 max_jobs_per_session=25, options_factory=None, profile=None,
+                 scrape=scrape_booking_price, **scrape_kwargs):
+        self.workers = workers
+        self.rate = rate
+        self.host_rate = host_rate or rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.scrape = scrape
+        self.scrape_kwargs = scrape_kwargs
+        self.host = urlparse(scrape_kwargs.get("base_url") or BOOKING_HOME_URL).netloc
+        self._pool = DriverPool(workers, max_jobs_per_session, options_factory, profile)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._queue = None
+        self._global_bucket = None
+        self._host_buckets = {}
+        self._seq = itertools.count()
+        self._tasks = []
+        self.stats = {"done": 0, "failed": 0, "retried": 0, "expired": 0}
+
+    def _ensure_started(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._global_bucket = TokenBucket(self.rate, self.burst)
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    def _bucket_for(self, host):
+        bucket = self._host_buckets.get(host)
+        if bucket is None:
+            bucket = self._host_buckets[host] = TokenBucket(self.host_rate, self.burst)
+        return bucket
+
+    def submit(self, job, priority=0, deadline=None, host=None):
+        """
+        Queues *job* and returns a future resolving to (job, result, error).
+        A dict job may carry "priority" / "deadline" / "host" keys; *host*
+        defaults to the scheduler's (see above).
+        """
+        self._ensure_started()
+        if isinstance(job, dict):
+            priority = int(job.get("priority") or priority)
+            deadline = job.get("deadline", deadline)
+            host = job.get("host") or host
+        host = host or self.host
+        deadline = parse_deadline(deadline)
+        queued = _QueuedJob(
+            priority=priority,
+            due=deadline if deadline is not None else float("inf"),
+            seq=next(self._seq),
+            job=as_job(job),
+            deadline=deadline,
+            host=host,
+            future=asyncio.get_event_loop().create_future(),
+        )
+        self._queue.put_nowait(queued)
+        return queued.future
+
+    async def _worker(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            queued = await self._queue.get()
+            try:
+                await self._process(loop, queued)
+            except Exception as e:
+                # one broken job must not take the worker (and every job
+                # still queued behind it) down
+                log.error("✗ %s: %s", queued.job.hotel_name, e)
+                if not queued.future.done():
+                    self.stats["failed"] += 1
+                    queued.future.set_result((queued.job, None, e))
+            finally:
+                self._queue.task_done()
+
+    def _expired(self, queued):
+        return queued.deadline is not None and time.time() > queued.deadline
+
+    async def _process(self, loop, queued):
+        if self._expired(queued):
+            self.stats["expired"] += 1
+            queued.future.set_result((queued.job, None, DeadlineExceeded(queued.job)))
+            return
+
+        scrape = self.scrape
+        lookup = getattr(scrape, "lookup", None)
+        if lookup is not None:
+            # a cached result (booking_cache.CachedScraper) costs no request
+            # and no rate token
+            job = queued.job
+            profile = self._pool.profile if job.profile is None else job.profile
+            records = await loop.run_in_executor(
+                self._executor, lambda: lookup(*job.as_args(), profile=profile, **self.scrape_kwargs))
+            if records is not None:
+                self.stats["done"] += 1
+                queued.future.set_result((job, records, None))
+                return
+            scrape = scrape.fetch
+
+        if urlparse(f"//{queued.host}").hostname not in LOCAL_HOSTS:
+            await self._global_bucket.acquire()
+            await self._bucket_for(queued.host).acquire()
+
+        try:
+            result, error = await loop.run_in_executor(
+                self._executor,
+                lambda: run_job(self._pool, queued.job, scrape, **self.scrape_kwargs),
+            )
+        except Exception as e:
+            result, error = None, e
+        queued.attempts += 1
+
+        if isinstance(error, TRANSIENT_ERRORS) and queued.attempts <= self.max_retries:
+            delay = self.backoff * 2 ** (queued.attempts - 1)
+            delay = random.uniform(delay / 2, delay)            # jitter
+            if queued.deadline is None or time.time() + delay < queued.deadline:
+                self.stats["retried"] += 1
+                log.info("   ↻ Retrying %s in %.1fs  (%s)", queued.job.hotel_name, delay, type(error).__name__)
+                asyncio.ensure_future(self._requeue_later(queued, delay))
+                return
+
+        self.stats["failed" if error else "done"] += 1
+        queued.future.set_result((queued.job, result, error))
+
+    async def _requeue_later(self, queued, delay):
+        await asyncio.sleep(delay)
+        self._queue.put_nowait(queued)
+
+    async def run(self, jobs):
+        """
+        Submits every job and waits for all of them.  Returns a list of
+        (job, result, error) in submission order.
+        """
+        futures = [self.submit(job) for job in jobs]
+        return list(await asyncio.gather(*futures))
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._pool.close)
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+def run_jobs(jobs, **scheduler_kwargs):
+    """
+    Synchronous helper: schedules *jobs* (ScrapeJobs, tuples or job-file
+    rows) and returns the list of (job, result, error).
+    """
+    async def _main():
+        async with Scheduler(**scheduler_kwargs) as scheduler:
+            return await scheduler.run(jobs)
+
+    return asyncio.run(_main())
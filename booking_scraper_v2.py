@@ -11,18 +11,65 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
-from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, ElementClickInterceptedException, SessionNotCreatedException,
+)
 from selenium.webdriver.common.keys import Keys
+import logging
 import time
 import random
 from datetime import datetime
-
-
-def human_type(driver, element, text, min_delay=0.05, max_delay=0.35):
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from booking_driver import resolve_driver_path
+from booking_log import get_logger
+from booking_metrics import STAGE_TIMINGS, stage, step, write_metrics
+from booking_matching import DEFAULT_THRESHOLD, best_match, is_same_hotel, match_score, read_texts
+from booking_parser import (
+    ROOM_TABLE_SELECTORS, fetch_results_html, fetch_room_table_html, parse_property_cards,
+    parse_room_rates,
+)
+from booking_popups import dismiss_popups
+from booking_profiles import get_profile
+from booking_records import record_from_card, record_from_room, utc_now
+from booking_resolver import resolution_from_url
+from booking_pagination import iter_result_cards
+from booking_pacing import (
+    get_pacing, wait_for_any, wait_for_dom_ready, wait_for_staleness, wait_for_network_idle,
+)
+from booking_selectors import SELECTORS
+
+
+BOOKING_HOME_URL = "https://www.booking.com"
+BOOKING_SEARCH_URL = "https://www.booking.com/searchresults.html"
+
+RULE = "=" * 80
+
+# Fallback selector lists of the searchbox flow; raced at once and
+# reordered by hit rate (see booking_selectors)
+SUGGESTION_SELECTORS = SELECTORS.register("suggestion", [
+    "li[data-i]",                                          # indexed items
+    "ul[role='listbox'] li",                               # ARIA listbox
+    "div[data-testid='autocomplete-results'] li",          # testid variant
+    ".suggestions-list li",                                # class variant
+])
+CALENDAR_OPEN_SELECTORS = SELECTORS.register("calendar_open", [
+    "button[data-testid='date-display-field-start']",
+    "div[data-testid='searchbox-dates-container']",
+    "button.sb-date-field__display",
+    "#calendar-searchboxdatepicker-tab-trigger",           # Calendar tab (seen in HTML)
+])
+SEARCH_BUTTON_SELECTORS = SELECTORS.register("search_button", [
+    "button[type='submit']",
+    "button.sb-searchbox__button",
+    "button[data-testid='search-button']",
+])
+
+log = get_logger("scraper")
+
+
+def human_type(driver, element, text, min_delay=None, max_delay=None, pacing=None):
     """
     Types text character by character with random delays between each
     keystroke to simulate real human typing behaviour.
@@ -31,22 +78,38 @@ def human_type(driver, element, text, min_delay=0.05, max_delay=0.35):
     - driver     : Selenium WebDriver instance
     - element    : the input element to type into
     - text       : the full string to type
-    - min_delay  : shortest pause (seconds) between two keystrokes
-    - max_delay  : longest  pause (seconds) between two keystrokes
+    - min_delay  : shortest pause (seconds) between two keystrokes (overrides pacing)
+    - max_delay  : longest  pause (seconds) between two keystrokes (overrides pacing)
+    - pacing     : PacingPolicy or preset name ("human", "balanced", "zero-delay")
     """
+    pacing = get_pacing(pacing)
+    started = time.perf_counter()
     element.click()                          # focus the field first
-    time.sleep(random.uniform(0.3, 0.7))     # small pause after click, like a human
+    pacing.pause("after_focus")              # small pause after click, like a human
+
+    if pacing.burst_typing:
+        element.send_keys(text)
+        STAGE_TIMINGS.record("typing", time.perf_counter() - started)
+        log.info('   ✓ Typed  →  "%s"', text)
+        return
 
     for char in text:
         element.send_keys(char)
         # random pause between each character  →  looks natural
-        time.sleep(random.uniform(min_delay, max_delay))
+        if min_delay is not None or max_delay is not None:
+            low, high = pacing.pauses["keystroke"]
+            time.sleep(random.uniform(
+                low if min_delay is None else min_delay,
+                high if max_delay is None else max_delay,
+            ))
+        else:
+            pacing.pause("keystroke")
 
         # occasionally add a slightly longer pause (like a human thinking)
-        if random.random() < 0.15:           # 15 % chance
-            time.sleep(random.uniform(0.4, 0.9))
+        pacing.maybe_think()
 
-    print(f'   ✓ Typed  →  "{text}"')
+    STAGE_TIMINGS.record("typing", time.perf_counter() - started)
+    log.info('   ✓ Typed  →  "%s"', text)
 
 
 def wait_for_suggestions(driver, timeout=8):
@@ -54,521 +117,735 @@ def wait_for_suggestions(driver, timeout=8):
     Waits until the autocomplete dropdown appears and returns
     the list of <li> suggestion elements.  Returns an empty list
     when the dropdown does not appear within *timeout* seconds.
+
+    Every SUGGESTION_SELECTORS variant is polled at once.
     """
-    suggestion_selectors = [
-        "li[data-i]",                                          # indexed items
-        "ul[role='listbox'] li",                               # ARIA listbox
-        "div[data-testid='autocomplete-results'] li",                  # testid variant
-        ".suggestions-list li",                                # class variant
-    ]
-    for sel in suggestion_selectors:
-        try:
-            items = WebDriverWait(driver, timeout).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, sel))
-            )
-            if items:
-                print(f"   ✓ Found {len(items)} autocomplete suggestion(s)")
-                return items
-        except (TimeoutException, NoSuchElementException):
-            continue
-    return []
+    candidates = SELECTORS.order("suggestion")
+    with stage("autocomplete"):
+        sel, items = wait_for_any(driver, candidates, timeout, name="suggestions")
+    SELECTORS.record_first("suggestion", candidates, sel)
+    if items:
+        log.info("   ✓ Found %d autocomplete suggestion(s)", len(items))
+    return items
 
 
-def pick_best_suggestion(suggestions, hotel_name):
+def pick_best_suggestion(suggestions, hotel_name, driver=None):
     """
     From the list of autocomplete <li> elements pick the one whose
     visible text best matches *hotel_name*.  Falls back to the first
     suggestion when no good match is found.
 
+    When *driver* is given all suggestion texts are read in one call.
+
     Returns the chosen element (or None if the list is empty).
     """
     if not suggestions:
         return None
 
-    hotel_lower = hotel_name.lower()
-    # score every suggestion by how many words from hotel_name it contains
-    scored = []
-    for item in suggestions:
-        item_text = item.text.strip().lower()
-        # count how many words from hotel_name appear in the suggestion
-        score = sum(1 for word in hotel_lower.split() if word in item_text)
-        scored.append((score, item_text, item))
-        print(f'      candidate  →  "{item.text.strip()}"  (score {score})')
-
-    scored.sort(key=lambda x: x[0], reverse=True)
-    best = scored[0]
-    print(f'   ✓ Best match  →  "{best[1]}"')
-    return best[2]
-
-def close_all_popups(driver):
+    if driver is not None:
+        texts = read_texts(driver, suggestions)
+    else:
+        texts = [item.text.strip() for item in suggestions]
+
+    # score every suggestion's label (its first line; the second one is
+    # the location) by fuzzy token similarity to hotel_name
+    labels = [text.partition("\n")[0] for text in texts]
+    if log.isEnabledFor(logging.DEBUG):
+        for label in labels:
+            log.debug('      candidate  →  "%s"  (score %.2f)', label, match_score(hotel_name, label))
+
+    found = best_match(hotel_name, labels)
+    best_index = found[0] if found else 0
+    log.info('   ✓ Best match  →  "%s"', texts[best_index])
+    return suggestions[best_index]
+
+
+def close_all_popups(driver, pacing=None):
     """
     Close all common pop-ups on Booking.com
+
+    Runs a single-pass sweep (see booking_popups.dismiss_popups) and
+    returns True when anything was closed.
     """
-    popup_closed = False
-    
-    # List of common pop-up close button selectors
-    popup_selectors = [
-        # Cookie consent
-        "button[id='onetrust-accept-btn-handler']",
-        "button[aria-label='Dismiss sign-in info.']",
-        
-        # Sign-in pop-ups
-        "button[aria-label='Dismiss sign in information.']",
-        "button[aria-label='Close']",
-        "button.fc63351294.a822bdf511.e3c025e003.fa565176a8.f7db01295e.c334e6f658.e1b7cfea84.cd7aa7c891",
-        
-        # Generic close buttons
-        "button[data-testid='header-sign-in-button'] ~ button",
-        "div[role='dialog'] button[aria-label='Close']",
-        "button.a83ed08757.c21c56c305.bf0537ecb5.ab98298258.deab83296e.f4552b6561",
-        
-        # X buttons
-        "button.bui-modal__close",
-        "button.modal-mask-closeBtn",
-        
-        # Overlay close
-        "div.bui-overlay",
-        
-        # Sign-in modal
-        "button[aria-label='Dismiss sign-in info.']",
-        "div[data-testid='header-sign-in-button']",
-        
-        # Genius loyalty program
-        "button[aria-label='Close Genius info']",
-    ]
-    
-    for selector in popup_selectors:
-        try:
-            close_button = WebDriverWait(driver, 2).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-            )
-            close_button.click()
-            print(f"✓ Closed pop-up: {selector[:50]}...")
-            popup_closed = True
-            time.sleep(0.5)
-        except (TimeoutException, NoSuchElementException, ElementClickInterceptedException):
-            continue
-    
-    # Try closing by pressing Escape key
-    try:
-        from selenium.webdriver.common.keys import Keys
-        webdriver.ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-        time.sleep(0.5)
-    except:
-        pass
-    
-    # Click outside any modal (on the backdrop)
-    try:
-        backdrop = driver.find_element(By.CSS_SELECTOR, "div[class*='modal-mask']")
-        backdrop.click()
-        popup_closed = True
-        time.sleep(0.5)
-    except:
-        pass
-    
-    return popup_closed
+    with stage("popups"):
+        return dismiss_popups(driver, pacing).closed
 
 
-def scrape_booking_price(city, hotel_name, check_in_date, check_out_date):
+def build_search_url(city, hotel_name, check_in_date, check_out_date,
+                     adults=2, rooms=1, children=0, dest_id=None, dest_type=None, base_url=None):
     """
-    Scrape hotel prices from Booking.com with pop-up handling
-    
+    Builds the search-results URL that the searchbox flow would end up on,
+    so the results page can be loaded in a single navigation.
+
     Parameters:
-    - city: str (e.g., "Dubai")
-    - hotel_name: str (e.g., "Al Khoory Skygarden Hotel")
-    - check_in_date: str (format: "YYYY-MM-DD", e.g., "2026-06-09")
-    - check_out_date: str (format: "YYYY-MM-DD", e.g., "2026-06-10")
+    - city, hotel_name               : free-text destination ("<hotel>, <city>")
+    - check_in_date, check_out_date  : "YYYY-MM-DD"
+    - adults, rooms, children        : occupancy
+    - dest_id, dest_type             : optional resolved destination (skips free-text matching)
+    - base_url                       : site root (defaults to BOOKING_HOME_URL; e.g. a
+                                       booking_replay stub server)
     """
-    
-    # Setup Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument('--start-maximized')
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    chrome_options.add_argument('--disable-notifications')
-    chrome_options.add_argument('--disable-popup-blocking')
-    
-    # Add user agent to look more like a real browser
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-    
-    # Uncomment the line below to run in headless mode (no browser window)
-    # chrome_options.add_argument('--headless')
-    
-    # Initialize the driver with automatic ChromeDriver installation
-    print("Setting up Chrome driver...")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    
+    params = {
+        "ss": f"{hotel_name}, {city}" if city else hotel_name,
+        "checkin": check_in_date,
+        "checkout": check_out_date,
+        "group_adults": adults,
+        "no_rooms": rooms,
+        "group_children": children,
+    }
+    if dest_id is not None:
+        params["dest_id"] = dest_id
+        params["dest_type"] = dest_type or "hotel"
+    search_url = BOOKING_SEARCH_URL if base_url is None else f"{base_url.rstrip('/')}/searchresults.html"
+    return f"{search_url}?{urlencode(params)}"
+
+
+def search_via_url(driver, url, timeout=10, pacing=None):
+    """
+    Fast path: loads a search-results URL directly.  Returns True when
+    property cards show up within *timeout* seconds, False otherwise.
+    """
+    log.info("Opening search results directly...\n   %s", url)
+    pacing = get_pacing(pacing)
+    with stage("search"):
+        driver.get(url)
+        wait_for_dom_ready(driver)
+    close_all_popups(driver, pacing)
     try:
-        print(f"\n{'='*80}")
-        print(f"SEARCHING FOR HOTEL")
-        print(f"{'='*80}")
-        print(f"Hotel: {hotel_name}")
-        print(f"City: {city}")
-        print(f"Check-in: {check_in_date}")
-        print(f"Check-out: {check_out_date}")
-        print(f"{'='*80}\n")
-        
-        # Navigate to Booking.com
-        print("Opening Booking.com...")
-        driver.get("https://www.booking.com")
-        time.sleep(3)
-        
-        # Close initial pop-ups
-        print("Checking for pop-ups...")
-        close_all_popups(driver)
-        
-        # ── DESTINATION FIELD  (human-like typing) ────────────────────────
-        try:
-            print("Entering destination (typing like a human)...\n")
+        with step("wait", "results_cards"):
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='property-card']"))
+            )
+        log.info("   ✓ Results page loaded via direct URL")
+        return True
+    except TimeoutException:
+        return False
+
+
+def search_via_searchbox(driver, hotel_name, check_in_date, check_out_date, pacing=None,
+                         base_url=None, snapshot=None):
+    """
+    Interactive search flow: opens the Booking.com homepage, types the hotel
+    name into the searchbox, picks the autocomplete suggestion, selects the
+    dates in the calendar and clicks Search.
+
+    *base_url* replaces BOOKING_HOME_URL (e.g. a local stub site) and
+    *snapshot*, when given, is called as snapshot(stage, driver) at the
+    "homepage", "autocomplete" and "calendar" stages (see booking_replay).
 
+    Returns the text of the chosen autocomplete suggestion (None when no
+    suggestion was picked).
+    """
+    pacing = get_pacing(pacing)
+    chosen = None
+
+    # Navigate to Booking.com
+    log.info("Opening Booking.com...")
+    with stage("homepage"):
+        driver.get(base_url or BOOKING_HOME_URL)
+        wait_for_dom_ready(driver)
+    pacing.pause("after_load")
+    if snapshot is not None:
+        snapshot("homepage", driver)
+
+    # Close initial pop-ups
+    log.info("Checking for pop-ups...")
+    close_all_popups(driver, pacing)
+
+    # ── DESTINATION FIELD  (human-like typing) ────────────────────────
+    try:
+        log.info("Entering destination (typing like a human)...\n")
+
+        with step("wait", "destination_field"):
             destination_field = WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.NAME, "ss"))
             )
-            destination_field.clear()
-            time.sleep(random.uniform(0.3, 0.6))
-
-            # ── Step 1 : type the hotel name  word by word ──────────────
-            words = hotel_name.split()                        # e.g. ["Al","Khoory","Skygarden","Hotel"]
-            for i, word in enumerate(words):
-                # type each character of the current word
-                human_type(driver, destination_field, word)
-
-                # after every word (except the last) add a space
-                if i < len(words) - 1:
-                    destination_field.send_keys(" ")
-                    time.sleep(random.uniform(0.15, 0.4))
-
-                # after the first two words have been typed wait a moment
-                # and check whether a useful autocomplete suggestion already
-                # appeared  →  if yes, click it immediately and stop typing
-                if i >= 1:
-                    time.sleep(random.uniform(0.6, 1.2))   # short pause so dropdown can render
-                    close_all_popups(driver)
-                    suggestions = wait_for_suggestions(driver, timeout=3)
-                    best = pick_best_suggestion(suggestions, hotel_name)
-                    if best:
-                        try:
+        destination_field.clear()
+        pacing.pause("after_clear")
+
+        # ── Step 1 : type the hotel name  word by word ──────────────
+        words = hotel_name.split()                        # e.g. ["Al","Khoory","Skygarden","Hotel"]
+        for i, word in enumerate(words):
+            # type each character of the current word
+            human_type(driver, destination_field, word, pacing=pacing)
+
+            # after every word (except the last) add a space
+            if i < len(words) - 1:
+                destination_field.send_keys(" ")
+                pacing.pause("between_words")
+
+            # after the first two words have been typed wait a moment
+            # and check whether a useful autocomplete suggestion already
+            # appeared  →  if yes, click it immediately and stop typing
+            if i >= 1:
+                pacing.pause("suggestions_render")   # short pause so dropdown can render
+                close_all_popups(driver, pacing)
+                suggestions = wait_for_suggestions(driver, timeout=3)
+                if suggestions and snapshot is not None:
+                    snapshot("autocomplete", driver)
+                best = pick_best_suggestion(suggestions, hotel_name, driver)
+                if best:
+                    chosen = best.text.strip()
+                    try:
+                        with step("click", "suggestion"):
                             best.click()
-                            print("   ✓ Autocomplete suggestion selected  →  done!\n")
-                            time.sleep(1)
-                            break                            # exit the word-loop
-                        except ElementClickInterceptedException:
-                            close_all_popups(driver)
+                        log.info("   ✓ Autocomplete suggestion selected  →  done!\n")
+                        wait_for_staleness(driver, best, timeout=2)
+                        pacing.pause("after_select")
+                        break                            # exit the word-loop
+                    except ElementClickInterceptedException:
+                        close_all_popups(driver, pacing)
+                        with step("click", "suggestion"):
                             best.click()
-                            print("   ✓ Autocomplete suggestion selected (after pop-up)  →  done!\n")
-                            time.sleep(1)
-                            break
-                else:
-                    # after the very first word just wait for suggestions to appear
-                    time.sleep(random.uniform(0.8, 1.5))
+                        log.info("   ✓ Autocomplete suggestion selected (after pop-up)  →  done!\n")
+                        wait_for_staleness(driver, best, timeout=2)
+                        pacing.pause("after_select")
+                        break
             else:
-                # ── Step 2 : no suggestion was picked during the loop ──
-                # wait one more time for suggestions after the full name
-                time.sleep(random.uniform(1.0, 2.0))
-                close_all_popups(driver)
-                suggestions = wait_for_suggestions(driver, timeout=5)
-                best = pick_best_suggestion(suggestions, hotel_name)
-                if best:
-                    try:
+                # after the very first word just wait for suggestions to appear
+                pacing.pause("after_first_word")
+        else:
+            # ── Step 2 : no suggestion was picked during the loop ──
+            # wait one more time for suggestions after the full name
+            pacing.pause("after_full_name")
+            close_all_popups(driver, pacing)
+            suggestions = wait_for_suggestions(driver, timeout=5)
+            if suggestions and snapshot is not None:
+                snapshot("autocomplete", driver)
+            best = pick_best_suggestion(suggestions, hotel_name, driver)
+            if best:
+                chosen = best.text.strip()
+                try:
+                    with step("click", "suggestion"):
                         best.click()
-                        print("   ✓ Autocomplete suggestion selected  →  done!\n")
-                        time.sleep(1)
-                    except ElementClickInterceptedException:
-                        close_all_popups(driver)
+                    log.info("   ✓ Autocomplete suggestion selected  →  done!\n")
+                    wait_for_staleness(driver, best, timeout=2)
+                    pacing.pause("after_select")
+                except ElementClickInterceptedException:
+                    close_all_popups(driver, pacing)
+                    with step("click", "suggestion"):
                         best.click()
-                        print("   ✓ Autocomplete suggestion selected (after pop-up)  →  done!\n")
-                        time.sleep(1)
-                else:
-                    # absolute fallback  →  press Enter
-                    destination_field.send_keys(Keys.RETURN)
-                    print("   ⚠ No suggestion matched  →  pressed Enter instead\n")
-                    time.sleep(2)
-
-        except Exception as e:
-            print(f"   ✗ Error with destination field: {e}")
-        
-        # Close any pop-ups before date selection
-        close_all_popups(driver)
+                    log.info("   ✓ Autocomplete suggestion selected (after pop-up)  →  done!\n")
+                    wait_for_staleness(driver, best, timeout=2)
+                    pacing.pause("after_select")
+            else:
+                # absolute fallback  →  press Enter
+                destination_field.send_keys(Keys.RETURN)
+                log.warning("   ⚠ No suggestion matched  →  pressed Enter instead\n")
+                pacing.pause("after_enter")
 
-        # ── DATE SELECTION  (selectors taken from the real HTML) ──────────
-        try:
-            print("Selecting dates...")
-            checkin  = datetime.strptime(check_in_date,  "%Y-%m-%d")
-            checkout = datetime.strptime(check_out_date, "%Y-%m-%d")
-
-            # ── Step 1 : open the calendar ────────────────────────────────
-            open_selectors = [
-                "button[data-testid='date-display-field-start']",
-                "div[data-testid='searchbox-dates-container']",
-                "button.sb-date-field__display",
-                "#calendar-searchboxdatepicker-tab-trigger",   # Calendar tab (seen in HTML)
-            ]
-            calendar_opened = False
-            for sel in open_selectors:
-                try:
-                    btn = WebDriverWait(driver, 4).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, sel))
-                    )
-                    btn.click()
-                    print(f"   ✓ Calendar opened via  →  {sel}")
-                    calendar_opened = True
-                    time.sleep(1.5)
-                    break
-                except (TimeoutException, NoSuchElementException):
-                    continue
-
-            if not calendar_opened:
-                raise Exception("Could not open the calendar datepicker")
-
-            close_all_popups(driver)
-
-            # ── helper : navigate calendar to the month containing target_date
-            def navigate_to_month(target_date: datetime):
-                """
-                Reads the month titles shown on-screen (h3 aria-live='polite').
-                Clicks Previous / Next month until the target month is visible.
-                """
-                for _ in range(24):                                       # safety cap
+    except Exception as e:
+        log.error("   ✗ Error with destination field: %s", e)
+
+    # Close any pop-ups before date selection
+    close_all_popups(driver, pacing)
+
+    # ── DATE SELECTION  (selectors taken from the real HTML) ──────────
+    started = time.perf_counter()
+    try:
+        log.info("Selecting dates...")
+        checkin  = datetime.strptime(check_in_date,  "%Y-%m-%d")
+        checkout = datetime.strptime(check_out_date, "%Y-%m-%d")
+
+        # ── Step 1 : open the calendar ────────────────────────────────
+        # all opener variants are raced; one that is clickable but does
+        # not open the calendar is dropped and the rest raced again
+        calendar_opened = False
+        candidates = SELECTORS.order("calendar_open")
+        while candidates and not calendar_opened:
+            sel, found = wait_for_any(driver, candidates, timeout=8, clickable=True,
+                                      name="calendar_open")
+            if sel is None:
+                SELECTORS.record("calendar_open", misses=candidates)
+                break
+            index = candidates.index(sel)
+            try:
+                with step("click", "calendar_open"):
+                    found[0].click()
+                with step("wait", "calendar"):
+                    WebDriverWait(driver, 4).until(EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, "div[data-testid='searchbox-datepicker-calendar']")
+                    ))
+            except (TimeoutException, NoSuchElementException):
+                SELECTORS.record("calendar_open", misses=candidates[:index + 1])
+                candidates = candidates[index + 1:]
+                continue
+            SELECTORS.record("calendar_open", hits=[sel], misses=candidates[:index])
+            log.info("   ✓ Calendar opened via  →  %s", sel, extra={"selector": sel})
+            calendar_opened = True
+            pacing.pause("calendar_open")
+
+        if not calendar_opened:
+            raise Exception("Could not open the calendar datepicker")
+        if snapshot is not None:
+            snapshot("calendar", driver)
+
+        close_all_popups(driver, pacing)
+
+        # ── helper : navigate calendar to the month containing target_date
+        def navigate_to_month(target_date: datetime):
+            """
+            Reads the month titles shown on-screen (h3 aria-live='polite').
+            Clicks Previous / Next month until the target month is visible.
+            """
+            for _ in range(24):                                       # safety cap
+                with step("find", "month_titles"):
                     titles = driver.find_elements(
                         By.CSS_SELECTOR,
                         "div[data-testid='searchbox-datepicker-calendar'] "
                         "h3[aria-live='polite']"
                     )
-                    displayed = [t.text.strip() for t in titles]          # ["June 2026", "July 2026"]
-                    target_str = target_date.strftime("%B %Y")            # "June 2026"
-                    print(f"      visible months  →  {displayed}   |  need  →  {target_str}")
-
-                    if target_str in displayed:
-                        print(f"   ✓ Correct month visible  →  {target_str}")
-                        return
-
-                    # compare numerically to decide direction
-                    first_shown = datetime.strptime(displayed[0], "%B %Y")
-                    arrow = "button[aria-label='Previous month']" if target_date < first_shown \
-                            else "button[aria-label='Next month']"
+                    displayed = [t.text.strip() for t in titles]      # ["June 2026", "July 2026"]
+                target_str = target_date.strftime("%B %Y")            # "June 2026"
+                log.debug("      visible months  →  %s   |  need  →  %s", displayed, target_str)
+
+                if target_str in displayed:
+                    log.info("   ✓ Correct month visible  →  %s", target_str)
+                    return
+
+                # compare numerically to decide direction
+                first_shown = datetime.strptime(displayed[0], "%B %Y")
+                arrow = "button[aria-label='Previous month']" if target_date < first_shown \
+                        else "button[aria-label='Next month']"
+                with step("click", "month_arrow"):
                     driver.find_element(By.CSS_SELECTOR, arrow).click()
-                    time.sleep(0.8)
+                wait_for_staleness(driver, titles[0], timeout=2)          # month re-rendered
+                pacing.pause("calendar_click")
 
-                raise Exception(f"Could not navigate to {target_date.strftime('%B %Y')}")
+            raise Exception(f"Could not navigate to {target_date.strftime('%B %Y')}")
 
-            # ── helper : click a date cell by data-date attribute ─────────
-            def click_date(date_str: str):
-                """  span[data-date='YYYY-MM-DD']  — confirmed in pasted HTML  """
+        # ── helper : click a date cell by data-date attribute ─────────
+        def click_date(date_str: str):
+            """  span[data-date='YYYY-MM-DD']  — confirmed in pasted HTML  """
+            with step("wait", "date_cell"):
                 el = WebDriverWait(driver, 5).until(
                     EC.element_to_be_clickable(
                         (By.CSS_SELECTOR, f"span[data-date='{date_str}']")
                     )
                 )
+            with step("click", "date_cell"):
                 el.click()
-                print(f"   ✓ Clicked date  →  {date_str}")
-                time.sleep(0.8)
-
-            # ── Step 2 : navigate + click CHECK-IN ────────────────────────
-            navigate_to_month(checkin)
-            click_date(check_in_date)
-            time.sleep(0.5)
-
-            # ── Step 3 : navigate + click CHECK-OUT ───────────────────────
-            navigate_to_month(checkout)                                   # view may have shifted
-            click_date(check_out_date)
-            time.sleep(1.0)
-            print("   ✓ Both dates selected")
-
-            # ── Step 4 : click Apply in the datepicker footer ────────────
-            # Footer:  div[data-testid='datepicker-footer']
-            # Apply is the primary <button> inside it.
-            try:
+            log.info("   ✓ Clicked date  →  %s", date_str)
+            pacing.pause("calendar_click")
+
+        # ── Step 2 : navigate + click CHECK-IN ────────────────────────
+        navigate_to_month(checkin)
+        click_date(check_in_date)
+        pacing.pause("between_dates")
+
+        # ── Step 3 : navigate + click CHECK-OUT ───────────────────────
+        navigate_to_month(checkout)                                   # view may have shifted
+        click_date(check_out_date)
+        pacing.pause("after_dates")
+        log.info("   ✓ Both dates selected")
+
+        # ── Step 4 : click Apply in the datepicker footer ────────────
+        # Footer:  div[data-testid='datepicker-footer']
+        # Apply is the primary <button> inside it.
+        try:
+            with step("wait", "apply_button"):
                 apply_btn = WebDriverWait(driver, 3).until(
                     EC.element_to_be_clickable((
                         By.CSS_SELECTOR,
                         "div[data-testid='datepicker-footer'] button"
                     ))
                 )
+            with step("click", "apply_button"):
                 apply_btn.click()
-                print("   ✓ Apply button clicked")
-                time.sleep(1)
-            except (TimeoutException, NoSuchElementException):
-                print("   ⚠ No Apply button — assuming calendar auto-closed")
+            log.info("   ✓ Apply button clicked")
+            pacing.pause("after_apply")
+        except (TimeoutException, NoSuchElementException):
+            log.info("   ⚠ No Apply button — assuming calendar auto-closed")
+
+    except Exception as e:
+        log.error("   ✗ Error with date selection: %s", e)
+    STAGE_TIMINGS.record("calendar", time.perf_counter() - started)
+
+    # ── Close pop-ups before search ───────────────────────────────────
+    close_all_popups(driver, pacing)
+    pacing.pause("before_search")
+
+    # ── SEARCH BUTTON ─────────────────────────────────────────────────
+    started = time.perf_counter()
+    try:
+        log.info("Clicking search button...")
+
+        search_clicked = False
+        with step("find", "page_root"):
+            search_page = driver.find_element(By.TAG_NAME, "html")
+        candidates = SELECTORS.order("search_button")
+        sel, found = wait_for_any(driver, candidates, timeout=10, clickable=True,
+                                  name="search_button")
+        SELECTORS.record_first("search_button", candidates, sel)
+        if sel is not None:
+            with step("click", "search_button"):
+                found[0].click()
+            search_clicked = True
+            log.info("   ✓ Search initiated")
+
+        if not search_clicked:
+            log.error("   ✗ Could not click search button")
+        else:
+            wait_for_staleness(driver, search_page, timeout=10)   # results page replaced the homepage
+            wait_for_dom_ready(driver)
+
+        pacing.pause("after_search")
+
+    except Exception as e:
+        log.error("   ✗ Error clicking search button: %s", e)
+    STAGE_TIMINGS.record("search", time.perf_counter() - started)
 
-        except Exception as e:
-            print(f"   ✗ Error with date selection: {e}")
+    return chosen
 
-        # ── Close pop-ups before search ───────────────────────────────────
-        close_all_popups(driver)
-        time.sleep(0.5)
 
-        # ── SEARCH BUTTON ─────────────────────────────────────────────────
+def build_hotel_url(url, check_in_date, check_out_date, adults=2, rooms=1, children=0,
+                    base_url=None):
+    """
+    Absolute property-page URL for *url* (as linked from a results card)
+    with the stay dates and occupancy set, so the availability table shows
+    prices for the query.  Relative links resolve against *base_url*.
+    """
+    parts = urlsplit(urljoin(base_url or BOOKING_HOME_URL, url))
+    params = dict(parse_qsl(parts.query))
+    params.update({
+        "checkin": check_in_date,
+        "checkout": check_out_date,
+        "group_adults": adults,
+        "no_rooms": rooms,
+        "group_children": children,
+    })
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(params), ""))
+
+
+def scrape_room_rates(driver, hotel_url, hotel_name, city, check_in_date, check_out_date,
+                      adults=2, rooms=1, children=0, pacing=None, timeout=15, base_url=None,
+                      snapshot=None):
+    """
+    Opens a property page and returns one RoomRateRecord per row of its
+    availability table (room type, board, cancellation policy, occupancy
+    and price).  The table is read with a single script call and parsed
+    offline.
+
+    Parameters:
+    - driver      : WebDriver to use (the current page is replaced)
+    - hotel_url   : property-page URL, e.g. PriceRecord.url of a results card
+    - hotel_name  : hotel name stored on the records
+    - city, check_in_date, check_out_date, adults, rooms, children : the query
+    - pacing      : PacingPolicy or preset name
+    - timeout     : seconds to wait for the availability table
+    - base_url    : site root relative links resolve against
+    - snapshot    : optional snapshot(stage, driver) hook, called at "property"
+    """
+    pacing = get_pacing(pacing)
+    url = build_hotel_url(hotel_url, check_in_date, check_out_date, adults, rooms, children,
+                          base_url)
+    log.info("Opening property page...\n   %s", url)
+    with stage("property"):
+        driver.get(url)
+        wait_for_dom_ready(driver)
+        close_all_popups(driver, pacing)
         try:
-            print("Clicking search button...")
+            with step("wait", "room_table"):
+                WebDriverWait(driver, timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(ROOM_TABLE_SELECTORS)))
+                )
+        except TimeoutException:
+            log.warning("   ⚠ No availability table on the property page (sold out or layout changed)")
+            return []
+        wait_for_network_idle(driver, timeout=5)
+    pacing.pause("after_load")
+    if snapshot is not None:
+        snapshot("property", driver)
+
+    scraped_at = utc_now()
+    rates = [
+        record_from_room(rate, hotel_name, city, check_in_date, check_out_date, scraped_at)
+        for rate in parse_room_rates(fetch_room_table_html(driver))
+    ]
+    log.info("   ✓ %d room rate(s)", len(rates))
+    for rate in rates:
+        log.info("     %s  |  %s  |  %s  |  %s guest(s)  |  %s", rate.room_type,
+                 rate.board or "Room only", rate.cancellation or "-", rate.occupancy or "?",
+                 rate.price_text)
+    return rates
 
-            search_button_selectors = [
-                "button[type='submit']",
-                "button.sb-searchbox__button",
-                "button[data-testid='search-button']",
-            ]
 
-            search_clicked = False
-            for sel in search_button_selectors:
-                try:
-                    search_button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, sel))
-                    )
-                    search_button.click()
-                    search_clicked = True
-                    print("   ✓ Search initiated")
-                    break
-                except (TimeoutException, NoSuchElementException):
-                    continue
+def build_chrome_options(profile=None):
+    """
+    Builds the Chrome options used for every scraping session.
+
+    Parameters:
+    - profile : BrowserProfile or profile name ("default", "lean"); see
+                booking_profiles.  Defaults to "default".
+    """
+    return get_profile(profile).chrome_options()
 
-            if not search_clicked:
-                print("   ✗ Could not click search button")
 
-            time.sleep(5)
+def create_driver(chrome_options=None, driver_path=None, profile=None):
+    """
+    Starts a new Chrome session.
 
-        except Exception as e:
-            print(f"   ✗ Error clicking search button: {e}")
+    Parameters:
+    - chrome_options : Options to start Chrome with (defaults to the profile's options)
+    - driver_path    : path of an already installed chromedriver; when omitted
+                       the locally cached path is used (see booking_driver)
+    - profile        : BrowserProfile or profile name; its URL blocklist is
+                       installed once the session is up
+    """
+    profile = get_profile(profile)
+    if chrome_options is None:
+        chrome_options = profile.chrome_options()
+    if driver_path is not None:
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    else:
+        try:
+            driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=chrome_options)
+        except SessionNotCreatedException:
+            # Chrome was updated since the driver path was cached
+            log.warning("   ⚠ Cached chromedriver does not match Chrome  →  resolving it again")
+            driver = webdriver.Chrome(service=Service(resolve_driver_path(refresh=True)), options=chrome_options)
+    profile.apply(driver)
+    return driver
+
+
+def scrape_booking_price(city, hotel_name, check_in_date, check_out_date, driver=None,
+                         fast_path=False, adults=2, rooms=1, children=0, pacing=None, sink=None,
+                         resolver=None, match_threshold=DEFAULT_THRESHOLD, room_rates=False,
+                         room_sink=None, max_results=None, profile=None, base_url=None,
+                         snapshot=None, metrics_file=None):
+    """
+    Scrape hotel prices from Booking.com with pop-up handling
+    
+    Parameters:
+    - city: str (e.g., "Dubai")
+    - hotel_name: str (e.g., "Al Khoory Skygarden Hotel")
+    - check_in_date: str (format: "YYYY-MM-DD", e.g., "2026-06-09")
+    - check_out_date: str (format: "YYYY-MM-DD", e.g., "2026-06-10")
+    - driver: optional WebDriver to reuse (e.g. from a DriverPool).  When
+      given, the session is left open and no inspection pauses are made.
+    - fast_path: load the search-results URL directly instead of driving the
+      searchbox; falls back to the searchbox when no property cards appear
+    - adults, rooms, children: occupancy used by the fast path
+    - pacing: PacingPolicy or preset name ("human", "balanced", "zero-delay");
+      defaults to "human"
+    - sink: optional RecordSink (see booking_sinks) the records are written to
+    - resolver: optional ResolverCache (see booking_resolver); a cached
+      destination id skips the typing and autocomplete steps entirely
+    - match_threshold: minimum fuzzy name score (0-1) for a card to count
+      as the target hotel
+    - room_rates: also open the target hotel's property page and scrape its
+      per-room-type rates (see scrape_room_rates)
+    - room_sink: optional RecordSink the RoomRateRecords are written to
+    - max_results: read up to this many cards, following "load more" and
+      pagination, and stop at the target hotel; by default only the first
+      results page is read
+    - profile: BrowserProfile or profile name ("default", "lean") for the
+      session started when no driver is given
+    - base_url: site root to scrape instead of BOOKING_HOME_URL, e.g. a
+      booking_replay stub server on localhost
+    - snapshot: optional callable snapshot(stage, driver) invoked at every
+      page stage (homepage, autocomplete, calendar, results, property);
+      booking_replay.FixtureRecorder uses it to capture fixtures
+    - metrics_file: write the stage, step and selector metrics collected so
+      far (see booking_metrics) to this file when the scrape ends;
+      ".om" / ".openmetrics" files get the OpenMetrics format
+
+    Returns a list of PriceRecord, one per property card found.
+    """
+    pacing = get_pacing(pacing)
+    records = []
+    
+    owns_driver = driver is None
+    if owns_driver:
+        # Initialize the driver with automatic ChromeDriver installation
+        log.info("Setting up Chrome driver...")
+        with stage("setup"):
+            driver = create_driver(profile=profile)
+    
+    try:
+        log.info("\n%s\nSEARCHING FOR HOTEL\n%s\nHotel: %s\nCity: %s\nCheck-in: %s\nCheck-out: %s\n%s\n",
+                 RULE, RULE, hotel_name, city, check_in_date, check_out_date, RULE,
+                 extra={"hotel": hotel_name, "city": city,
+                        "check_in": check_in_date, "check_out": check_out_date})
+        
+        resolution = resolver.get(hotel_name, city) if resolver is not None else None
+        chosen_suggestion = None
+        if resolution is not None:
+            log.info("   ✓ Resolved from cache  →  %s (dest_id %s)",
+                     resolution.canonical_name, resolution.dest_id)
+            url = build_search_url(city, hotel_name, check_in_date, check_out_date,
+                                   adults=adults, rooms=rooms, children=children,
+                                   dest_id=resolution.dest_id, dest_type=resolution.dest_type,
+                                   base_url=base_url)
+            if not search_via_url(driver, url, pacing=pacing):
+                log.warning("   ⚠ Cached destination returned no property cards  →  resolving again\n")
+                resolver.invalidate(hotel_name, city)
+                resolution = None
+                chosen_suggestion = search_via_searchbox(
+                    driver, hotel_name, check_in_date, check_out_date, pacing, base_url, snapshot,
+                )
+        elif fast_path:
+            url = build_search_url(city, hotel_name, check_in_date, check_out_date,
+                                   adults=adults, rooms=rooms, children=children,
+                                   base_url=base_url)
+            if not search_via_url(driver, url, pacing=pacing):
+                log.warning("   ⚠ Direct URL returned no property cards  →  falling back to the searchbox flow\n")
+                chosen_suggestion = search_via_searchbox(
+                    driver, hotel_name, check_in_date, check_out_date, pacing, base_url, snapshot,
+                )
+        else:
+            chosen_suggestion = search_via_searchbox(
+                driver, hotel_name, check_in_date, check_out_date, pacing, base_url, snapshot,
+            )
         
         # Close any pop-ups on results page
-        print("Checking for pop-ups on results page...")
-        time.sleep(2)
-        close_all_popups(driver)
-        time.sleep(1)
-        close_all_popups(driver)  # Try twice
+        log.info("Checking for pop-ups on results page...")
+        pacing.pause("results_popups")
+        close_all_popups(driver, pacing)
+        pacing.pause("results_popups")
+        close_all_popups(driver, pacing)  # Try twice
         
         # Wait for results to load
-        print("Loading results...\n")
+        log.info("Loading results...\n")
+        started = time.perf_counter()
         try:
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='property-card']"))
-            )
+            with step("wait", "results_cards"):
+                WebDriverWait(driver, 20).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='property-card']"))
+                )
         except TimeoutException:
-            print("⚠️  Results took too long to load or no results found")
-            print("Current URL:", driver.current_url)
-            time.sleep(5)
+            log.warning("⚠️  Results took too long to load or no results found\nCurrent URL: %s",
+                        driver.current_url)
+            pacing.pause("results_timeout")
+            STAGE_TIMINGS.record("results_wait", time.perf_counter() - started)
+        else:
+            # prices and badges are filled in after the cards render
+            wait_for_network_idle(driver, timeout=5)
+            STAGE_TIMINGS.record("results_wait", time.perf_counter() - started)
+            if snapshot is not None:
+                snapshot("results", driver)
         
         # Close pop-ups one more time before extracting data
-        close_all_popups(driver)
+        close_all_popups(driver, pacing)
         
         # Extract hotel information
-        print(f"\n{'='*80}")
-        print("SEARCH RESULTS")
-        print(f"{'='*80}\n")
+        log.info("\n%s\nSEARCH RESULTS\n%s\n", RULE, RULE)
         
-        # Try to find hotel cards
-        try:
-            hotels = driver.find_elements(By.CSS_SELECTOR, "[data-testid='property-card']")
-            
-            if len(hotels) == 0:
-                print("⚠️  No hotel cards found. Trying alternative selector...")
-                hotels = driver.find_elements(By.CSS_SELECTOR, "div[data-testid='property-card']")
-            
-            if len(hotels) == 0:
-                print("⚠️  Still no results. The page structure might have changed.")
-                print("Current URL:", driver.current_url)
-                print("\nWaiting 20 seconds so you can inspect the page...")
-                time.sleep(20)
-                return
-            
-            print(f"Found {len(hotels)} hotel(s)\n")
-            
-        except Exception as e:
-            print(f"Error finding hotel elements: {e}")
-            hotels = []
-        
-        found_target_hotel = False
-        
-        for idx, hotel in enumerate(hotels[:2], 1):  # Check first 10 results
+        started = time.perf_counter()
+        if max_results is not None:
+            # Lazily walk the whole result set; stops at the target hotel
+            hotels = iter_result_cards(
+                driver, limit=max_results, pacing=pacing,
+                until=lambda card: is_same_hotel(hotel_name, card.name, match_threshold),
+            )
+        else:
+            # Fetch all cards in one round-trip and parse them offline
             try:
-                # Get hotel name
-                name_element = hotel.find_element(By.CSS_SELECTOR, "[data-testid='title']")
-                name = name_element.text
-                
-                # Get price
-                try:
-                    price_element = hotel.find_element(By.CSS_SELECTOR, "[data-testid='price-and-discounted-price']")
-                    price = price_element.text
-                except:
-                    try:
-                        price_element = hotel.find_element(By.CSS_SELECTOR, ".prco-valign-middle-helper")
-                        price = price_element.text
-                    except:
-                        try:
-                            price_element = hotel.find_element(By.CSS_SELECTOR, "span[data-testid='price-and-discounted-price']")
-                            price = price_element.text
-                        except:
-                            price = "Price not available"
-                
-                # Get rating if available
-                try:
-                    rating_element = hotel.find_element(By.CSS_SELECTOR, "[data-testid='review-score'] div")
-                    rating = rating_element.text
-                except:
-                    rating = "No rating"
-                
-                # Get location/address if available
-                try:
-                    location_element = hotel.find_element(By.CSS_SELECTOR, "[data-testid='address']")
-                    location = location_element.text
-                except:
-                    location = "Location not specified"
-                
-                print(f"{idx}. {name}")
-                print(f"   Price: {price}")
-                print(f"   Rating: {rating}")
-                print(f"   Location: {location}")
+                hotels = parse_property_cards(fetch_results_html(driver))
                 
-                # Check if this is the target hotel
-                if hotel_name.lower() in name.lower():
-                    found_target_hotel = True
-                    print(f"\n   🎯 TARGET HOTEL FOUND! 🎯")
+                if len(hotels) == 0:
+                    log.warning("⚠️  No hotel cards found. The page structure might have changed.\n"
+                                "Current URL: %s", driver.current_url)
+                    if owns_driver and pacing.inspect_pauses:
+                        log.info("\nWaiting 20 seconds so you can inspect the page...")
+                        time.sleep(20)
+                    return records
                 
-                print(f"   {'-'*76}")
+                log.info("Found %d hotel(s)\n", len(hotels))
                 
             except Exception as e:
-                print(f"✗ Error extracting data for hotel {idx}: {e}")
+                log.error("Error finding hotel elements: %s", e)
+                hotels = []
+        
+        found_target_hotel = False
+        target_name = None
+        target_url = None
+        scraped_at = utc_now()
+        
+        for hotel in hotels:
+            log.info("%d. %s\n   Price: %s\n   Rating: %s\n   Location: %s", hotel.rank, hotel.name,
+                     hotel.price or "Price not available", hotel.rating or "No rating",
+                     hotel.address or "Location not specified")
+            
+            # Check if this is the target hotel
+            is_target = is_same_hotel(hotel_name, hotel.name, match_threshold)
+            if is_target:
+                found_target_hotel = True
+                target_name = target_name or hotel.name
+                target_url = target_url or hotel.url
+                log.info("\n   🎯 TARGET HOTEL FOUND! 🎯", extra={"target": hotel.name, "rank": hotel.rank})
+            
+            log.info("   %s", "-" * 76)
+            records.append(record_from_card(
+                hotel, city, check_in_date, check_out_date, is_target, scraped_at
+            ))
+        STAGE_TIMINGS.record("extraction", time.perf_counter() - started)
+        
+        if sink is not None:
+            sink.write_many(records)
+        
+        # Remember how this hotel resolved, or forget a destination that
+        # no longer returns it
+        if resolver is not None:
+            if found_target_hotel and resolution is None:
+                learned = resolution_from_url(driver.current_url, chosen_suggestion or target_name)
+                if learned is not None:
+                    resolver.put(hotel_name, city, learned)
+                    log.info("   ✓ Cached resolution  →  dest_id %s", learned.dest_id)
+            elif not found_target_hotel and resolution is not None:
+                log.warning("   ⚠ Cached destination no longer returns the hotel  →  invalidated")
+                resolver.invalidate(hotel_name, city)
+        
+        # Per-room-type rates from the property page (after the resolver
+        # has read the results URL)
+        if room_rates and target_url:
+            rates = scrape_room_rates(driver, target_url, target_name, city, check_in_date,
+                                      check_out_date, adults, rooms, children, pacing,
+                                      base_url=base_url, snapshot=snapshot)
+            if room_sink is not None:
+                room_sink.write_many(rates)
+        elif room_rates and found_target_hotel:
+            log.warning("   ⚠ Target card has no property-page link  →  room rates skipped")
         
         if not found_target_hotel:
-            print(f"\n⚠️  WARNING: '{hotel_name}' was not found in the first 10 results.")
-            print("   Possible reasons:")
-            print("   - Hotel name might be different on Booking.com")
-            print("   - Hotel might be listed further down")
-            print("   - Hotel might not be available for selected dates")
-            print("   - Hotel might not be on Booking.com\n")
+            log.warning("\n⚠️  WARNING: '%s' was not found in the results.\n"
+                        "   Possible reasons:\n"
+                        "   - Hotel name might be different on Booking.com\n"
+                        "   - Hotel might be listed further down\n"
+                        "   - Hotel might not be available for selected dates\n"
+                        "   - Hotel might not be on Booking.com\n", hotel_name)
         
-        print(f"{'='*80}\n")
+        log.info("%s\n", RULE)
         
         # Keep browser open for inspection
-        print("Browser will remain open for 20 seconds for you to inspect...")
-        print("You can also scroll through the results manually.")
-        time.sleep(20)
+        if owns_driver and pacing.inspect_pauses:
+            log.info("Browser will remain open for 20 seconds for you to inspect...\n"
+                     "You can also scroll through the results manually.")
+            time.sleep(20)
         
     except Exception as e:
-        print(f"\n✗ An error occurred: {e}")
-        print("The browser will remain open for 15 seconds so you can see what happened...")
-        time.sleep(15)
+        log.error("\n✗ An error occurred: %s", e)
+        if not owns_driver:
+            raise
+        if pacing.inspect_pauses:
+            log.info("The browser will remain open for 15 seconds so you can see what happened...")
+            time.sleep(15)
         
     finally:
-        driver.quit()
-        print("\n✓ Browser closed.")
-        print("Script completed!")
+        if owns_driver:
+            driver.quit()
+            log.info("\n✓ Browser closed.\nScript completed!")
+        if metrics_file is not None:
+            write_metrics(metrics_file)
 
+    return records
 
-def main():
-    print("\n" + "="*80)
-    print("BOOKING.COM HOTEL PRICE SCRAPER")
-    print("="*80 + "\n")
-
-    city = "Dubai"
-    #hotel_name = "Al Khoory Skygarden Hotel"
-    hotel_name = "Howard Johnson Bur Dubai"
-    check_in_date = "2026-05-01"
-    check_out_date = "2026-05-05"
 
-    scrape_booking_price(city, hotel_name, check_in_date, check_out_date)
+def main():
+    # `python booking_scraper_v2.py ...` keeps working; the CLI lives in booking_cli
+    from booking_cli import main as cli_main
+    return cli_main()
 
 
 if __name__ == "__main__":
-    main()
-
+    raise SystemExit(main())
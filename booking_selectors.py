@@ -0,0 +1,265 @@
+"""
+Adaptive selector registry.
+
+Every fallback selector list the scraper uses (autocomplete suggestions,
+calendar opener, search button, pop-ups, pagination controls, the price
+and room-table fallbacks of the parser) is registered here under a group
+name.  Each attempt records which selector matched, and order(group)
+returns the list sorted by recent hit rate, so the variant the site
+currently serves is tried first:
+
+    SELECTORS.open("booking_selectors.sqlite")     # persist between runs
+    for sel in SELECTORS.order("search_button"):
+        ...
+    SELECTORS.record("search_button", hits=[sel], misses=tried_before)
+
+The live flow does not try the list one selector at a time any more:
+booking_pacing.wait_for_any() polls every selector of the group in a
+single script call and returns the first one (in registry order) that
+matches, so a layout change costs no extra timeout at all and the next
+query already starts with the selector that worked.
+
+Hit rates decay with every attempt (*decay*), so a selector that stops
+matching drops below the alternatives after a few misses.  Selectors
+without any history score 0.5; ties keep the registered order.  Groups
+registered with adaptive=False keep their order (the parser's lists
+encode precedence) but are still counted.
+
+Only the standard library is used.
+"""
+
+import atexit
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from booking_metrics import SELECTOR_STATS
+
+
+class SelectorRegistry:
+    """
+    Registered fallback lists and their decayed hit / attempt counts.
+
+    Parameters:
+    - path     : SQLite file the stats are loaded from and saved to
+                 (None → kept in memory; see open())
+    - decay    : weight of the history at every new attempt (0-1)
+    - autosave : seconds between two saves triggered by record() (0 → only
+                 on save() and at exit)
+    """
+
+    def __init__(self, path=None, decay=0.8, autosave=30.0):
+        self.decay = decay
+        self.autosave = autosave
+        self.path = None
+        self._lock = threading.Lock()
+        self._defaults = {}           # group → registered list
+        self._adaptive = {}           # group → reorder or not
+        self._stats = {}              # (group, selector) → [hits, attempts, updated_at]
+        self._order = {}              # group → cached order
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+        self._atexit = False
+        if path is not None:
+            self.open(path)
+
+    # ── lists ─────────────────────────────────────────────────────────
+
+    def register(self, group, selectors, adaptive=True):
+        """ Registers (or replaces) the fallback list of *group*; returns it unchanged. """
+        with self._lock:
+            self._defaults[group] = list(selectors)
+            self._adaptive[group] = adaptive
+            self._order.pop(group, None)
+        return selectors
+
+    def groups(self):
+        with self._lock:
+            return sorted(self._defaults)
+
+    def defaults(self, group):
+        """ The list as registered. """
+        with self._lock:
+            return list(self._lookup(group))
+
+    def _lookup(self, group):
+        try:
+            return self._defaults[group]
+        except KeyError:
+            raise ValueError(
+                f"Unknown selector group {group!r}; choose one of {sorted(self._defaults)}"
+            ) from None
+
+    def _score(self, group, selector):
+        hits, attempts, _ = self._stats.get((group, selector), (0.0, 0.0, 0.0))
+        return (hits + 1) / (attempts + 2)
+
+    def order(self, group):
+        """ The selectors of *group*, best recent hit rate first. """
+        with self._lock:
+            cached = self._order.get(group)
+            if cached is None:
+                defaults = self._lookup(group)
+                if self._adaptive[group]:
+                    ranked = sorted(enumerate(defaults),
+                                    key=lambda item: (-self._score(group, item[1]), item[0]))
+                    cached = [selector for _, selector in ranked]
+                else:
+                    cached = list(defaults)
+                self._order[group] = cached
+            return list(cached)
+
+    # ── outcomes ──────────────────────────────────────────────────────
+
+    def record(self, group, hits=(), misses=()):
+        """
+        Records one pass over *group*: the selectors that matched (*hits*)
+        and the ones tried in vain (*misses*).  Also counted in
+        booking_metrics.SELECTOR_STATS.
+        """
+        self.record_passes([(group, hits, misses)])
+
+    def record_passes(self, passes):
+        """
+        Records several (group, hits, misses) passes in order, taking the
+        lock once, e.g. all card lookups of a parsed results page.
+        """
+        now = time.time()
+        hit_counts, miss_counts = Counter(), Counter()
+        with self._lock:
+            for group, hits, misses in passes:
+                for selector, hit in [(s, True) for s in hits] + [(s, False) for s in misses]:
+                    entry = self._stats.setdefault((group, selector), [0.0, 0.0, 0.0])
+                    entry[0] = entry[0] * self.decay + (1.0 if hit else 0.0)
+                    entry[1] = entry[1] * self.decay + 1.0
+                    entry[2] = now
+                    (hit_counts if hit else miss_counts)[group, selector] += 1
+                self._order.pop(group, None)
+                self._unsaved += 1
+            save = (self.path is not None and self.autosave
+                    and time.monotonic() - self._saved_at >= self.autosave)
+        SELECTOR_STATS.add(hit_counts, miss_counts)
+        if save:
+            self.save()
+
+    def record_first(self, group, tried, matched):
+        """
+        Records a pass over *tried* (in that order) that stopped at
+        *matched*: the selectors before it missed, all of them when
+        *matched* is None.
+        """
+        if matched is None:
+            self.record(group, misses=tried)
+        else:
+            self.record(group, hits=[matched], misses=tried[:tried.index(matched)])
+
+    def hit_rate(self, group, selector):
+        """ Decayed hit rate of *selector* (None without any attempt). """
+        with self._lock:
+            entry = self._stats.get((group, selector))
+        return entry[0] / entry[1] if entry and entry[1] else None
+
+    def stats(self, group=None):
+        """ {group: [{selector, hit_rate, attempts}, ...]} in current order. """
+        groups = self.groups() if group is None else [group]
+        result = {}
+        for name in groups:
+            rows = []
+            for selector in self.order(name):
+                with self._lock:
+                    hits, attempts, _ = self._stats.get((name, selector), (0.0, 0.0, 0.0))
+                rows.append({
+                    "selector": selector,
+                    "hit_rate": round(hits / attempts, 3) if attempts else None,
+                    "attempts": round(attempts, 2),
+                })
+            result[name] = rows
+        return result
+
+    def reset(self, group=None):
+        """ Forgets the history of *group* (of every group when None), also in the opened file. """
+        with self._lock:
+            for key in [key for key in self._stats if group is None or key[0] == group]:
+                del self._stats[key]
+            self._order.clear()
+            path = self.path
+        if path is not None:
+            db = self._connect(path)
+            try:
+                with db:
+                    if group is None:
+                        db.execute("DELETE FROM selector_stats")
+                    else:
+                        db.execute("DELETE FROM selector_stats WHERE grp = ?", (group,))
+            finally:
+                db.close()
+
+    # ── persistence ───────────────────────────────────────────────────
+
+    def _connect(self, path):
+        db = sqlite3.connect(path)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS selector_stats ("
+            " grp TEXT NOT NULL,"
+            " selector TEXT NOT NULL,"
+            " hits REAL NOT NULL,"
+            " attempts REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (grp, selector))"
+        )
+        return db
+
+    def open(self, path):
+        """
+        Loads the stats saved in *path* (merged over the in-memory ones)
+        and saves there from now on, at the latest when the interpreter
+        exits.
+        """
+        db = self._connect(path)
+        try:
+            rows = db.execute("SELECT grp, selector, hits, attempts, updated_at FROM selector_stats").fetchall()
+        finally:
+            db.close()
+        with self._lock:
+            for group, selector, hits, attempts, updated_at in rows:
+                current = self._stats.get((group, selector))
+                if current is None or current[2] < updated_at:
+                    self._stats[group, selector] = [hits, attempts, updated_at]
+            self._order.clear()
+            self.path = path
+            if not self._atexit:
+                atexit.register(self.save)
+                self._atexit = True
+        return self
+
+    def save(self):
+        """
+        Writes the stats to the opened file (no-op without one).  Rows
+        saved more recently by another process are kept.
+        """
+        with self._lock:
+            if self.path is None:
+                return
+            if not self._unsaved:
+                return
+            rows = [(group, selector, hits, attempts, updated_at)
+                    for (group, selector), (hits, attempts, updated_at) in self._stats.items()]
+            self._unsaved = 0
+            self._saved_at = time.monotonic()
+            path = self.path
+        db = self._connect(path)
+        try:
+            with db:
+                db.executemany(
+                    "INSERT INTO selector_stats (grp, selector, hits, attempts, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT (grp, selector) DO UPDATE SET"
+                    " hits = excluded.hits, attempts = excluded.attempts, updated_at = excluded.updated_at"
+                    " WHERE excluded.updated_at >= selector_stats.updated_at", rows,
+                )
+        finally:
+            db.close()
+
+
+SELECTORS = SelectorRegistry()
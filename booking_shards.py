@@ -0,0 +1,407 @@
+"""
+Multi-process scraping with crash isolation and resumable checkpoints.
+
+scrape_many() runs every browser in one process, so a crashed Chrome or a
+WebDriverWait that never returns takes the whole run down with it.
+run_sharded() shards the jobs across worker processes instead, each owning
+its own browser session:
+
+    outcomes = run_sharded(load_jobs("jobs.jsonl"), processes=8,
+                           checkpoint="jobs.done", sink=open_sink("prices.jsonl"))
+
+- the parent hands one job at a time to every idle worker, so fast workers
+  take more of the list and the parent always knows which job a worker runs
+- a job still running after *job_timeout* seconds gets its worker killed
+  together with its chromedriver and Chrome processes (the worker leads
+  its own process group); a worker that dies is replaced the same way.
+  The job is retried on the new worker up to *retries* times
+- records travel back to the parent, which alone writes the sinks and the
+  checkpoint.  A job's id (booking_jobs.job_id) is appended to the
+  checkpoint file once its records are flushed, and jobs found there are
+  skipped, so an interrupted run (Ctrl+C, reboot, crash) resumes with the
+  remaining work.  Failed jobs are not checkpointed and run again next time.
+
+Workers are started with the "spawn" method: *scrape* and *scrape_kwargs*
+must be picklable (module-level functions, plain values), and scripts have
+to call run_sharded() under ``if __name__ == "__main__":``.  Selenium is
+only imported inside the workers.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+
+from booking_jobs import as_job, job_id
+from booking_log import LOGGER_NAME, JsonFormatter, configure_logging, get_logger
+from booking_records import utc_now
+
+
+log = get_logger("shards")
+
+# how often the parent checks the deadlines while no worker reports back
+POLL_INTERVAL = 0.5
+# seconds a worker gets to quit its browser once asked to stop
+STOP_GRACE = 10.0
+
+
+class JobError(Exception):
+    """
+    A job's failure inside a worker process.  The original exception stays
+    in the worker; *kind* is its class name.
+    """
+
+    def __init__(self, kind, message):
+        super().__init__(f"{kind}: {message}")
+        self.kind = kind
+
+
+class JobTimeout(JobError):
+    """ The job was still running at its wall-clock deadline; its worker was killed. """
+
+
+class Checkpoint:
+    """
+    Append-only file of finished jobs, one "<job id>\\t<finished at>\\t<hotel>"
+    line each.  Every line is flushed and fsync'ed before add() returns; a
+    last line torn by a crash before its tab does not count.
+
+    Parameters:
+    - path : checkpoint file (created when missing)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._done = set()
+        needs_newline = False
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    job, complete, _ = line.partition("\t")
+                    if complete and job.strip():          # a torn id is not a finished job
+                        self._done.add(job.strip())
+                    needs_newline = not line.endswith("\n")
+        self._file = open(path, "a", encoding="utf-8")
+        if needs_newline:
+            # a line torn by a crash must not swallow the next id
+            self._file.write("\n")
+
+    def __contains__(self, job):
+        return (job if isinstance(job, str) else job_id(job)) in self._done
+
+    def __len__(self):
+        return len(self._done)
+
+    def add(self, job):
+        job = as_job(job)
+        ident = job_id(job)
+        self._file.write(f"{ident}\t{utc_now()}\t{job.hotel_name}\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._done.add(ident)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ── worker process ────────────────────────────────────────────────────
+
+
+@dataclass
+class _WorkerConfig:
+    profile: str = None
+    max_jobs_per_session: int = 25
+    driver_path: str = None
+    scrape: object = None
+    scrape_kwargs: dict = field(default_factory=dict)
+    room_rates: bool = False
+    log_level: int = logging.WARNING
+    log_format: str = "text"
+    selectors_path: str = None
+
+
+class _ListSink:
+    """ Collects a worker's room records so the parent can write them. """
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+    def write_many(self, records):
+        self.records.extend(records)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _worker_main(conn, config):
+    if hasattr(os, "setsid"):
+        os.setsid()                               # killpg() then also reaches chromedriver / Chrome
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is the parent's business
+    configure_logging(config.log_level, config.log_format)
+
+    from selenium.common.exceptions import WebDriverException
+
+    from booking_pool import PooledSession
+    from booking_scraper_v2 import create_driver, scrape_booking_price
+    from booking_selectors import SELECTORS
+
+    if config.selectors_path:
+        SELECTORS.open(config.selectors_path)
+    scrape = config.scrape or scrape_booking_price
+    session = None
+    try:
+        while True:
+            try:
+                task = conn.recv()
+            except EOFError:
+                break                             # parent went away
+            if task is None:
+                break
+            index, job = task
+            profile = job.profile or config.profile
+            rooms = _ListSink() if config.room_rates else None
+            kwargs = dict(config.scrape_kwargs, room_rates=True, room_sink=rooms) if rooms is not None else config.scrape_kwargs
+            result = error = None
+            try:
+                if session is not None and (session.profile != profile
+                                            or session.jobs_done >= config.max_jobs_per_session):
+                    session.quit()
+                    session = None
+                if session is None:
+                    session = PooledSession(create_driver(driver_path=config.driver_path, profile=profile), profile)
+                result = scrape(*job.as_args(), driver=session.driver, **kwargs)
+            except WebDriverException as e:
+                error = (type(e).__name__, getattr(e, "msg", None) or str(e))
+                if session is not None and not session.is_healthy():
+                    session.quit()
+                    session = None
+            except Exception as e:
+                error = (type(e).__name__, str(e))
+            if session is not None:
+                session.jobs_done += 1
+                try:
+                    session.reset()
+                except WebDriverException:
+                    session.quit()
+                    session = None
+            conn.send((index, result, rooms.records if rooms is not None else [], error))
+    finally:
+        if session is not None:
+            session.quit()
+        SELECTORS.save()                          # atexit does not run in a worker process
+        conn.close()
+
+
+# ── parent side ───────────────────────────────────────────────────────
+
+
+class _Worker:
+    """ One worker process, its pipe and the job it is running. """
+
+    def __init__(self, ctx, number, config):
+        self.number = number
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, config),
+                                   name=f"booking-shard-{number}", daemon=True)
+        self.process.start()
+        child.close()
+        self.task = None
+        self.started = None
+
+    def assign(self, index, job):
+        self.conn.send((index, job))
+        self.task = index
+        self.started = time.monotonic()
+
+    def kill(self):
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            # no process groups (Windows) or setsid() not reached yet
+            self.process.kill()
+        self.process.join(STOP_GRACE)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(STOP_GRACE)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+def _crashed(worker):
+    worker.process.join(1)                        # the pipe closes just before the exit code is known
+    return JobError("WorkerCrashed", f"worker exited with code {worker.process.exitcode}")
+
+
+def _log_format():
+    for handler in logging.getLogger(LOGGER_NAME).handlers:
+        if getattr(handler, "_booking_handler", False):
+            return "json" if isinstance(handler.formatter, JsonFormatter) else "text"
+    return os.environ.get("BOOKING_LOG_FORMAT", "text")
+
+
+def run_sharded(jobs, processes=None, checkpoint=None, job_timeout=300, retries=1,
+                max_jobs_per_session=25, profile=None, sink=None, room_sink=None,
+                scrape=None, driver_path=None, selectors_path=None, **scrape_kwargs):
+    """
+    Scrapes *jobs* in worker processes, one browser per process.
+
+    Parameters:
+    - jobs                 : iterable of ScrapeJob / (city, hotel, check-in, check-out) / job dicts
+    - processes            : number of worker processes (default: one per CPU)
+    - checkpoint           : file of finished job ids; jobs listed there are
+                             skipped and finished ones are appended
+    - job_timeout          : wall-clock seconds a job may run before its
+                             worker (and browser) is killed
+    - retries              : how often a job whose worker was killed or
+                             died is tried again
+    - max_jobs_per_session : recycle each worker's browser after this many jobs
+    - profile              : browser profile for jobs that do not name one
+    - sink                 : RecordSink the PriceRecords are written to (by the parent)
+    - room_sink            : RecordSink for RoomRateRecords; implies room_rates=True
+    - scrape               : picklable scrape function (default scrape_booking_price)
+    - driver_path          : chromedriver to use (default: the path cached by
+                             booking_driver, resolved here once)
+    - selectors_path       : selector stats file shared by the workers
+                             (default: the file SELECTORS was opened with)
+    - scrape_kwargs        : passed to *scrape* (e.g. fast_path=True, pacing="balanced")
+
+    Returns a list of (job, result, error) tuples for the jobs run by this
+    call (checkpointed jobs are left out), in the order the jobs were given.
+    *error* is None, a JobError or a JobTimeout.
+    """
+    jobs = [as_job(job) for job in jobs]
+    done = Checkpoint(checkpoint) if checkpoint is not None else None
+    try:
+        pending = deque(i for i, job in enumerate(jobs) if done is None or job not in done)
+        if done is not None and len(pending) < len(jobs):
+            log.info("↻ Resuming from %s: %d of %d job(s) already done",
+                     checkpoint, len(jobs) - len(pending), len(jobs))
+        if not pending:
+            return []
+
+        if driver_path is None:
+            # resolve (and cache) once, so the workers do not all go online
+            from booking_driver import resolve_driver_path
+            resolve_driver_path()
+        if selectors_path is None:
+            from booking_selectors import SELECTORS
+            SELECTORS.save()
+            selectors_path = SELECTORS.path
+        if room_sink is not None:
+            scrape_kwargs["room_rates"] = True
+        config = _WorkerConfig(
+            profile=profile,
+            max_jobs_per_session=max_jobs_per_session,
+            driver_path=driver_path,
+            scrape=scrape,
+            scrape_kwargs=scrape_kwargs,
+            room_rates=room_sink is not None,
+            log_level=logging.getLogger(LOGGER_NAME).getEffectiveLevel(),
+            log_format=_log_format(),
+            selectors_path=selectors_path,
+        )
+
+        processes = max(1, min(processes or os.cpu_count() or 1, len(pending)))
+        log.info("🎯 %d job(s) on %d worker process(es)", len(pending), processes)
+        outcomes = _run(jobs, pending, processes, config, done, sink, room_sink, job_timeout, retries)
+    finally:
+        if done is not None:
+            done.close()
+    return [(jobs[i], result, error) for i, (result, error) in sorted(outcomes.items())]
+
+
+def _run(jobs, pending, processes, config, done, sink, room_sink, job_timeout, retries):
+    ctx = multiprocessing.get_context("spawn")
+    outcomes = {}
+    failures = {}
+    total = len(pending)
+    workers = []
+    numbers = itertools.count()
+
+    def replace(worker, error):
+        index = worker.task
+        worker.kill()
+        workers[workers.index(worker)] = _Worker(ctx, next(numbers), config)
+        failures[index] = failures.get(index, 0) + 1
+        if failures[index] <= retries:
+            log.warning("   ⚠ %s  →  retrying %s on a new worker", error, jobs[index].hotel_name)
+            pending.append(index)
+        else:
+            log.error("✗ %s: %s", jobs[index].hotel_name, error)
+            outcomes[index] = (None, error)
+
+    try:
+        workers.extend(_Worker(ctx, next(numbers), config) for _ in range(processes))
+        while pending or any(worker.task is not None for worker in workers):
+            for worker in workers:
+                if worker.task is None and pending:
+                    index = pending.popleft()
+                    worker.assign(index, jobs[index])
+
+            busy = [worker for worker in workers if worker.task is not None]
+            ready = wait([worker.conn for worker in busy], timeout=POLL_INTERVAL)
+            now = time.monotonic()
+            for worker in busy:
+                if worker.conn in ready:
+                    try:
+                        index, result, rooms, error = worker.conn.recv()
+                    except (EOFError, OSError):
+                        replace(worker, _crashed(worker))
+                        continue
+                    worker.task = None
+                    if error is not None:
+                        error = JobError(*error)
+                        log.error("✗ %s: %s", jobs[index].hotel_name, error)
+                    else:
+                        if sink is not None and result:
+                            sink.write_many(result)
+                            sink.flush()
+                        if room_sink is not None and rooms:
+                            room_sink.write_many(rooms)
+                            room_sink.flush()
+                        if not result:
+                            # the scraper returns [] when the results did not
+                            # load or the search failed: run it again on resume
+                            log.warning("⚠ [%d/%d] %s: no records  →  not checkpointed",
+                                        len(outcomes) + 1, total, jobs[index].hotel_name)
+                        else:
+                            if done is not None:
+                                done.add(jobs[index])
+                            log.info("✓ [%d/%d] %s", len(outcomes) + 1, total, jobs[index].hotel_name)
+                    outcomes[index] = (result, error)
+                elif now - worker.started > job_timeout:
+                    replace(worker, JobTimeout("JobTimeout", f"no result after {job_timeout:g}s"))
+                elif not worker.process.is_alive():
+                    replace(worker, _crashed(worker))
+    except BaseException:
+        # interrupted: nothing is left running; finished jobs are in the checkpoint
+        for worker in workers:
+            worker.kill()
+        raise
+    for worker in workers:
+        worker.stop()
+    return outcomes
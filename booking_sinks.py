@@ -0,0 +1,168 @@
+"""
+Streaming output sinks for PriceRecord (or RoomRateRecord) batches.
+
+Records are buffered and written in batches as they arrive, so large batch
+runs never hold all results in memory.  Sinks are thread-safe and can be
+shared by the workers of scrape_many().
+
+    with open_sink("prices.jsonl") as sink:
+        scrape_many(jobs, sink=sink)
+
+Sinks write PriceRecord columns by default; pass record_type=RoomRateRecord
+for room-rate output.
+
+Parquet output needs the optional "pyarrow" dependency
+(uv pip install "booking-scraper[parquet]").
+"""
+
+import csv
+import json
+import os
+import threading
+from dataclasses import fields
+
+from booking_records import PriceRecord
+
+
+class RecordSink:
+    """
+    Base class: buffers records and hands them to _write_batch().
+
+    Parameters:
+    - path        : output file
+    - buffer_size : number of records buffered before a batch is written
+    """
+
+    def __init__(self, path, buffer_size=100):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def write(self, record):
+        self.write_many([record])
+
+    def write_many(self, records):
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"{type(self).__name__} is closed")
+            for record in records:
+                self._buffer.append(record if isinstance(record, dict) else record.to_dict())
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            self._write_batch(batch)
+            self.count += len(batch)
+
+    def _write_batch(self, rows):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._close()
+            self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JsonlSink(RecordSink):
+    """ One JSON object per line. """
+
+    def __init__(self, path, buffer_size=100, append=True, record_type=None):
+        # record_type is accepted for a uniform open_sink() signature; rows are self-describing
+        super().__init__(path, buffer_size)
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def _write_batch(self, rows):
+        self._file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class CsvSink(RecordSink):
+    """ CSV with a header row (written once for new / empty files). """
+
+    def __init__(self, path, buffer_size=100, append=True, record_type=PriceRecord):
+        super().__init__(path, buffer_size)
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self._file = open(path, "a" if append else "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(
+            self._file, fieldnames=[f.name for f in fields(record_type)], extrasaction="ignore",
+        )
+        if write_header:
+            self._writer.writeheader()
+
+    def _write_batch(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class ParquetSink(RecordSink):
+    """ Parquet file; every flushed batch becomes one row group. """
+
+    def __init__(self, path, buffer_size=1000, record_type=PriceRecord):
+        super().__init__(path, buffer_size)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Parquet output needs pyarrow:  uv pip install \"booking-scraper[parquet]\""
+            ) from None
+        self._pa = pa
+        arrow_types = {str: pa.string(), float: pa.float64(), int: pa.int32(), bool: pa.bool_()}
+        self._schema = pa.schema([(f.name, arrow_types[f.type]) for f in fields(record_type)])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def _write_batch(self, rows):
+        table = self._pa.Table.from_pylist(rows, schema=self._schema)
+        self._writer.write_table(table)
+
+    def _close(self):
+        self._writer.close()
+
+
+SINKS = {
+    "jsonl": JsonlSink,
+    "csv": CsvSink,
+    "parquet": ParquetSink,
+}
+
+
+def open_sink(path, kind=None, **kwargs):
+    """
+    Opens a sink for *path*.  The format is taken from *kind* or from the
+    file extension (.jsonl / .csv / .parquet).
+    """
+    if kind is None:
+        ext = os.path.splitext(path)[1].lower().lstrip(".")
+        kind = {"json": "jsonl", "ndjson": "jsonl", "pq": "parquet"}.get(ext, ext)
+    try:
+        sink_class = SINKS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown sink format {kind!r}; choose one of {sorted(SINKS)}") from None
+    return sink_class(path, **kwargs)
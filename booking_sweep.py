@@ -0,0 +1,129 @@
+"""
+Multi-date sweep: prices one hotel across a range of check-in dates in a
+single browser session.
+
+The hotel is resolved once (from a ResolverCache, or by one full
+scrape_booking_price run that learns the destination id); every further
+date only swaps the checkin / checkout parameters of the results URL, so
+the per-date cost is one page load plus one bulk HTML read.
+
+    for day in sweep_prices("Dubai", "Howard Johnson Bur Dubai",
+                            "2026-05-01", "2026-05-31", nights=2):
+        print(day.check_in, day.target.amount if day.target else "n/a")
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from booking_log import get_logger
+from booking_matching import DEFAULT_THRESHOLD, is_same_hotel
+from booking_pacing import get_pacing, wait_for_network_idle
+from booking_parser import fetch_results_html, parse_property_cards
+from booking_records import record_from_card, utc_now
+from booking_resolver import ResolverCache
+from booking_scraper_v2 import (
+    build_search_url, create_driver, scrape_booking_price, search_via_url,
+)
+
+
+log = get_logger("sweep")
+
+
+CalendarEntry = namedtuple("CalendarEntry", "check_in check_out target records")
+
+
+def date_range(start, end, nights=1, step=1):
+    """
+    Yields (check_in, check_out) "YYYY-MM-DD" pairs for every check-in
+    date from *start* to *end* inclusive.
+    """
+    day = datetime.strptime(start, "%Y-%m-%d")
+    last = datetime.strptime(end, "%Y-%m-%d")
+    if nights < 1:
+        raise ValueError("nights must be at least 1")
+    while day <= last:
+        yield day.strftime("%Y-%m-%d"), (day + timedelta(days=nights)).strftime("%Y-%m-%d")
+        day += timedelta(days=step)
+
+
+def _entry(records, check_in, check_out):
+    target = next((r for r in records if r.target), None)
+    return CalendarEntry(check_in, check_out, target, records)
+
+
+def sweep_prices(city, hotel_name, start, end, nights=1, step=1, driver=None, pacing="balanced",
+                 resolver=None, sink=None, adults=2, rooms=1, children=0,
+                 match_threshold=DEFAULT_THRESHOLD, profile=None, base_url=None):
+    """
+    Generator yielding one CalendarEntry per check-in date.
+
+    Parameters:
+    - city, hotel_name : the hotel to price
+    - start, end       : first and last check-in date ("YYYY-MM-DD", inclusive)
+    - nights           : length of stay for every check-in date
+    - step             : days between two check-in dates
+    - driver           : WebDriver to reuse; a new session is started (and
+                         quit afterwards) when omitted
+    - pacing           : PacingPolicy or preset name
+    - resolver         : ResolverCache; an in-memory one is used when omitted
+    - sink             : optional RecordSink receiving every record
+    - adults, rooms, children, match_threshold : as in scrape_booking_price
+    - profile          : browser profile for a session started here
+    - base_url         : site root instead of Booking.com (e.g. a stub server)
+    """
+    pacing = get_pacing(pacing)
+    dates = date_range(start, end, nights, step)
+    owns_driver = driver is None
+    if owns_driver:
+        log.info("Setting up Chrome driver...")
+        driver = create_driver(profile=profile)
+    if resolver is None:
+        resolver = ResolverCache(":memory:")
+
+    try:
+        # ── resolve the hotel once ────────────────────────────────────
+        resolution = resolver.get(hotel_name, city)
+        if resolution is None:
+            check_in, check_out = next(dates, (None, None))
+            if check_in is None:
+                return
+            records = scrape_booking_price(
+                city, hotel_name, check_in, check_out, driver=driver, fast_path=True,
+                adults=adults, rooms=rooms, children=children, pacing=pacing, sink=sink,
+                resolver=resolver, match_threshold=match_threshold, base_url=base_url,
+            )
+            yield _entry(records, check_in, check_out)
+            resolution = resolver.get(hotel_name, city)
+            if resolution is None:
+                log.warning("   ⚠ Could not resolve a destination id  →  sweeping with the free-text URL")
+
+        # ── then only the dates change ────────────────────────────────
+        for check_in, check_out in dates:
+            url = build_search_url(
+                city, hotel_name, check_in, check_out, adults=adults, rooms=rooms,
+                children=children,
+                dest_id=resolution.dest_id if resolution else None,
+                dest_type=resolution.dest_type if resolution else None,
+                base_url=base_url,
+            )
+            records = []
+            if search_via_url(driver, url, pacing=pacing):
+                wait_for_network_idle(driver, timeout=5)
+                scraped_at = utc_now()
+                for card in parse_property_cards(fetch_results_html(driver)):
+                    records.append(record_from_card(
+                        card, city, check_in, check_out,
+                        is_same_hotel(hotel_name, card.name, match_threshold), scraped_at,
+                    ))
+            else:
+                log.warning("   ⚠ No results for %s → %s", check_in, check_out)
+            if sink is not None:
+                sink.write_many(records)
+            entry = _entry(records, check_in, check_out)
+            price = entry.target.price_text if entry.target else "not available"
+            log.info("   %s → %s  :  %s", check_in, check_out, price)
+            yield entry
+    finally:
+        if owns_driver:
+            driver.quit()
+            log.info("\n✓ Browser closed.")
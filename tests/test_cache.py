@@ -0,0 +1,92 @@
+from booking_cache import CachedScraper, ResultCache, cache_key
+from booking_records import PriceRecord
+
+
+QUERY = ("Dubai", "Howard Johnson Bur Dubai", "2026-05-01", "2026-05-05")
+
+
+class FakeScrape:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, city, hotel_name, check_in_date, check_out_date, **kwargs):
+        self.calls.append(kwargs)
+        return [PriceRecord(hotel_name, city, check_in_date, check_out_date,
+                            amount=100.0 * kwargs.get("adults", 2))]
+
+
+def test_cache_key_is_normalized():
+    assert cache_key("Dubai", "Howard  Johnson Bur Dubai", "2026-05-01", "2026-05-05") == \
+        cache_key("dubai", "howard johnson bur dubai", "2026-05-01", "2026-05-05")
+
+
+def test_cache_key_includes_result_options():
+    base = cache_key(*QUERY)
+
+    assert cache_key(*QUERY, adults=2, rooms=1, children=0) == base
+    assert cache_key(*QUERY, pacing="balanced", fast_path=True) == base
+    assert cache_key(*QUERY, adults=1) != base
+    assert cache_key(*QUERY, rooms=2) != base
+    assert cache_key(*QUERY, children=1) != base
+    assert cache_key(*QUERY, max_results=50) != base
+    assert cache_key(*QUERY, base_url="http://127.0.0.1:8000") != base
+    assert cache_key(*QUERY, match_threshold=0.8) != base
+    assert cache_key(*QUERY, match_threshold=0.9) == base
+
+
+def test_occupancy_is_not_served_from_another_query():
+    scrape = FakeScrape()
+    cached = CachedScraper(ResultCache(":memory:"), scrape=scrape)
+
+    assert cached(*QUERY, adults=1)[0].amount == 100.0
+    assert cached(*QUERY, adults=2, rooms=2)[0].amount == 200.0
+    assert cached(*QUERY, adults=1)[0].amount == 100.0
+    assert len(scrape.calls) == 2
+
+
+def test_room_rates_bypass_the_cache():
+    scrape = FakeScrape()
+    cached = CachedScraper(ResultCache(":memory:"), scrape=scrape)
+
+    cached(*QUERY)
+    cached(*QUERY, room_rates=True)
+
+    assert len(scrape.calls) == 2
+    assert cached.cache.stats()["hits"] == 0
+
+
+def test_stale_refresh_runs_without_inspection_pauses():
+    scrape = FakeScrape()
+    cache = ResultCache(":memory:", ttl=0)
+    cached = CachedScraper(cache, scrape=scrape, stale_while_revalidate=True, profile="lean")
+    cache.put(cache_key(*QUERY), [PriceRecord(QUERY[1], QUERY[0], QUERY[2], QUERY[3], amount=1.0)])
+
+    records = cached(*QUERY, driver=object(), sink=None)
+    cached.close()
+
+    assert records[0].amount == 1.0
+    (refresh,) = scrape.calls
+    assert "driver" not in refresh
+    assert refresh["profile"] == "lean"
+    assert refresh["pacing"].inspect_pauses is False
+
+
+class NoBrowserPool:
+    profile = None
+
+    def acquire(self, profile=None):
+        raise AssertionError("a cache hit must not start a browser")
+
+
+def test_run_job_answers_cache_hits_without_a_session():
+    from booking_pool import run_job
+
+    scrape = FakeScrape()
+    cached = CachedScraper(ResultCache(":memory:"), scrape=scrape)
+    cached(*QUERY)
+
+    records, error = run_job(NoBrowserPool(), QUERY, cached)
+
+    assert error is None
+    assert records[0].amount == 200.0
+    assert len(scrape.calls) == 1
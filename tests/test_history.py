@@ -0,0 +1,108 @@
+import pytest
+
+from booking_history import ChangeSink, PriceHistory, PricePoint
+from booking_records import PriceRecord, RoomRateRecord
+
+
+HOTEL = "Howard Johnson Bur Dubai"
+
+
+def _record(amount, scraped_at, currency="AED", hotel=HOTEL):
+    text = None if amount is None else f"{currency} {amount:,.0f}"
+    return PriceRecord(hotel, "Dubai", "2026-05-01", "2026-05-05", price_text=text, amount=amount,
+                       currency=None if amount is None else currency, scraped_at=scraped_at)
+
+
+@pytest.fixture
+def history(tmp_path):
+    with PriceHistory(str(tmp_path / "history.sqlite")) as history:
+        yield history
+
+
+def test_only_changes_are_emitted(history):
+    runs = [
+        (843.0, "2026-04-01T00:00:00+00:00"),
+        (843.0, "2026-04-01T01:00:00+00:00"),
+        (799.5, "2026-04-01T02:00:00+00:00"),
+        (799.5, "2026-04-01T03:00:00+00:00"),
+    ]
+    emitted = [len(history.observe([_record(amount, at)])) for amount, at in runs]
+
+    assert emitted == [1, 0, 1, 0]
+    assert history.stats()["changed"] == 2
+
+
+def test_history_decodes_deltas(history):
+    for amount, at in [(843.0, "2026-04-01T00:00:00+00:00"), (799.5, "2026-04-02T00:00:00+00:00"),
+                       (None, "2026-04-03T00:00:00+00:00"), (910.0, "2026-04-04T00:00:00+00:00"),
+                       (910.0, "2026-04-05T00:00:00+00:00")]:
+        history.observe([_record(amount, at)])
+
+    points = history.history(HOTEL, "2026-05-01", "2026-05-05")
+
+    assert [point.amount for point in points] == [843.0, 799.5, None, 910.0]
+    assert [point.observed_at for point in points] == [
+        "2026-04-01T00:00:00+00:00", "2026-04-02T00:00:00+00:00",
+        "2026-04-03T00:00:00+00:00", "2026-04-04T00:00:00+00:00",
+    ]
+    assert points[-1].currency == "AED"
+    assert history.latest(HOTEL, "2026-05-01", "2026-05-05") == PricePoint("2026-04-04T00:00:00+00:00", 910.0, "AED")
+
+
+def test_history_window(history):
+    for amount, day in [(100.0, 1), (120.0, 2), (90.0, 3)]:
+        history.observe([_record(amount, f"2026-04-0{day}T00:00:00+00:00")])
+
+    points = history.history(HOTEL, "2026-05-01", "2026-05-05",
+                             since="2026-04-02T00:00:00+00:00", until="2026-04-02T12:00:00+00:00")
+
+    # deltas are decoded from the start of the series even when the window skips it
+    assert [point.amount for point in points] == [120.0]
+
+
+def test_currency_change(history):
+    history.observe([_record(843.0, "2026-04-01T00:00:00+00:00")])
+    history.observe([_record(230.0, "2026-04-02T00:00:00+00:00", currency="USD")])
+    history.observe([_record(235.0, "2026-04-03T00:00:00+00:00", currency="USD")])
+
+    points = history.history(HOTEL, "2026-05-01", "2026-05-05")
+
+    assert [(point.amount, point.currency) for point in points] == [
+        (843.0, "AED"), (230.0, "USD"), (235.0, "USD"),
+    ]
+
+
+def test_same_second_changes_stay_ordered(history):
+    history.observe([_record(100.0, "2026-04-01T00:00:00+00:00")])
+    history.observe([_record(110.0, "2026-04-01T00:00:00+00:00")])
+
+    assert [point.amount for point in history.history(HOTEL, "2026-05-01", "2026-05-05")] == [100.0, 110.0]
+
+
+def test_room_rates_are_separate_series(history):
+    room = RoomRateRecord(HOTEL, "Dubai", "2026-05-01", "2026-05-05", room_type="Standard King Room",
+                          board=None, cancellation="Non-refundable", occupancy=2, price_text="AED 843",
+                          amount=843.0, currency="AED", scraped_at="2026-04-01T00:00:00+00:00")
+    history.observe([_record(843.0, "2026-04-01T00:00:00+00:00"), room])
+
+    assert len(history.series(HOTEL)) == 2
+    assert history.latest(HOTEL, "2026-05-01", "2026-05-05", "Standard King Room | | Non-refundable | 2").amount == 843.0
+
+
+def test_change_sink(history):
+    class ListSink:
+        def __init__(self):
+            self.records = []
+
+        def write_many(self, records):
+            self.records.extend(records)
+
+    out = ListSink()
+    sink = ChangeSink(history, out)
+    sink.write_many([_record(843.0, "2026-04-01T00:00:00+00:00"), _record(500.0, "2026-04-01T00:00:00+00:00", hotel="Rove Downtown")])
+    sink.write_many([_record(843.0, "2026-04-02T00:00:00+00:00"), _record(520.0, "2026-04-02T00:00:00+00:00", hotel="Rove Downtown")])
+
+    assert [(record.hotel, record.amount) for record in out.records] == [
+        (HOTEL, 843.0), ("Rove Downtown", 500.0), ("Rove Downtown", 520.0),
+    ]
+    assert sink.count == 3
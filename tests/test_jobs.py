@@ -0,0 +1,29 @@
+import argparse
+
+import pytest
+
+from booking_cli import validate
+from booking_jobs import parse_deadline
+
+
+ROW = {"city": "Dubai", "hotel_name": "Rove Downtown", "check_in_date": "2026-05-01",
+       "check_out_date": "2026-05-03"}
+
+
+@pytest.mark.parametrize("value", ["2026-05-01T12:00:00Z", "2026-05-01T12:00:00+00:00",
+                                   "2026-05-01T16:00:00+04:00", "1777636800", 1777636800])
+def test_parse_deadline(value):
+    assert parse_deadline(value) == 1777636800.0
+
+
+def test_parse_deadline_rejects_garbage():
+    assert parse_deadline("") is None
+    with pytest.raises(ValueError):
+        parse_deadline("soon")
+
+
+def test_validate_accepts_a_utc_deadline():
+    args = argparse.Namespace(profile=None, pacing=None)
+
+    assert validate([dict(ROW, deadline="2026-05-01T12:00:00Z", priority="1")], args) == []
+    assert len(validate([dict(ROW, deadline="tomorrow")], args)) == 1
@@ -0,0 +1,64 @@
+import pytest
+
+from booking_matching import HotelIndex, best_match, is_same_hotel, match_score, normalize_name
+
+
+def test_normalize_name():
+    assert normalize_name("  Arabian Courtyard Hotel & Spa ") == "arabian courtyard hotel and spa"
+    assert normalize_name("Zabeel House by Jumeirah, The Greens") == "zabeel house by jumeirah the greens"
+
+
+@pytest.mark.parametrize("query, candidate", [
+    ("Howard Johnson Bur Dubai", "Howard Johnson by Wyndham Bur Dubai"),
+    ("Al Khoory Skygarden Hotel", "Al Khoory Sky Garden Hotel"),
+    ("rove downtown", "Rove Downtown"),
+])
+def test_same_hotel(query, candidate):
+    assert is_same_hotel(query, candidate)
+
+
+@pytest.mark.parametrize("query, candidate", [
+    ("Rove Downtown", "Carlton Downtown"),
+    ("Ibis Al Barsha", "Novotel Dubai Al Barsha"),
+    ("Howard Johnson Bur Dubai", "Four Points by Sheraton Bur Dubai"),
+])
+def test_different_hotel(query, candidate):
+    assert not is_same_hotel(query, candidate)
+
+
+@pytest.mark.parametrize("query, candidate", [
+    ("Ibis Al Barsha", "Ibis Styles Dubai Al Barsha"),
+    ("Hilton Dubai", "Hilton Dubai Jumeirah"),
+    ("Marriott Dubai", "JW Marriott Marquis Hotel Dubai"),
+    ("Premier Inn Dubai", "Premier Inn Dubai Al Jaddaf"),
+])
+def test_sister_property_is_not_the_hotel(query, candidate):
+    assert not is_same_hotel(query, candidate)
+    assert match_score(query, candidate) < match_score(query, query)
+
+
+def test_match_score_range():
+    assert match_score("Marco Polo Hotel", "Marco Polo Hotel") == 1.0
+    assert 0.0 <= match_score("Marco Polo Hotel", "Orient Guest House") < 0.5
+
+
+def test_best_match():
+    names = ["Rove Downtown", "Howard Johnson by Wyndham Bur Dubai", "Citymax Hotel Bur Dubai"]
+
+    index, score = best_match("Howard Johnson Bur Dubai", names)
+    assert index == 1
+    assert score >= 0.9
+    assert best_match("Atlantis The Palm", names, threshold=0.9) is None
+
+
+def test_best_match_prefers_the_exact_name():
+    assert best_match("Ibis Al Barsha", ["Ibis Styles Dubai Al Barsha", "Ibis Al Barsha"])[0] == 1
+    # tied scores: the name closest to the query as written wins
+    assert best_match("Rove Downtown", ["The Rove Downtown", "Rove Downtown"])[0] == 1
+
+
+def test_hotel_index():
+    index = HotelIndex(["Rove Downtown", "Carlton Downtown", "Howard Johnson by Wyndham Bur Dubai"])
+
+    assert index.match("Howard Johnson Bur Dubai")[0] == "Howard Johnson by Wyndham Bur Dubai"
+    assert index.match("Atlantis The Palm") is None
@@ -0,0 +1,24 @@
+from booking_metrics import Timings
+
+
+def test_timings_keep_exact_totals_and_a_bounded_sample():
+    timings = Timings(reservoir_size=100)
+    for i in range(1, 1001):
+        timings.record("typing", i / 1000)
+
+    summary = timings.summary()["typing"]
+
+    assert len(timings.values("typing")) == 100
+    assert summary["count"] == 1000
+    assert summary["total"] == 500.5
+    assert summary["max"] == 1.0
+    assert 0.3 < summary["p50"] < 0.7
+
+
+def test_small_series_are_not_sampled():
+    timings = Timings()
+    for seconds in (0.1, 0.3, 0.2):
+        timings.record("search", seconds)
+
+    assert timings.values("search") == [0.1, 0.3, 0.2]
+    assert timings.summary()["search"]["p50"] == 0.2
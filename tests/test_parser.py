@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from booking_parser import parse_property_cards, parse_room_rates
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def results_html():
+    return _fixture("results_page.html")
+
+
+@pytest.fixture(scope="module")
+def property_html():
+    return _fixture("property_page.html")
+
+
+def test_parse_property_cards(results_html):
+    cards = parse_property_cards(results_html)
+
+    assert len(cards) == 25
+    assert [card.rank for card in cards] == list(range(1, 26))
+    first = cards[0]
+    assert first.name == "Howard Johnson by Wyndham Bur Dubai"
+    assert first.price == "AED 843"
+    assert first.rating == "Scored 6.9"
+    assert first.address == "Bur Dubai, Dubai"
+    assert first.url == "https://www.booking.com/hotel/ae/h0.html"
+    assert cards[3].price == "AED 1,308"
+    assert cards[24].name == "Flora Inn Hotel Dubai Airport"
+
+
+def test_parse_property_cards_missing_rating(results_html):
+    cards = {card.name: card for card in parse_property_cards(results_html)}
+
+    assert cards["Ibis Al Barsha"].rating is None
+    assert cards["Ibis Al Barsha"].price == "AED 1,320"
+
+
+def test_parse_property_cards_limit(results_html):
+    cards = parse_property_cards(results_html, limit=3)
+
+    assert [card.name for card in cards] == [
+        "Howard Johnson by Wyndham Bur Dubai", "Al Khoory Skygarden Hotel", "Rove Downtown",
+    ]
+
+
+def test_parse_room_rates(property_html):
+    rates = parse_room_rates(property_html)
+
+    assert [(rate.room_type, rate.occupancy, rate.price) for rate in rates] == [
+        ("Standard King Room", 2, "AED 843"),
+        ("Standard King Room", 2, "AED 968"),
+        ("Standard King Room", 1, "AED 790"),
+        ("Deluxe Twin Room", 3, "AED 1,012"),
+        ("Deluxe Twin Room", 3, "AED 904"),
+    ]
+    assert rates[0].board is None
+    assert rates[0].cancellation == "Non-refundable"
+    assert rates[1].board == "Breakfast included"
+    assert rates[1].cancellation == "Free cancellation before 28 April 2026"
+    assert rates[3].board == "Half board"
+
+
+def test_parse_empty_html():
+    assert parse_property_cards("<html><body></body></html>") == []
+    assert parse_room_rates("<html><body></body></html>") == []
@@ -0,0 +1,51 @@
+import pytest
+
+from booking_prices import EMPTY_PRICE, NormalizedPrice, normalize_columns, normalize_price, parse_amount
+
+
+@pytest.mark.parametrize("token, expected", [
+    ("1,234", 1234.0),
+    ("1.234,50", 1234.5),
+    ("1,234.50", 1234.5),
+    ("1 234", 1234.0),
+    ("1'234", 1234.0),
+    ("12.5", 12.5),
+    ("12,5", 12.5),
+    ("1.234.567", 1234567.0),
+])
+def test_parse_amount(token, expected):
+    assert parse_amount(token) == expected
+
+
+def test_parse_amount_forced_decimal():
+    assert parse_amount("1.234", decimal=".") == 1.234
+    assert parse_amount("1,234", decimal=",") == 1.234
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("AED 1,234", NormalizedPrice(1234.0, "AED", None, None)),
+    ("€ 1.234,50", NormalizedPrice(1234.5, "EUR", None, None)),
+    ("US$99", NormalizedPrice(99.0, "USD", None, None)),
+    ("£75", NormalizedPrice(75.0, "GBP", None, None)),
+    ("1 234 zł", NormalizedPrice(1234.0, "PLN", None, None)),
+    ("AED 1,500 AED 1,234", NormalizedPrice(1234.0, "AED", 1500.0, 266.0)),
+])
+def test_normalize_price(text, expected):
+    assert normalize_price(text) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "Sold out"])
+def test_normalize_price_without_amount(text):
+    assert normalize_price(text) == EMPTY_PRICE
+
+
+def test_original_price_must_be_higher():
+    assert normalize_price("AED 900 AED 1,000") == NormalizedPrice(1000.0, "AED", None, None)
+
+
+def test_normalize_columns():
+    columns = normalize_columns(["AED 843", "€ 12,50", "AED 843"])
+
+    assert columns["amount"] == [843.0, 12.5, 843.0]
+    assert columns["currency"] == ["AED", "EUR", "AED"]
+    assert normalize_columns([]) == {name: [] for name in NormalizedPrice._fields}
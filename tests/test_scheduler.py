@@ -0,0 +1,56 @@
+import booking_scheduler
+from booking_scheduler import run_jobs
+
+
+JOBS = [("Dubai", hotel, "2026-05-01", "2026-05-05") for hotel in ("Ibis", "boom", "Rove")]
+
+
+def fake_run_job(pool, job, scrape, **scrape_kwargs):
+    if job.hotel_name == "boom":
+        raise RuntimeError("browser did not start")
+    return [job.hotel_name], None
+
+
+def test_a_failing_job_does_not_stop_the_workers(monkeypatch):
+    monkeypatch.setattr(booking_scheduler, "run_job", fake_run_job)
+
+    outcomes = run_jobs(JOBS, workers=1, rate=1000, burst=10)
+
+    assert [job.hotel_name for job, _, _ in outcomes] == ["Ibis", "boom", "Rove"]
+    assert outcomes[0][1] == ["Ibis"] and outcomes[2][1] == ["Rove"]
+    assert isinstance(outcomes[1][2], RuntimeError)
+
+
+def test_cache_hits_skip_the_rate_limit():
+    from booking_cache import CachedScraper, ResultCache
+    from booking_records import PriceRecord
+
+    scraped = []
+
+    def scrape(city, hotel_name, check_in_date, check_out_date, **kwargs):
+        scraped.append(hotel_name)
+        return [PriceRecord(hotel_name, city, check_in_date, check_out_date, amount=1.0)]
+
+    cached = CachedScraper(ResultCache(":memory:"), scrape=scrape)
+    for job in JOBS:
+        cached(*job)
+
+    # at this rate a second token would take 1000 s
+    outcomes = run_jobs(JOBS, workers=1, rate=0.001, scrape=cached)
+
+    assert [result[0].hotel for _, result, _ in outcomes] == ["Ibis", "boom", "Rove"]
+    assert scraped == ["Ibis", "boom", "Rove"]
+
+
+def test_replay_stub_jobs_are_not_rate_limited(monkeypatch):
+    monkeypatch.setattr(booking_scheduler, "run_job", lambda pool, job, scrape, **kwargs: ([job.hotel_name], None))
+
+    # at this rate a second live-site job would wait 1000 s
+    outcomes = run_jobs(JOBS, workers=1, rate=0.001, base_url="http://127.0.0.1:8000")
+
+    assert [result for _, result, _ in outcomes] == [["Ibis"], ["boom"], ["Rove"]]
+
+
+def test_bucket_host_follows_base_url():
+    assert booking_scheduler.Scheduler().host == "www.booking.com"
+    assert booking_scheduler.Scheduler(base_url="http://127.0.0.1:8000").host == "127.0.0.1:8000"
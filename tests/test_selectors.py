@@ -0,0 +1,81 @@
+import time
+
+from booking_selectors import SelectorRegistry
+
+
+SEARCH = ["button[type='submit']", ".sb-searchbox__button", "#search"]
+
+
+def registry(path=None):
+    selectors = SelectorRegistry(path, autosave=0)
+    selectors.register("search_button", SEARCH)
+    selectors.register("price", ["span.price", ".prco"], adaptive=False)
+    return selectors
+
+
+def test_order_follows_recent_hits():
+    selectors = registry()
+    assert selectors.order("search_button") == SEARCH
+
+    for _ in range(3):
+        selectors.record_first("search_button", SEARCH, "#search")
+
+    # the two that missed tie, so they keep the registered order
+    assert selectors.order("search_button") == ["#search"] + SEARCH[:2]
+
+
+def test_a_selector_that_stops_matching_decays():
+    selectors = registry()
+    for _ in range(10):
+        selectors.record("search_button", hits=[SEARCH[0]])
+    assert selectors.order("search_button")[0] == SEARCH[0]
+
+    for _ in range(5):
+        selectors.record_first("search_button", SEARCH, SEARCH[1])
+
+    assert selectors.order("search_button")[0] == SEARCH[1]
+    assert selectors.hit_rate("search_button", SEARCH[0]) < 0.5
+
+
+def test_fixed_groups_keep_their_order():
+    selectors = registry()
+    for _ in range(3):
+        selectors.record_first("price", ["span.price", ".prco"], ".prco")
+
+    assert selectors.order("price") == ["span.price", ".prco"]
+    assert selectors.hit_rate("price", ".prco") == 1.0
+
+
+def test_record_passes_matches_single_records():
+    one, batch = registry(), registry()
+    passes = [("search_button", [SEARCH[2]], SEARCH[:2]), ("search_button", [SEARCH[1]], SEARCH[:1])]
+    for group, hits, misses in passes:
+        one.record(group, hits=hits, misses=misses)
+    batch.record_passes(passes)
+
+    assert batch.stats() == one.stats()
+
+
+def test_save_and_open_round_trip(tmp_path):
+    path = str(tmp_path / "selectors.sqlite")
+    first = registry(path)
+    for _ in range(3):
+        first.record_first("search_button", SEARCH, "#search")
+    first.save()
+
+    second = registry(path)
+
+    assert second.order("search_button") == first.order("search_button")
+    assert second.stats() == first.stats()
+
+
+def test_save_keeps_newer_rows_of_another_process(tmp_path):
+    path = str(tmp_path / "selectors.sqlite")
+    stale, fresh = registry(path), registry(path)
+    stale.record("search_button", misses=["#search"])
+    time.sleep(0.01)
+    fresh.record("search_button", hits=["#search"])
+    fresh.save()
+    stale.save()
+
+    assert registry(path).hit_rate("search_button", "#search") == 1.0
@@ -0,0 +1,34 @@
+from booking_jobs import ScrapeJob, job_id
+from booking_shards import Checkpoint
+
+
+JOBS = [ScrapeJob("Dubai", hotel, "2026-05-01", "2026-05-05") for hotel in ("Ibis", "Rove", "Citymax")]
+
+
+def test_checkpoint_resumes_after_a_partial_run(tmp_path):
+    path = str(tmp_path / "jobs.done")
+    with Checkpoint(path) as done:
+        done.add(JOBS[0])
+        done.add(JOBS[1])
+
+    with Checkpoint(path) as done:
+        assert len(done) == 2
+        assert JOBS[0] in done and JOBS[1] in done
+        assert JOBS[2] not in done
+        assert job_id(JOBS[1]) in done
+
+
+def test_checkpoint_ignores_a_torn_last_line(tmp_path):
+    path = tmp_path / "jobs.done"
+    with Checkpoint(str(path)) as done:
+        done.add(JOBS[0])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(job_id(JOBS[1])[:9])                       # crash mid-write
+
+    with Checkpoint(str(path)) as done:
+        assert JOBS[0] in done and JOBS[1] not in done
+        done.add(JOBS[2])
+
+    with Checkpoint(str(path)) as done:
+        assert len(done) == 2
+        assert JOBS[2] in done